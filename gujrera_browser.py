@@ -0,0 +1,205 @@
+# Chrome profiles for the Gujarat RERA scrapers
+# Requirements: selenium (psutil is optional, for Chrome memory readings)
+# Usage: python gujrera_browser.py profile_metrics.csv [more_metrics.csv ...]
+#
+# 'headed' is the original debugging setup: a maximised, visible browser that loads
+# every resource. 'production' runs headless in a fixed small viewport, blocks images
+# (content-settings pref plus CDP URL blocking), fonts and audio/video files (CDP URL
+# blocking), and turns CSS animations/transitions off. Stylesheets stay enabled because
+# the scrapers rely on is_displayed()/element_to_be_clickable, which depend on computed
+# styles.
+#
+# ProjectMetrics appends per-project wall time and Chrome RSS to a CSV, so both
+# profiles can be run against the same listing and compared with this module's CLI.
+
+import csv
+import os
+import sys
+import time
+
+from selenium import webdriver
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+USER_AGENT = ('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/138.0.7204.183 Safari/537.36')
+
+# Select with --profile or the GUJRERA_BROWSER_PROFILE environment variable
+PROFILE_ENV = 'GUJRERA_BROWSER_PROFILE'
+DEFAULT_PROFILE = 'headed'
+
+PROFILES = {
+    'headed': {
+        'headless': False,
+        'window_size': None,  # maximised
+        'block_resources': False,
+        'disable_animations': False,
+    },
+    'production': {
+        'headless': True,
+        # Narrower than this and the site switches to its mobile layout
+        'window_size': (1280, 800),
+        'block_resources': True,
+        'disable_animations': True,
+    },
+}
+
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.m4a', '*.m4v', '*.mov', '*.avi', '*.m3u8',
+]
+
+# 2 = block
+BLOCKED_CONTENT_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+}
+
+NO_ANIMATIONS_JS = """
+const style = document.createElement('style');
+style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; scroll-behavior: auto !important; }';
+(document.head || document.documentElement).appendChild(style);
+"""
+
+
+def profile_name(requested=None):
+    name = requested or os.environ.get(PROFILE_ENV) or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{name}' (choose from: {', '.join(PROFILES)})")
+    return name
+
+
+def build_chrome_options(profile=None):
+    """ChromeOptions for the named profile."""
+    settings = PROFILES[profile_name(profile)]
+    options = webdriver.ChromeOptions()
+    if settings['headless']:
+        options.add_argument('--headless=new')
+    if settings['window_size']:
+        options.add_argument('--window-size={},{}'.format(*settings['window_size']))
+    else:
+        options.add_argument('--start-maximized')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    # Add user-agent to mimic real browser (headless Chrome otherwise announces itself)
+    options.add_argument(USER_AGENT)
+    if settings['block_resources']:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        options.add_experimental_option('prefs', BLOCKED_CONTENT_PREFS)
+    if settings['disable_animations']:
+        options.add_argument('--force-prefers-reduced-motion')
+    return options
+
+
+def apply_cdp_settings(driver, profile=None):
+    """Request blocking and animation removal that can only be set on a live session."""
+    settings = PROFILES[profile_name(profile)]
+    try:
+        if settings['block_resources']:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        if settings['disable_animations']:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NO_ANIMATIONS_JS})
+    except Exception as e:
+        print(f"[WARN] Could not apply CDP settings for profile '{profile_name(profile)}': {e}")
+
+
+def chrome_rss_mb(driver):
+    """Resident memory of chromedriver's Chrome process tree in MB, or None without psutil."""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        total = 0
+        for proc in root.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return round(total / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+class ProjectMetrics:
+    """Append one row per scraped project: profile, project index, seconds, Chrome RSS."""
+
+    FIELDS = ['profile', 'project_index', 'seconds', 'chrome_rss_mb', 'timestamp']
+
+    def __init__(self, path, profile):
+        self.path = path
+        self.profile = profile_name(profile)
+        if psutil is None:
+            print('[WARN] psutil is not installed; Chrome RSS will not be recorded.')
+
+    def record(self, driver, project_index, seconds):
+        rss = chrome_rss_mb(driver)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='', encoding='utf-8') as fh:
+            writer = csv.DictWriter(fh, fieldnames=self.FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerow({
+                'profile': self.profile,
+                'project_index': project_index,
+                'seconds': f'{seconds:.2f}',
+                'chrome_rss_mb': '' if rss is None else rss,
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+        print(f"[INFO] Project {project_index + 1}: {seconds:.1f}s, Chrome RSS "
+              f"{'n/a' if rss is None else f'{rss} MB'} ({self.profile})")
+
+
+def summarize_metrics(paths):
+    """Per-profile project count, mean/median seconds and mean/peak RSS."""
+    by_profile = {}
+    for path in paths:
+        with open(path, newline='', encoding='utf-8') as fh:
+            for row in csv.DictReader(fh):
+                entry = by_profile.setdefault(row['profile'], {'seconds': [], 'rss': []})
+                entry['seconds'].append(float(row['seconds']))
+                if row.get('chrome_rss_mb'):
+                    entry['rss'].append(float(row['chrome_rss_mb']))
+    summary = {}
+    for profile, entry in by_profile.items():
+        secs = sorted(entry['seconds'])
+        summary[profile] = {
+            'projects': len(secs),
+            'mean_seconds': sum(secs) / len(secs),
+            'median_seconds': secs[len(secs) // 2],
+            'mean_rss_mb': sum(entry['rss']) / len(entry['rss']) if entry['rss'] else None,
+            'peak_rss_mb': max(entry['rss']) if entry['rss'] else None,
+        }
+    return summary
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or ['profile_metrics.csv']
+    summary = summarize_metrics(paths)
+    if not summary:
+        print('No metrics recorded.')
+        return 1
+    def fmt(v):
+        return 'n/a' if v is None else f'{v:.1f}'
+    for profile, s in summary.items():
+        print(f"{profile}: {s['projects']} projects, {s['mean_seconds']:.1f}s mean / "
+              f"{s['median_seconds']:.1f}s median per project, Chrome RSS {fmt(s['mean_rss_mb'])} MB mean / "
+              f"{fmt(s['peak_rss_mb'])} MB peak")
+    base = summary.get(DEFAULT_PROFILE)
+    for profile, s in summary.items():
+        if base and profile != DEFAULT_PROFILE:
+            ratio = s['mean_seconds'] / base['mean_seconds'] if base['mean_seconds'] else 0
+            print(f"{profile} vs {DEFAULT_PROFILE}: {ratio:.2f}x time per project")
+            if s['mean_rss_mb'] and base['mean_rss_mb']:
+                print(f"{profile} vs {DEFAULT_PROFILE}: {s['mean_rss_mb'] / base['mean_rss_mb']:.2f}x Chrome RSS")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
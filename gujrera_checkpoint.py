@@ -0,0 +1,153 @@
+# Crash-safe checkpoint journal for long Gujarat RERA crawls
+# Requirements: none (standard library)
+#
+# One JSON record per line, appended and fsync'd as each project is saved:
+#   {"event": "project", "shard": "380006", "index": 12, "reg_no": "PR/GJ/...", "route": "https://...", "ts": ...}
+#   {"event": "shard_done", "shard": "380006", "ts": ...}
+# A shard is one listing (a pincode, or the district-wide listing) and index is the
+# card position within it. Reading the journal back on restart gives the finished
+# cards and shards, so a resumed run skips the cards it already saved instead of
+# re-crawling. A card is only skipped when it is still the same project: its detail
+# route matches the recorded one, or (without routes) the recorded reg no appears in
+# the card's text; a listing that gained or reordered cards is re-scraped where it
+# moved. A line torn by a crash mid-write is ignored.
+#
+# The journal only spans one crawl: once a run has finished every card, complete()
+# moves it to <journal>.done, so the next run scrapes everything again (and field
+# history sees the re-scrape).
+
+import json
+import os
+import time
+
+
+class CheckpointJournal:
+    """Append-only record of finished projects and shards."""
+
+    def __init__(self, path, fresh=False):
+        self.path = path
+        self.done = {}          # shard -> {card index: {'reg_no': ..., 'route': ...}}
+        self.done_shards = set()
+        self.rows = {}          # shard -> [row, ...] for records that carry the row
+        if fresh and os.path.exists(path):
+            os.replace(path, path + '.bak')
+            print(f"[INFO] Previous journal moved to {path}.bak; starting fresh.")
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        records = 0
+        line = '\n'
+        with open(self.path, encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records += 1
+                self._apply(record)
+        if not line.endswith('\n'):
+            # Terminate a torn last line so the next record starts on its own line
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write('\n')
+        finished = sum(len(v) for v in self.done.values())
+        print(f"[INFO] Resuming from {self.path}: {finished} projects and "
+              f"{len(self.done_shards)} shards already finished ({records} records).")
+
+    def _apply(self, record):
+        shard = str(record.get('shard'))
+        if record.get('event') == 'shard_done':
+            self.done_shards.add(shard)
+        elif record.get('event') == 'project':
+            self.done.setdefault(shard, {})[record.get('index')] = {
+                'reg_no': record.get('reg_no') or '', 'route': record.get('route') or ''}
+            if record.get('row') is not None:
+                self.rows.setdefault(shard, []).append(record['row'])
+
+    def _append(self, record):
+        record['ts'] = time.time()
+        with open(self.path, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps(record, ensure_ascii=False) + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._apply(record)
+
+    def is_recorded(self, shard, index):
+        return index in self.done.get(str(shard), {})
+
+    def is_done(self, shard, index, route=None, card_text=None):
+        """True when the card at index was finished and is still the same project: same
+        detail route, or (without a route) its recorded reg no is in card_text. A card
+        that cannot be identified counts as not done."""
+        entry = self.done.get(str(shard), {}).get(index)
+        if entry is None:
+            return False
+        if route and entry['route']:
+            return entry['route'] == route
+        if card_text and entry['reg_no']:
+            return _squash(entry['reg_no']) in _squash(card_text)
+        return False
+
+    def is_shard_done(self, shard):
+        return str(shard) in self.done_shards
+
+    def record_project(self, shard, index, reg_no='', row=None, route=None):
+        record = {'event': 'project', 'shard': str(shard), 'index': index, 'reg_no': reg_no or '',
+                  'route': route or ''}
+        if row is not None:
+            record['row'] = row
+        self._append(record)
+
+    def record_shard_done(self, shard):
+        self._append({'event': 'shard_done', 'shard': str(shard)})
+
+    def complete(self):
+        """The crawl finished every card: move the journal to <journal>.done so the next
+        run starts over."""
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path + '.done')
+            print(f"[INFO] Crawl complete; journal moved to {self.path}.done.")
+        self.done = {}
+        self.done_shards = set()
+        self.rows = {}
+
+
+def _squash(text):
+    return ' '.join(str(text).split()).upper()
+
+
+class QueueJournal:
+    """Journal stand-in for worker processes. It answers is_done() from the journal as
+    it was at start-up and forwards new records through the result queue, so the
+    parent (the only CSV writer) journals a project only after saving its row."""
+
+    MARKER = '__journal__'
+
+    def __init__(self, path, result_queue):
+        self._journal = CheckpointJournal(path) if path else None
+        self._queue = result_queue
+
+    def is_recorded(self, shard, index):
+        return self._journal is not None and self._journal.is_recorded(shard, index)
+
+    def is_done(self, shard, index, route=None, card_text=None):
+        return self._journal is not None and self._journal.is_done(shard, index, route, card_text)
+
+    def is_shard_done(self, shard):
+        return self._journal is not None and self._journal.is_shard_done(shard)
+
+    def record_project(self, shard, index, reg_no='', row=None, route=None):
+        self._queue.put((self.MARKER, 'project', str(shard), index, reg_no or '', route or ''))
+
+    def record_shard_done(self, shard):
+        self._queue.put((self.MARKER, 'shard_done', str(shard)))
+
+
+def apply_queued_record(journal, item):
+    """Parent side of QueueJournal: write a forwarded record to the real journal."""
+    if item[1] == 'project':
+        _marker, _event, shard, index, reg_no, route = item
+        journal.record_project(shard, index, reg_no, route=route)
+    elif item[1] == 'shard_done':
+        journal.record_shard_done(item[2])
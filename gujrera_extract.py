@@ -0,0 +1,499 @@
+# In-page extraction for Gujarat RERA project pages
+# Requirements: selenium
+#
+# Instead of one find_elements/.text round-trip per label, PAGE_SNAPSHOT_JS collects
+# every labelled cell, <strong> and <p> on the current view in a single execute_script
+# call. FIELD_REGISTRY below describes every label-driven column declaratively, and
+# extract_view() resolves all of a view's columns from that payload in one pass.
+
+import re
+from collections import namedtuple
+
+PAGE_SNAPSHOT_JS = """
+const norm = (s) => (s || '').replace(/\\u00a0/g, ' ').trim();
+const text = (el) => el ? norm(el.innerText || el.textContent) : '';
+const child = (el, tag) => {
+    for (const c of el.children) { if (c.tagName === tag) { return c; } }
+    return null;
+};
+const out = {tds: [], strongs: [], ps: [], body: text(document.body)};
+for (const td of document.querySelectorAll('td')) {
+    const t = text(td);
+    if (t.includes(':-')) { out.tds.push([t, td.className || '']); }
+}
+for (const st of document.querySelectorAll('strong')) {
+    const td = st.closest('td');
+    const tr = st.closest('tr');
+    out.strongs.push([text(st), text(td), text(tr)]);
+}
+for (const p of document.querySelectorAll('p')) {
+    const strong = p.querySelector('strong');
+    const strongLink = strong ? strong.querySelector('a') : null;
+    const link = p.querySelector('a');
+    const span = p.querySelector('span');
+    let next = p.nextElementSibling;
+    while (next && next.tagName !== 'STRONG') { next = next.nextElementSibling; }
+    const ownStrong = child(p, 'STRONG');
+    const ownSpan = child(p, 'SPAN');
+    out.ps.push({
+        text: text(p),
+        in_pd: !!p.closest('ul.pd'),
+        strong: text(strong),
+        strong_link: strongLink ? (text(strongLink) || norm(strongLink.getAttribute('href'))) : '',
+        next_strong: text(next),
+        link: link ? (text(link) || norm(link.getAttribute('href'))) : '',
+        span: text(span),
+        own_strong: text(ownStrong),
+        own_span: text(ownSpan),
+    });
+}
+return out;
+"""
+
+# Field registry: every label-driven column, the view it is read from, how it is
+# found there (source), its label variants in order of preference, an optional value
+# pattern and a post-processor. compile_registry() turns it into per-view lookups
+# once at import; extract_view() then resolves all of a view's fields in one pass
+# over each node list of the snapshot payload. Adding a field is one entry here.
+#
+# Sources:
+#   marker       "<Label>:-" inside a <td>; the value follows the marker
+#   location     the no-print <td> holding "Taluka:- .., District:- .., State:- .."
+#   partners     numbered lines after "Partners:-" -> Partner 1..N
+#   plan_row     "<Label>:- value" in the row of the <strong> named by container (or
+#                anywhere in the page text when that row is missing)
+#   strong_cell  <td> of the first <strong> containing the label, read with pattern
+#   pd_number    first number in the <strong> of the ul.pd <p> containing the label
+#   profile_text free-text Project Profile value (strong, link, span, next line)
+#   promoter     <p><strong>Label</strong><span>Value</span></p> on the Promoters tab
+Field = namedtuple('Field', ['column', 'view', 'source', 'labels', 'pattern', 'post', 'container'])
+Field.__new__.__defaults__ = (None, None, None)
+
+
+def _nil_to_no(value):
+    return 'NO' if value.upper() == 'NIL' else value
+
+
+FIELD_REGISTRY = [
+    Field('Project Name', 'summary', 'marker', ('Project Name:-',)),
+    Field('RERA Reg. No.', 'summary', 'marker', ('GUJRERA Reg. No.:-',)),
+    Field('Project Address', 'summary', 'marker', ('Project Address:-',)),
+    Field('Taluka', 'summary', 'location', ('Taluka:-',)),
+    Field('District', 'summary', 'location', ('District:-',)),
+    Field('State', 'summary', 'location', ('State:-',)),
+    Field('Project Type', 'summary', 'marker', ('Project Type:-',)),
+    Field('About Property', 'summary', 'marker', ('About Property:-',)),
+    Field('Project Start Date', 'summary', 'marker', ('Project Start Date:-',)),
+    Field('Project End Date', 'summary', 'marker', ('Project End Date:-',)),
+    Field('Project Land Area', 'summary', 'marker', ('Project Land Area:-',)),
+    Field('Total Open Area', 'summary', 'marker', ('Total Open Area:-',)),
+    Field('Total Covered Area', 'summary', 'marker', ('Total Covered Area:-',)),
+    Field('Carpet Area of Units (Range)', 'summary', 'marker', ('Carpet Area of Units (Range):-',)),
+    Field('Plan Passing Authority', 'summary', 'marker', ('Plan Passing Authority:-',)),
+    Field('Redevelopment Project', 'summary', 'plan_row', ('Redevelopment Project',), post=_nil_to_no,
+          container='Plan Passing'),
+    Field('Affordable Housing', 'summary', 'plan_row', ('Affordable Housing',), container='Plan Passing'),
+    Field('Promoter Name', 'summary', 'marker', ('Promoter Name:-',)),
+    Field('Promoter Type', 'summary', 'marker', ('Promoter Type:-',)),
+    Field('Office Address', 'summary', 'marker', ('Office Address:-',)),
+    Field('Partner {n}', 'summary', 'partners', ('Partners:-',)),
+    Field('Project Estimated Cost (Rs.)', 'summary', 'strong_cell', ('Project Estimated Cost',),
+          pattern=r"Project\s*Estimated\s*Cost\s*\(Rs\.\)\s*:-\s*(.*)$"),
+    Field('Percentage Loan Against Project Estimated Cost', 'summary', 'strong_cell',
+          ('Percentage Loan Against Project Estimated Cost',),
+          pattern=r"Percentage\s*Loan\s*Against\s*Project\s*Estimated\s*Cost\s*:-\s*(.*)$"),
+    # Compliance counters keep 'NIL'; other placeholders count as empty
+    Field('Total Quarterly Compliance Required', 'summary', 'strong_cell', ('Total Quarterly Compliance Required',)),
+    Field('Total Complied Quarters', 'summary', 'strong_cell', ('Total Complied Quarters',)),
+    Field('Total Quarterly Compliance Defaulted', 'summary', 'strong_cell', ('Total Quarterly Compliance Defaulted',)),
+    Field('Total Annual Compliance Required', 'summary', 'strong_cell', ('Total Annual Compliance Required',)),
+    Field('Total Complied Annual Compliance', 'summary', 'strong_cell', ('Total Complied Annual Compliance',)),
+    Field('Total Annual Compliance Defaulted', 'summary', 'strong_cell', ('Total Annual Compliance Defaulted',)),
+    # Project Profile tab
+    Field('Total Units', 'profile', 'pd_number', ('Total Units',)),
+    Field('Available Units', 'profile', 'pd_number', ('Available Units',)),
+    Field('Total No. of Towers/Blocks', 'profile', 'pd_number',
+          ('Total No. of Towers/Blocks', 'Total No. of Towers', 'Total Towers', 'Total Blocks',
+           'Towers/Blocks', 'Towers', 'Blocks')),
+    Field('Project Status', 'profile', 'profile_text', ('Project Status',)),
+    Field('Website', 'profile', 'profile_text', ('Website',)),
+    Field('Approved Date', 'profile', 'profile_text', ('Approved Date',)),
+    # Promoters tab
+    Field('Promoter Name', 'promoters', 'promoter', ('Promoter Name',)),
+    Field('Promoter Type', 'promoters', 'promoter', ('Promoter Type',)),
+    Field('Contact', 'promoters', 'promoter', ('Contact',)),
+    Field('Email Id', 'promoters', 'promoter', ('Email Id',)),
+    Field('Address', 'promoters', 'promoter', ('Address',)),
+]
+
+# Node list of the snapshot payload each source reads
+_SOURCE_NODES = {
+    'marker': 'tds', 'location': 'tds', 'partners': 'tds',
+    'plan_row': 'strongs', 'strong_cell': 'strongs',
+    'pd_number': 'ps', 'profile_text': 'ps', 'promoter': 'ps',
+}
+
+PLACEHOLDER_VALUES = {'NA', 'N/A', 'NONE', 'NULL'}
+
+
+def _label_regex(label):
+    return r'\s*'.join(re.escape(word) for word in label.split())
+
+
+def compile_registry(registry):
+    """{view: {node list: (prefilter regex, [(field, [(rank, label, lowered, regex, trigger), ...])])}}"""
+    compiled = {}
+    for field in registry:
+        nodes = _SOURCE_NODES[field.source]
+        variants = []
+        for rank, label in enumerate(field.labels):
+            if field.pattern:
+                pattern = field.pattern
+            elif field.source == 'strong_cell':
+                pattern = rf"{re.escape(label)}\s*:?\s*-?\s*(.*)$"
+            elif field.source == 'plan_row':
+                pattern = _label_regex(label) + r"\s*:-\s*([^\n\r]+?)(?:\s{2,}|\s+$|$)"
+            elif field.source == 'location':
+                pattern = rf"{re.escape(label)}\s*([^,\n]+)"
+            elif field.source == 'profile_text':
+                pattern = rf"^\s*{re.escape(label)}\s*[:\-]*\s*"
+            else:
+                pattern = None
+            regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+            # Cheap substring every matching node must contain (whitespace-collapsed, lowercase)
+            trigger = ' '.join((field.container or label).lower().split())
+            if field.source == 'marker':
+                trigger = trigger[:-2]
+            variants.append((rank, label, label.lower(), regex, trigger))
+        compiled.setdefault(field.view, {}).setdefault(nodes, []).append((field, variants))
+    for view, by_nodes in compiled.items():
+        for nodes, fields in by_nodes.items():
+            labels = {v[1] for _f, variants in fields for v in variants}
+            labels.update(f.container for f, _variants in fields if f.container)
+            prefilter = re.compile('|'.join(_label_regex(l) for l in sorted(labels, key=len, reverse=True)),
+                                   re.IGNORECASE)
+            by_nodes[nodes] = (prefilter, fields)
+    return compiled
+
+
+COMPILED_REGISTRY = compile_registry(FIELD_REGISTRY)
+
+
+def view_columns(view, source=None):
+    """Columns the registry reads from a view (optionally only one source)."""
+    return [f.column for f in FIELD_REGISTRY if f.view == view and (source is None or f.source == source)]
+
+
+def view_labels(view, source=None):
+    """{column: label variants} the registry reads from a view (optionally only one source)."""
+    return {f.column: f.labels for f in FIELD_REGISTRY if f.view == view and (source is None or f.source == source)}
+
+
+# Project Profile values with a live fallback in the scraper: numbers through one
+# ul.pd settle wait ({column: label variants}), text labels through per-label pollers
+PROFILE_NUMBER_TARGETS = view_labels('profile', 'pd_number')
+PROFILE_TEXT_LABELS = view_columns('profile', 'profile_text')
+
+
+def snapshot_page(driver):
+    """Collect the label-bearing nodes of the current view in one round-trip."""
+    payload = driver.execute_script(PAGE_SNAPSHOT_JS) or {}
+    payload.setdefault('tds', [])
+    payload.setdefault('strongs', [])
+    payload.setdefault('ps', [])
+    payload.setdefault('body', '')
+    return payload
+
+
+def _after_marker(full_text, marker):
+    """Text after marker in a cell, or the next line when the marker ends its line."""
+    idx = full_text.find(marker)
+    if idx == -1:
+        return None
+    value = full_text[idx + len(marker):].strip()
+    if not value and '\n' in full_text:
+        lines = full_text.split('\n')
+        for i, line in enumerate(lines):
+            if marker in line:
+                if i + 1 < len(lines):
+                    value = lines[i + 1].strip()
+                break
+    return value
+
+
+def _is_placeholder(val):
+    return val.upper() in PLACEHOLDER_VALUES or val.upper().startswith('NAN')
+
+
+def _partners(full_text):
+    partners = []
+    idx = full_text.find('Partners:-')
+    for line in full_text[idx + len('Partners:-'):].strip().split('\n'):
+        if line.strip() and (line.strip()[0].isdigit() and '.' in line):
+            partner = line.split('.', 1)[1].strip()
+            if partner:
+                partners.append(partner)
+    return {f'Partner {i+1}': partner for i, partner in enumerate(partners)}
+
+
+def _profile_text(p, lowered, prefix_re):
+    """Value for a free-text Project Profile label (strong, link, span, then next line)."""
+    for candidate in (p['strong'], p['strong_link'], p['next_strong'], p['link'], p['span']):
+        if candidate:
+            return candidate
+    lines = [ln.strip() for ln in _LINE_SPLIT.split(p['text']) if ln.strip()]
+    for i, ln in enumerate(lines):
+        if lowered in ln.lower():
+            for candidate in lines[i + 1:]:
+                if candidate.lower() != lowered:
+                    return candidate
+            same_line_val = prefix_re.sub('', ln).strip()
+            if same_line_val and same_line_val.lower() != lowered:
+                return same_line_val
+            break
+    return ''
+
+
+_LINE_SPLIT = re.compile(r"[\r\n]+")
+_DIGITS = re.compile(r'\d+')
+_LOCATION_LABELS = [f.labels[0] for f in FIELD_REGISTRY if f.source == 'location']
+
+
+def _read(field, node, label, lowered, regex):
+    """Try one field variant against one node. Returns (matched, value): matched means
+    this node settles the field (value may still be None when it yields nothing)."""
+    source = field.source
+    if source == 'marker':
+        text = node[0]
+        if lowered[:-2] not in text.lower():
+            return False, None
+        value = _after_marker(text, label)
+        return value is not None, value or None
+    if source == 'location':
+        text, cls = node
+        if 'no-print' not in cls or not all(l in text for l in _LOCATION_LABELS):
+            return False, None
+        m = regex.search(text)
+        return True, (m.group(1).strip() or None) if m else None
+    if source == 'partners':
+        text = node[0]
+        if 'partners' not in text.lower() or label not in text:
+            return False, None
+        return True, _partners(text)
+    if source == 'strong_cell':
+        strong_text, td_text, _tr = node
+        if label not in ' '.join(strong_text.split()):
+            return False, None
+        m = regex.search(td_text) if td_text else None
+        val = m.group(1).strip() if m else ''
+        return True, val if val and not _is_placeholder(val) else None
+    if source == 'plan_row':
+        strong_text, _td, tr_text = node
+        if field.container not in ' '.join(strong_text.split()):
+            return False, None
+        m = regex.search(tr_text)
+        return True, m.group(1) if m else None
+    if source == 'pd_number':
+        if not (node['in_pd'] and label in node['text'] and node['strong']):
+            return False, None
+        nums = _DIGITS.findall(node['strong'])
+        return True, nums[0] if nums else None
+    if source == 'profile_text':
+        if lowered not in node['text'].lower():
+            return False, None
+        value = _profile_text(node, lowered, regex)
+        return bool(value), value or None
+    if source == 'promoter':
+        if not (node['own_strong'] and label in node['own_strong'] and node['own_span']):
+            return False, None
+        return True, node['own_span']
+    raise ValueError(f'Unknown field source {source!r}')
+
+
+def extract_view(payload, view, compiled=None):
+    """Resolve every registry field of view from a snapshot payload, walking each node
+    list once. A field settles on the first node that matches its preferred label;
+    later label variants only win when no earlier variant matched anywhere."""
+    compiled = (compiled or COMPILED_REGISTRY).get(view, {})
+    found = {}  # column -> (rank, value)
+    for nodes, (prefilter, fields) in compiled.items():
+        pending = list(fields)
+        for node in payload.get(nodes, ()):
+            if not pending:
+                break
+            text = node['text'] + '\n' + node['own_strong'] if nodes == 'ps' else node[0]
+            if not prefilter.search(text):
+                continue
+            folded = ' '.join(text.lower().split())
+            settled = []
+            for field, variants in pending:
+                best = found.get(field.column, (len(variants), None))[0]
+                for rank, label, lowered, regex, trigger in variants:
+                    if rank >= best:
+                        break
+                    if trigger not in folded:
+                        continue
+                    matched, value = _read(field, node, label, lowered, regex)
+                    if matched:
+                        found[field.column] = (rank, value)
+                        if rank == 0:
+                            settled.append(field)
+                        break
+            if settled:
+                pending = [(f, v) for f, v in pending if f not in settled]
+    # Fields read from the Plan Passing row fall back to the whole page text
+    for field, variants in compiled.get('strongs', (None, ()))[1]:
+        if field.source == 'plan_row' and field.column not in found:
+            m = re.search(_label_regex(variants[0][1]) + r"\s*:-\s*([^\n\r]+)", payload.get('body', ''),
+                          flags=re.IGNORECASE)
+            if m:
+                found[field.column] = (0, m.group(1))
+
+    data = {}
+    for field in FIELD_REGISTRY:
+        if field.view != view or found.get(field.column, (0, None))[1] is None:
+            continue
+        value = found[field.column][1]
+        if isinstance(value, dict):
+            data.update(value)
+            continue
+        if field.source == 'plan_row':
+            value = value.strip().strip(',')
+        data[field.column] = field.post(value) if field.post else value
+    return data
+
+
+def summary_fields(payload):
+    """Build the summary-page label -> value dict from a snapshot payload."""
+    return extract_view(payload, 'summary')
+
+
+def profile_fields(payload):
+    """Build the Project Profile label -> value dict from a snapshot payload."""
+    return extract_view(payload, 'profile')
+
+
+def promoter_fields(payload):
+    """Build the Promoters tab label -> value dict from a snapshot payload."""
+    return extract_view(payload, 'promoters')
+
+
+# Partner cards on the Promoters view: the nearest column <div> around each <p> that
+# mentions "name", minus the cards under the "Signatory Details" heading. The live
+# scraper and the snapshot parser build their XPaths from partner_card_xpaths() with
+# their own text predicate, collect every card's label <p>s as LABEL_PARTS (in the
+# page with LABEL_PARTS_JS, offline with lxml) and resolve them with partner_columns().
+PARTNER_CARD_CLASSES = ('avCol', 'col-sm-12', 'col-md-', 'col-lg-')
+PARTNER_SKIP_HEADING = 'signatory details'
+# column -> label variants, the first with a value wins
+PARTNER_LABELS = (('name', ('Name',)), ('mobile', ('Mobile',)), ('email', ('Email', 'Email Id')))
+
+# Parts of a label <p> (name, XPath from the <p>, whether a link's href stands in for
+# empty text), in the order label_value() tries them
+LABEL_PARTS = (
+    ('last_span', './/span[last()]', False),
+    ('strong', '(.//strong)[1]', False),
+    ('strong_link', '(.//strong)[1]//a', True),
+    ('last_desc', './/*[last()]', False),
+    ('link', './/a', True),
+    ('span', './/span', False),
+)
+
+LABEL_PARTS_JS = """
+const [container, labels, parts] = arguments;
+const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+function afterBr(p) {
+    let seen = false;
+    for (const node of p.childNodes) {
+        if (node.nodeName === 'BR') { seen = true; continue; }
+        if (!seen) { continue; }
+        if (node.nodeType === Node.TEXT_NODE && node.textContent.trim()) { return node.textContent.trim(); }
+        if (node.nodeType === Node.ELEMENT_NODE && text(node)) { return text(node); }
+    }
+    return '';
+}
+function partsOf(p) {
+    const out = {text: text(p), after_br: afterBr(p)};
+    for (const [name, xpath, href] of parts) {
+        const el = document.evaluate(xpath, p, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        out[name] = el ? (text(el) || (href ? (el.getAttribute('href') || '').trim() : '')) : null;
+    }
+    return out;
+}
+const out = {};
+const ps = Array.from(container.querySelectorAll('p'));
+for (const label of labels) {
+    const want = norm(label);
+    const having = ps.filter((p) => norm(p.textContent).includes(want));
+    const between = having.filter((p) => (p.getAttribute('class') || '').includes('justify-content-between'));
+    out[label] = (between.length ? between : having).map(partsOf);
+}
+return out;
+"""
+
+
+def partner_card_xpaths(contains):
+    """(card XPath, signatory-ancestor XPath from a card); contains(text) returns the
+    XPath predicate matching elements whose lower-cased text contains text."""
+    classes = ' or '.join(f"contains(@class,'{c}')" for c in PARTNER_CARD_CLASSES)
+    return (
+        f"//p[{contains('name')}]/ancestor::div[{classes}][1]",
+        f".//ancestor::div[.//h2[{contains(PARTNER_SKIP_HEADING)}]]",
+    )
+
+
+def partner_labels():
+    return [label for _column, labels in PARTNER_LABELS for label in labels]
+
+
+def label_value(parts, label):
+    """Value next to label in one <p> described by its parts: the last span, the
+    <strong> (or its link), the last descendant, a link, a span, the text after a <br>,
+    then "Label: value" or the line after the label in the <p>'s text."""
+    lowered = label.lower()
+    if parts['last_span'] and lowered not in parts['last_span'].lower():
+        return parts['last_span']
+    if parts['strong'] or parts['strong_link']:
+        return parts['strong'] or parts['strong_link']
+    if parts['last_desc'] and lowered not in parts['last_desc'].lower():
+        return parts['last_desc']
+    for name in ('link', 'span', 'after_br'):
+        if parts[name]:
+            return parts[name]
+    text_block = parts['text']
+    m = re.search(rf"{re.escape(label)}\s*[:\-：]*\s*([^\r\n]+)$", text_block, flags=re.IGNORECASE)
+    if m and m.group(1).strip():
+        return m.group(1).strip()
+    lines = [ln.strip() for ln in re.split(r"[\r\n]+", text_block) if ln.strip()]
+    for i, ln in enumerate(lines):
+        if lowered in ln.lower() and i + 1 < len(lines):
+            return lines[i + 1]
+    if lines:
+        return re.sub(rf"^\s*{re.escape(label)}\s*[:\-]*\s*", '', lines[0], flags=re.IGNORECASE).strip()
+    return ''
+
+
+def _card_value(card_parts, labels):
+    for label in labels:
+        for parts in card_parts.get(label, ()):
+            value = label_value(parts, label)
+            if value:
+                return value
+    return ''
+
+
+def partner_columns(cards):
+    """Partner 1..N cells ("Name, Mobile, Email") from each card's {label: [parts]}."""
+    data = {}
+    partners = []
+    for card_parts in cards:
+        partner = {column: _card_value(card_parts, labels).strip() for column, labels in PARTNER_LABELS}
+        if any(partner.values()):
+            partners.append(partner)
+    for i, partner in enumerate(partners, start=1):
+        mobile = partner['mobile']
+        if mobile:
+            mobile = re.sub(r"\D+", "", mobile) or mobile
+        data[f'Partner {i}'] = ", ".join(v for v in [partner['name'], mobile, partner['email']] if v)
+    return data
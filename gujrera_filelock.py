@@ -0,0 +1,127 @@
+# Advisory file locks and crash-safe writes for the shared output files
+# Requirements: none (standard library: fcntl on POSIX, msvcrt on Windows)
+#
+# Several crawler processes (two pincode runs, a manual compaction) may write the same
+# CSV. Every read-modify-write of an output goes through output_lock(path), an
+# exclusive advisory lock on <path>.lock, so one writer's rewrite can never interleave
+# with another's append. Full rewrites go to a temporary file in the same directory,
+# are fsync'd and then moved over the original with os.replace, so a crash leaves
+# either the old file or the new one, never a truncated mix. Appends are fsync'd
+# before the lock is released.
+
+import contextlib
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+_LOCAL = threading.local()
+
+
+def lock_path(path):
+    return path + '.lock'
+
+
+def _acquire(fh):
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _release(fh):
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def try_lock(fh):
+    """Take the exclusive lock on an open file without waiting. Returns False when
+    another process holds it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def unlock(fh):
+    _release(fh)
+
+
+@contextlib.contextmanager
+def output_lock(path):
+    """Hold the exclusive lock for path. Re-entrant within a thread, so helpers that
+    lock can be called from code that already holds the lock."""
+    key = os.path.abspath(path)
+    held = getattr(_LOCAL, 'held', None)
+    if held is None:
+        held = _LOCAL.held = {}
+    if key in held:
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+    fh = open(lock_path(path), 'a+')
+    try:
+        _acquire(fh)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            del held[key]
+            _release(fh)
+    finally:
+        fh.close()
+
+
+def _fsync_dir(path):
+    if fcntl is None:
+        return  # directories cannot be opened for fsync on Windows
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_csv(df, path, **to_csv_kwargs):
+    """Replace path with df written as CSV (temp file, fsync, os.replace)."""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as fh:
+            df.to_csv(fh, index=False, **to_csv_kwargs)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _fsync_dir(path)
+
+
+def append_csv(df, path, header=False):
+    """Append df's rows to path and fsync before returning."""
+    with open(path, 'a', newline='', encoding='utf-8') as fh:
+        df.to_csv(fh, index=False, header=header)
+        fh.flush()
+        os.fsync(fh.fileno())
@@ -0,0 +1,185 @@
+# Field-level change history across re-scrapes
+# Requirements: none (standard library sqlite3)
+# Usage: python gujrera_history.py history.db [--reg REG_NO] [--field FIELD] [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+#
+# The project table only ever fills empty cells, so a re-scrape that sees a new
+# Available Units, Project Status, compliance count or End Date leaves no trace there.
+# FieldHistory keeps the latest value seen for every (project, field) and appends a
+# change row (project, field, scraped_at, old, new) whenever a later scrape sees a
+# different non-empty value. Reg nos and field names are interned to integer ids and
+# times are stored as epoch seconds, so a change costs a few dozen bytes; indexes on
+# (project, field, time) and on time serve per-project timelines and date-range scans.
+# The first time a project is seen only its first_seen time is recorded; its
+# original values are the old side of its first changes (or field_latest, if none).
+# field_latest also keeps the scrape time of the value it holds, and a row that is not
+# newer than that is ignored for the field, so replaying rows (a raw log folded again,
+# a recovered spill) records nothing twice and never dates a change backwards.
+
+import argparse
+import csv
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+REG_COL = 'RERA Reg. No.'
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS history_projects (
+        id INTEGER PRIMARY KEY, reg_key TEXT UNIQUE NOT NULL, first_seen INTEGER NOT NULL)""",
+    'CREATE TABLE IF NOT EXISTS history_fields (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)',
+    """CREATE TABLE IF NOT EXISTS field_latest (
+        project_id INTEGER NOT NULL, field_id INTEGER NOT NULL, value TEXT NOT NULL,
+        seen_at REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (project_id, field_id)) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS field_changes (
+        project_id INTEGER NOT NULL, field_id INTEGER NOT NULL, scraped_at INTEGER NOT NULL,
+        old TEXT, new TEXT NOT NULL)""",
+    'CREATE INDEX IF NOT EXISTS field_changes_project ON field_changes (project_id, field_id, scraped_at)',
+    'CREATE INDEX IF NOT EXISTS field_changes_time ON field_changes (scraped_at)',
+)
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value).strip()
+
+
+def _epoch(value):
+    """Epoch seconds from a number or a YYYY-MM-DD[ HH:MM[:SS]] string."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return int(datetime.strptime(value, fmt).timestamp())
+        except ValueError:
+            continue
+    raise ValueError(f'Unrecognised time {value!r} (use YYYY-MM-DD)')
+
+
+class FieldHistory:
+    """Latest value per (reg no, field) plus an append-only log of changes."""
+
+    def __init__(self, path):
+        self.path = path
+        # Used from the write buffer's flush thread too; every use holds self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+        if 'seen_at' not in [r[1] for r in self.conn.execute('PRAGMA table_info(field_latest)')]:
+            # Databases from before seen_at: their latest values count as older than any row
+            self.conn.execute('ALTER TABLE field_latest ADD COLUMN seen_at REAL NOT NULL DEFAULT 0')
+        self.conn.commit()
+        self._projects = dict(self.conn.execute('SELECT reg_key, id FROM history_projects'))
+        self._fields = dict(self.conn.execute('SELECT name, id FROM history_fields'))
+
+    def _field_id(self, name):
+        if name not in self._fields:
+            cur = self.conn.execute('INSERT INTO history_fields (name) VALUES (?)', (name,))
+            self._fields[name] = cur.lastrowid
+        return self._fields[name]
+
+    def observe(self, row, scraped_at=None, commit=True):
+        """Compare row with the latest values seen for its reg no; returns the number of
+        changes recorded. Fields whose latest value was seen at or after scraped_at are
+        left alone."""
+        with self.lock:
+            return self._observe(row, scraped_at, commit)
+
+    def _observe(self, row, scraped_at, commit):
+        reg_key = _text(row.get(REG_COL)).upper()
+        if not reg_key:
+            return 0
+        scraped_at = float(scraped_at if scraped_at is not None else time.time())
+        project_id = self._projects.get(reg_key)
+        if project_id is None:
+            cur = self.conn.execute('INSERT INTO history_projects (reg_key, first_seen) VALUES (?, ?)',
+                                    (reg_key, int(scraped_at)))
+            project_id = self._projects[reg_key] = cur.lastrowid
+            latest = {}
+        else:
+            latest = {field_id: (value, seen_at) for field_id, value, seen_at in self.conn.execute(
+                'SELECT field_id, value, seen_at FROM field_latest WHERE project_id = ?', (project_id,))}
+        changes, updates = [], []
+        for field, value in row.items():
+            new = _text(value)
+            if field == REG_COL or not new:
+                continue
+            field_id = self._field_id(field)
+            old, seen_at = latest.get(field_id, (None, None))
+            if seen_at is not None and scraped_at <= seen_at:
+                continue  # a replay, or older than what we already hold
+            updates.append((project_id, field_id, new, scraped_at))
+            if old is not None and old != new:
+                changes.append((project_id, field_id, int(scraped_at), old, new))
+        self.conn.executemany('INSERT OR REPLACE INTO field_latest VALUES (?, ?, ?, ?)', updates)
+        self.conn.executemany('INSERT INTO field_changes VALUES (?, ?, ?, ?, ?)', changes)
+        if commit:
+            self.conn.commit()
+        return len(changes)
+
+    def observe_rows(self, rows, scraped_at=None):
+        """observe() each row in order in one transaction. scraped_at is one time for
+        every row or a list with one time per row (None meaning now)."""
+        rows = list(rows)
+        times = scraped_at if isinstance(scraped_at, (list, tuple)) else [scraped_at] * len(rows)
+        with self.lock:
+            changed = sum(self._observe(row, at, commit=False) for row, at in zip(rows, times))
+            self.conn.commit()
+        if changed:
+            print(f'Recorded {changed} field change(s) in {self.path}')
+        return changed
+
+    def changes(self, reg_no=None, field=None, since=None, until=None):
+        """[(reg_no, field, old, new, scraped_at)] oldest first, filtered by reg no, field
+        and scraped_at range (epoch seconds or YYYY-MM-DD)."""
+        where, params = [], []
+        if reg_no is not None:
+            where.append('p.reg_key = ?')
+            params.append(_text(reg_no).upper())
+        if field is not None:
+            where.append('f.name = ?')
+            params.append(field)
+        if since is not None:
+            where.append('c.scraped_at >= ?')
+            params.append(_epoch(since))
+        if until is not None:
+            where.append('c.scraped_at < ?')
+            params.append(_epoch(until))
+        sql = ('SELECT p.reg_key, f.name, c.old, c.new, c.scraped_at FROM field_changes c '
+               'JOIN history_projects p ON p.id = c.project_id JOIN history_fields f ON f.id = c.field_id')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        with self.lock:
+            return self.conn.execute(sql + ' ORDER BY c.scraped_at, c.rowid', params).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List recorded field changes as CSV.')
+    parser.add_argument('db')
+    parser.add_argument('--reg', default=None, help='only this RERA Reg. No.')
+    parser.add_argument('--field', default=None, help='only this field, e.g. "Available Units"')
+    parser.add_argument('--since', default=None, help='changes scraped on or after YYYY-MM-DD')
+    parser.add_argument('--until', default=None, help='changes scraped before YYYY-MM-DD')
+    args = parser.parse_args(argv)
+    history = FieldHistory(args.db)
+    writer = csv.writer(sys.stdout)
+    writer.writerow([REG_COL, 'field', 'old', 'new', 'scraped_at'])
+    for reg_key, field, old, new, scraped_at in history.changes(args.reg, args.field, args.since, args.until):
+        writer.writerow([reg_key, field, old, new, datetime.fromtimestamp(scraped_at).isoformat(sep=' ')])
+    history.close()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
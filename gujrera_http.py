@@ -0,0 +1,159 @@
+# Browserless HTTP backend for Gujarat RERA project detail endpoints
+# Requirements: requests
+# Usage: python gujrera_http.py templates CAPTURE_DIR PROJECT_ID
+#        python gujrera_http.py check CAPTURE_DIR PROJECT_ID
+#
+# Selenium is only needed to build the listing and read each card's detail route
+# (which carries the project id). Project payloads are then fetched directly from the
+# detail endpoints with one pooled, keep-alive requests.Session shared by a bounded
+# thread pool, and mapped onto the output columns with the same JSON alias table as
+# the network-capture backend. Projects whose HTTP fetch fails are handed back so the
+# caller can scrape them in the browser.
+#
+# Endpoint templates are URLs with a {project_id} placeholder. 'templates' derives them
+# from a project's --capture-dir payloads; 'check' serves those payloads from a local
+# stand-in server and fetches them back through this backend.
+
+import argparse
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from gujrera_network import json_fields, load_captures, make_replay_server
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/138.0.7204.183 Safari/537.36')
+
+DEFAULT_WORKERS = 4
+REQUEST_TIMEOUT = (10, 30)  # connect, read seconds
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(pool_size=DEFAULT_WORKERS, retries=3):
+    """requests.Session with keep-alive connection pooling and retry/backoff on
+    transient errors. One session is shared by all fetch threads."""
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=frozenset(['GET', 'POST']))
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'application/json, text/plain, */*',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def project_id_from_route(route):
+    """Project id from a detail route such as .../#/project-preview/12345 (last path
+    segment that contains a digit), or None."""
+    if not route:
+        return None
+    path = urlsplit(route).fragment or urlsplit(route).path
+    for segment in reversed([s for s in re.split(r'[/?&=]', path) if s]):
+        if re.search(r'\d', segment):
+            return segment
+    return None
+
+
+def endpoints_from_captures(captures, project_id):
+    """Endpoint templates from one project's captured XHR URLs (those containing its id)."""
+    templates = []
+    for capture in captures:
+        url = capture.get('url', '')
+        if project_id in url:
+            template = url.replace(project_id, '{project_id}')
+            if template not in templates:
+                templates.append(template)
+    return templates
+
+
+def fetch_project(session, endpoints, project_id, timeout=REQUEST_TIMEOUT):
+    """Fetch every detail endpoint for one project and map the JSON onto columns.
+    Raises on any HTTP or decoding error so the caller can fall back to the browser."""
+    captures = []
+    for template in endpoints:
+        url = template.format(project_id=project_id)
+        resp = session.get(url, timeout=timeout)
+        resp.raise_for_status()
+        captures.append({'url': url, 'status': resp.status_code, 'body': resp.json()})
+    row = json_fields(captures)
+    if not row.get('RERA Reg. No.') and not row.get('Project Name'):
+        raise ValueError(f'No project fields in {len(captures)} payloads for {project_id}')
+    return row
+
+
+def fetch_projects(project_ids, endpoints, workers=DEFAULT_WORKERS, session=None):
+    """Fetch {project_index: project_id} concurrently with at most `workers` requests in
+    flight. Yields (project_index, row) as they finish; row is None when the HTTP path
+    failed for that project."""
+    session = session or make_session(pool_size=workers)
+    print_lock = threading.Lock()
+
+    def fetch(project_index, project_id):
+        try:
+            return fetch_project(session, endpoints, project_id)
+        except Exception as e:
+            with print_lock:
+                print(f"[WARN] HTTP fetch failed for project {project_index + 1} ({project_id}): {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, idx, pid): idx for idx, pid in project_ids.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _rebase(url, base):
+    parts, base_parts = urlsplit(url), urlsplit(base)
+    return urlunsplit((base_parts.scheme, base_parts.netloc, parts.path, parts.query, ''))
+
+
+def check_against_replay(capture_dir, project_id):
+    """Serve a project's captures locally and fetch them through the HTTP backend.
+    Returns True when the fields match the ones built from the capture files."""
+    captures = load_captures(capture_dir)
+    endpoints = endpoints_from_captures(captures, project_id)
+    if not endpoints:
+        print(f'[WARN] No captured URL in {capture_dir} contains {project_id}')
+        return False
+    server = make_replay_server(captures)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        local_endpoints = [_rebase(t, base) for t in endpoints]
+        results = dict(fetch_projects({0: project_id}, local_endpoints, workers=1))
+    finally:
+        server.shutdown()
+        server.server_close()
+    expected = json_fields(captures)
+    if results.get(0) != expected:
+        print(f'[ERROR] HTTP backend gave {results.get(0)!r}, expected {expected!r}')
+        return False
+    print(f'[INFO] HTTP backend OK against local server: {len(endpoints)} endpoints, {len(expected)} fields')
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Derive or check detail endpoint templates for the HTTP backend.')
+    parser.add_argument('command', choices=['templates', 'check'])
+    parser.add_argument('capture_dir', help='a project capture directory from --network --capture-dir')
+    parser.add_argument('project_id', help='the id of the captured project, as it appears in its URLs')
+    args = parser.parse_args()
+    if args.command == 'templates':
+        for template in endpoints_from_captures(load_captures(args.capture_dir), args.project_id):
+            print(template)
+        return 0
+    return 0 if check_against_replay(args.capture_dir, args.project_id) else 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,81 @@
+# Deep-link navigation for Gujarat RERA project detail pages
+# Requirements: selenium
+#
+# The listing is built once (search, district filter, lazy loading). Every View More
+# card's detail route is then read in a single script call, and each project is opened
+# with driver.get(route) instead of clicking the card and rebuilding the listing with
+# back() or by re-applying the filter. Cards without a usable route keep the
+# click-and-return path.
+
+from urllib.parse import urljoin
+
+BASE_URL = 'https://gujrera.gujarat.gov.in/'
+
+HARVEST_ROUTES_JS = """
+const attrs = ['href', 'ng-reflect-router-link', 'routerlink', 'data-href', 'data-url'];
+const out = [];
+for (const a of document.querySelectorAll(arguments[0])) {
+    const found = {};
+    for (const name of attrs) {
+        const v = a.getAttribute(name);
+        if (v) { found[name] = v.trim(); }
+    }
+    const card = a.closest('.card') || a.closest('[class*="project"]') || a.parentElement;
+    out.push({attrs: found, card_text: card ? (card.innerText || '').trim() : ''});
+}
+return out;
+"""
+
+CARD_TEXT_JS = """
+const a = document.querySelectorAll(arguments[0])[arguments[1]];
+if (!a) { return null; }
+const card = a.closest('.card') || a.closest('[class*="project"]') || a.parentElement;
+return card ? (card.innerText || '').trim() : '';
+"""
+
+
+def _route_from_attrs(found):
+    """Absolute detail URL from a card link's attributes, or None when it only has a click handler."""
+    href = found.get('href') or found.get('data-href') or found.get('data-url') or ''
+    if href and not href.lower().startswith('javascript') and href != '#':
+        return urljoin(BASE_URL, href)
+    link = found.get('routerlink') or found.get('ng-reflect-router-link') or ''
+    if link:
+        # Angular reflects array router links as comma-separated segments
+        path = '/'.join(seg.strip().strip('/') for seg in link.split(',') if seg.strip())
+        return urljoin(BASE_URL, '#/' + path)
+    return None
+
+
+def harvest_detail_routes(driver, selector='a.vmore.mb-2'):
+    """Read every View More card once. Returns [{'route': url-or-None, 'card_text': str}, ...]
+    in listing order."""
+    cards = driver.execute_script(HARVEST_ROUTES_JS, selector) or []
+    harvested = [{'route': _route_from_attrs(c.get('attrs') or {}), 'card_text': c.get('card_text') or ''}
+                 for c in cards]
+    linked = sum(1 for c in harvested if c['route'])
+    print(f"[INFO] Harvested detail routes for {linked} of {len(harvested)} project cards.")
+    return harvested
+
+
+def route_at(harvested, project_index):
+    if harvested and project_index < len(harvested):
+        return harvested[project_index]['route']
+    return None
+
+
+def card_text_at(harvested, driver, project_index, selector='a.vmore.mb-2'):
+    """Text of the card at project_index: from the harvest when there is one, otherwise
+    read from the listing (None when the card is not there)."""
+    if harvested and project_index < len(harvested):
+        return harvested[project_index]['card_text']
+    try:
+        return driver.execute_script(CARD_TEXT_JS, selector, project_index)
+    except Exception:
+        return None
+
+
+def open_detail_route(driver, route):
+    """Navigate straight to a project's detail route."""
+    print(f'Opening project details directly: {route}')
+    driver.get(route)
@@ -0,0 +1,248 @@
+# Network-captured JSON backend for Gujarat RERA project pages
+# Requirements: selenium
+# Usage: python gujrera_network.py fields CAPTURE_DIR
+#        python gujrera_network.py serve CAPTURE_DIR [--port 8765]
+#        python gujrera_network.py replay CAPTURE_DIR
+#
+# The SPA fills the detail, Project Profile and Promoters views from XHR calls. With
+# Chrome performance logging enabled, every Network.responseReceived event for an
+# XHR/Fetch JSON response is read back with Network.getResponseBody, and row fields
+# are taken from the JSON values instead of polling rendered DOM text.
+#
+# The portal's API is not documented, so JSON keys are matched to output columns
+# through JSON_FIELD_ALIASES (keys compared lower-case with punctuation stripped).
+# Anything the payloads do not carry is filled from the DOM snapshot parsers.
+#
+# Captures saved with save_captures() can be served by a local stand-in server
+# ('serve'), and 'replay' re-fetches every payload from it and checks that the fields
+# built from the served responses match the ones built from the files on disk.
+
+import argparse
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+# Output column -> normalised JSON keys that carry it (first non-empty match wins)
+JSON_FIELD_ALIASES = {
+    'Project Name': ['projectname', 'projname'],
+    'RERA Reg. No.': ['projectregno', 'reraregno', 'gujreraregno', 'registrationno', 'regno', 'projregno'],
+    'Project Address': ['projectaddress', 'projaddress', 'projectaddr'],
+    'Project Type': ['projecttype', 'projtype', 'projecttypename'],
+    'About Property': ['aboutproperty', 'projectdesc', 'projectdescription'],
+    'Project Start Date': ['projectstartdate', 'startdate', 'projstartdate'],
+    'Project End Date': ['projectenddate', 'completiondate', 'enddate', 'projenddate'],
+    'Project Land Area': ['projectlandarea', 'totallandarea', 'landarea'],
+    'Total Open Area': ['totalopenarea', 'openarea'],
+    'Total Covered Area': ['totalcoveredarea', 'coveredarea'],
+    'Carpet Area of Units (Range)': ['carpetareaofunitsrange', 'carpetarearange', 'carpetarea'],
+    'Plan Passing Authority': ['planpassingauthority', 'planpassingauth', 'approvingauthority'],
+    'Taluka': ['taluka', 'talukaname'],
+    'District': ['district', 'districtname', 'distname'],
+    'State': ['state', 'statename'],
+    'Amenities': ['amenities', 'commonamenities', 'amenitieslist'],
+    'Total Units': ['totalunits', 'totalunit', 'noofunits'],
+    'Available Units': ['availableunits', 'availableunit', 'unbookedunits'],
+    'Total No. of Towers/Blocks': ['totalnooftowersblocks', 'nooftowers', 'noofblocks', 'totaltowers'],
+    'Project Status': ['projectstatus', 'projstatus'],
+    'Website': ['website', 'websiteurl', 'projectwebsite'],
+    'Approved Date': ['approveddate', 'approvaldate', 'reraapproveddate'],
+    'Promoter Name': ['promotername', 'promotorname', 'promotername1'],
+    'Promoter Type': ['promotertype', 'promotortype'],
+    'Office Address': ['officeaddress', 'promoteraddress', 'promotoraddress'],
+    'Contact': ['contact', 'mobileno', 'contactno', 'mobile'],
+    'Email Id': ['emailid', 'email', 'emailaddress'],
+}
+
+JSON_MIME_MARKERS = ('json', 'javascript')
+CAPTURE_RESOURCE_TYPES = {'XHR', 'Fetch'}
+
+
+def enable_network_capture(options):
+    """Turn on Chrome performance logging (Network.* events) for a ChromeOptions."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def _normalise_key(key):
+    return re.sub(r'[^a-z0-9]', '', str(key).lower())
+
+
+def drain_xhr_responses(driver, url_filter=None):
+    """Read the performance log accumulated since the last call and return the JSON
+    bodies of XHR/Fetch responses as [{'url', 'status', 'body'}, ...] in arrival order.
+    The log is cleared by reading it, so call this once before opening a project to
+    drop listing traffic."""
+    try:
+        entries = driver.get_log('performance')
+    except Exception as e:
+        print(f"[WARN] Performance log unavailable (was network capture enabled?): {e}")
+        return []
+    responses = []
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError, TypeError):
+            continue
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        params = message.get('params', {})
+        response = params.get('response', {})
+        url = response.get('url', '')
+        if params.get('type') not in CAPTURE_RESOURCE_TYPES:
+            continue
+        if not any(m in (response.get('mimeType') or '').lower() for m in JSON_MIME_MARKERS):
+            continue
+        if url_filter and url_filter not in url:
+            continue
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+            body = json.loads(result.get('body') or 'null')
+        except Exception:
+            # Body evicted from the buffer or not valid JSON
+            continue
+        responses.append({'url': url, 'status': response.get('status'), 'body': body})
+    return responses
+
+
+def _scalar_text(value):
+    if value is None or isinstance(value, (dict, bool)):
+        return ''
+    if isinstance(value, list):
+        items = [_scalar_text(v) for v in value]
+        return ', '.join(v for v in items if v)
+    return str(value).strip()
+
+
+def _walk_json(node):
+    """Yield (normalised key, value) for every key in a JSON document, depth first."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield _normalise_key(key), value
+            yield from _walk_json(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk_json(item)
+
+
+def json_fields(captures):
+    """Build the label -> value dict from captured XHR payloads."""
+    found = {}
+    for capture in captures:
+        for key, value in _walk_json(capture.get('body')):
+            text = _scalar_text(value)
+            if text and key not in found:
+                found[key] = text
+    data = {}
+    for column, aliases in JSON_FIELD_ALIASES.items():
+        for alias in aliases:
+            if found.get(alias):
+                data[column] = found[alias]
+                break
+    return data
+
+
+def save_captures(project_dir, captures):
+    """Write each capture to project_dir/xhr_NN.json for offline parsing and replay."""
+    os.makedirs(project_dir, exist_ok=True)
+    for i, capture in enumerate(captures, start=1):
+        with open(os.path.join(project_dir, f'xhr_{i:02d}.json'), 'w', encoding='utf-8') as fh:
+            json.dump(capture, fh, ensure_ascii=False, indent=1)
+
+
+def load_captures(project_dir):
+    captures = []
+    for name in sorted(os.listdir(project_dir)):
+        if name.startswith('xhr_') and name.endswith('.json'):
+            with open(os.path.join(project_dir, name), encoding='utf-8') as fh:
+                captures.append(json.load(fh))
+    return captures
+
+
+def _capture_key(url):
+    parts = urlsplit(url)
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+
+def make_replay_server(captures, port=0):
+    """Local stand-in for the portal API that serves captured bodies by path and query."""
+    routes = {_capture_key(c['url']): c for c in captures}
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            capture = routes.get(self.path)
+            if capture is None:
+                self.send_error(404, 'No capture for this path')
+                return
+            payload = json.dumps(capture['body']).encode('utf-8')
+            self.send_response(capture.get('status') or 200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_POST = do_GET
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer(('127.0.0.1', port), ReplayHandler)
+
+
+def replay_check(project_dir):
+    """Serve a project's captures locally, fetch them back and compare the fields.
+    Returns True when the served payloads produce the same row as the files."""
+    captures = load_captures(project_dir)
+    if not captures:
+        print(f'[WARN] No captures in {project_dir}')
+        return False
+    server = make_replay_server(captures)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        replayed = []
+        for capture in captures:
+            with urlopen(base + _capture_key(capture['url']), timeout=10) as resp:
+                replayed.append({'url': capture['url'], 'status': resp.status,
+                                 'body': json.loads(resp.read().decode('utf-8'))})
+    finally:
+        server.shutdown()
+        server.server_close()
+    expected = json_fields(captures)
+    actual = json_fields(replayed)
+    if actual != expected:
+        for key in sorted(set(expected) | set(actual)):
+            if expected.get(key) != actual.get(key):
+                print(f"[ERROR] {key}: expected {expected.get(key)!r}, replay gave {actual.get(key)!r}")
+        return False
+    print(f'[INFO] Replay OK for {project_dir}: {len(captures)} payloads, {len(actual)} fields')
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect, serve or replay captured gujrera XHR payloads.')
+    parser.add_argument('command', choices=['fields', 'serve', 'replay'])
+    parser.add_argument('capture_dir', help='a project capture directory (xhr_NN.json files)')
+    parser.add_argument('--port', type=int, default=8765, help='port for serve (default: 8765)')
+    args = parser.parse_args()
+    if args.command == 'fields':
+        for column, value in json_fields(load_captures(args.capture_dir)).items():
+            print(f'{column}: {value}')
+        return 0
+    if args.command == 'serve':
+        server = make_replay_server(load_captures(args.capture_dir), args.port)
+        print(f'Serving captures from {args.capture_dir} on http://127.0.0.1:{server.server_address[1]}/')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    return 0 if replay_check(args.capture_dir) else 1
+
+
+if __name__ == '__main__':
+    exit(main())
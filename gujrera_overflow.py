@@ -0,0 +1,106 @@
+# Long-format overflow sidecar for columns the output CSV header does not have yet
+# Requirements: pandas
+# Usage: python gujrera_overflow.py [ahmedabad_projects.csv]   (fold the sidecar into the CSV)
+#
+# The CSV header is fixed when the file is first written, with all of DESIRED_COLUMNS
+# plus the first batch's extra columns. When a later row carries a column the header
+# lacks (Partner 6 ... Partner 16 for projects with many partners, a new label on the
+# site), its cells are appended to <csv>.overflow.csv as
+#   RERA Reg. No.,column,value
+# instead of rewriting the whole CSV to widen the header. Only the first non-empty
+# value per (reg no, column) is kept, matching the fill-empty rule of the main file.
+# read_projects() returns the wide table with the overflow columns pivoted back in,
+# and fold_overflow() (run after a crawl) rewrites the CSV once with the full header.
+
+import os
+import sys
+
+import pandas as pd
+
+from gujrera_filelock import output_lock, atomic_write_csv, append_csv
+
+OVERFLOW_COLUMNS = ['column', 'value']
+
+
+def overflow_path(csv_path):
+    return csv_path + '.overflow.csv'
+
+
+def _non_empty(series):
+    return series.notna() & series.astype(str).str.strip().ne('')
+
+
+def split_overflow(df, header, reg_col):
+    """(df limited to the header's columns, long frame of the non-empty cells in the
+    other columns). df must already carry the normalised reg_col."""
+    extra = [c for c in df.columns if c not in header]
+    if not extra:
+        return df, None
+    long = df[[reg_col] + extra].melt(id_vars=reg_col, var_name='column', value_name='value')
+    long = long[_non_empty(long['value'])]
+    return df.drop(columns=extra), long
+
+
+def read_overflow(csv_path, reg_col='RERA Reg. No.'):
+    path = overflow_path(csv_path)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=[reg_col] + OVERFLOW_COLUMNS)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def append_overflow(csv_path, long, reg_col='RERA Reg. No.'):
+    """Append the (reg no, column) cells not already recorded. Returns the number written."""
+    if long is None or long.empty:
+        return 0
+    existing = read_overflow(csv_path, reg_col)
+    known = set(zip(existing[reg_col], existing['column']))
+    long = long.drop_duplicates(subset=[reg_col, 'column'], keep='first')
+    keep = [(reg, col) not in known for reg, col in zip(long[reg_col], long['column'])]
+    long = long[keep]
+    if long.empty:
+        return 0
+    path = overflow_path(csv_path)
+    append_csv(long, path, header=not os.path.exists(path))
+    print(f"Recorded {len(long)} value(s) for columns {sorted(set(long['column']))} in {path}.")
+    return len(long)
+
+
+def read_projects(csv_path, reg_col='RERA Reg. No.', order_columns=None):
+    """The output CSV as text, widened with its overflow columns."""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    overflow = read_overflow(csv_path, reg_col)
+    if overflow.empty:
+        return df
+    wide = overflow.pivot_table(index=reg_col, columns='column', values='value', aggfunc='first', sort=False)
+    extra = [c for c in dict.fromkeys(overflow['column']) if c not in df.columns]
+    keys = df[reg_col].astype(str).str.strip().str.upper()
+    for col in extra:
+        df[col] = keys.map(wide[col]).fillna('').astype(str).values
+    if order_columns is not None:
+        df = df[order_columns([], list(df.columns))]
+    return df
+
+
+def fold_overflow(csv_path, reg_col='RERA Reg. No.', order_columns=None):
+    """Rewrite the CSV once with the overflow columns in its header and drop the sidecar."""
+    path = overflow_path(csv_path)
+    with output_lock(csv_path):
+        if not os.path.exists(path):
+            print(f'No overflow columns recorded for {csv_path}.')
+            return False
+        df = read_projects(csv_path, reg_col, order_columns)
+        atomic_write_csv(df, csv_path)
+        os.remove(path)
+    print(f'Folded overflow columns into {csv_path} ({len(df.columns)} columns).')
+    return True
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    from scrape_gujrera_ahmedabad import OUTPUT_CSV, _order_columns
+    fold_overflow(argv[0] if argv else OUTPUT_CSV, order_columns=_order_columns)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,158 @@
+# Typed Parquet output for the Gujarat RERA project table
+# Requirements: pandas, pyarrow
+# Usage: python gujrera_parquet.py [ahmedabad_projects.csv | projects.db] [out.parquet]
+#
+# The CSV keeps every value as scraped text. The Parquet copy applies an explicit
+# schema so notebooks can load it without re-parsing:
+#   - areas (Sq Mtrs) and the carpet-area range bounds as float64
+#   - the estimated cost (Indian digit grouping) as int64, the loan percentage as float64
+#   - unit/tower counts and compliance counters as int64 ('NIL' counts as 0)
+#   - start/end/approved dates (dd-mm-yyyy) as date32
+#   - District, Taluka, Promoter Type and Project Status dictionary-encoded
+# Text that does not parse becomes null in the typed column; every other column
+# (partners, type details, addresses, ...) is stored as a string.
+
+import os
+import sys
+
+import pandas as pd
+
+from gujrera_overflow import read_projects
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+AREA_COLUMNS = ['Project Land Area', 'Total Open Area', 'Total Covered Area']
+CARPET_RANGE_COLUMN = 'Carpet Area of Units (Range)'
+CARPET_BOUND_COLUMNS = ['Carpet Area Min (Sq Mtrs)', 'Carpet Area Max (Sq Mtrs)']
+COST_COLUMN = 'Project Estimated Cost (Rs.)'
+PERCENT_COLUMNS = ['Percentage Loan Against Project Estimated Cost']
+COUNT_COLUMNS = [
+    'Total Units',
+    'Available Units',
+    'Total No. of Towers/Blocks',
+    'Total Quarterly Compliance Required',
+    'Total Complied Quarters',
+    'Total Quarterly Compliance Defaulted',
+    'Total Annual Compliance Required',
+    'Total Complied Annual Compliance',
+    'Total Annual Compliance Defaulted',
+]
+DATE_COLUMNS = ['Project Start Date', 'Project End Date', 'Approved Date']
+DATE_FORMAT = '%d-%m-%Y'
+DICTIONARY_COLUMNS = ['District', 'Taluka', 'Promoter Type', 'Project Status']
+
+_LEADING_NUMBER = r'^\s*([\d,]*\.?\d+)'
+
+
+def _text(series):
+    return series.astype('string').str.strip()
+
+
+def _leading_float(series):
+    """First number at the start of each cell ('226.47 Sq Mtrs\\n...' -> 226.47)."""
+    return pd.to_numeric(_text(series).str.extract(_LEADING_NUMBER, expand=False).str.replace(',', ''),
+                         errors='coerce').astype('float64')
+
+
+def _count(series):
+    text = _text(series).str.upper().replace({'NIL': '0'})
+    return pd.to_numeric(text.str.extract(r'^(\d+)', expand=False), errors='coerce').astype('Int64')
+
+
+def typed_frame(df):
+    """Copy of df with the typed columns converted (and the carpet-area bounds added)."""
+    out = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        if col in AREA_COLUMNS:
+            out[col] = _leading_float(df[col])
+        elif col == COST_COLUMN:
+            digits = _text(df[col]).str.replace(r'[^\d.]', '', regex=True)
+            out[col] = pd.to_numeric(digits, errors='coerce').round().astype('Int64')
+        elif col in PERCENT_COLUMNS:
+            out[col] = _leading_float(_text(df[col]).str.rstrip('%'))
+        elif col in COUNT_COLUMNS:
+            out[col] = _count(df[col])
+        elif col in DATE_COLUMNS:
+            out[col] = pd.to_datetime(_text(df[col]), format=DATE_FORMAT, errors='coerce').dt.date
+        else:
+            out[col] = _text(df[col]).replace('', pd.NA)
+        if col == CARPET_RANGE_COLUMN:
+            bounds = _text(df[col]).str.extract(r'^\s*([\d.]+)(?:\D*?-\s*([\d.]+))?', expand=True)
+            out[CARPET_BOUND_COLUMNS[0]] = pd.to_numeric(bounds[0], errors='coerce').astype('float64')
+            out[CARPET_BOUND_COLUMNS[1]] = pd.to_numeric(bounds[1].fillna(bounds[0]), errors='coerce').astype('float64')
+    return out
+
+
+def arrow_type(col):
+    if col in AREA_COLUMNS or col in PERCENT_COLUMNS or col in CARPET_BOUND_COLUMNS:
+        return pa.float64()
+    if col == COST_COLUMN or col in COUNT_COLUMNS:
+        return pa.int64()
+    if col in DATE_COLUMNS:
+        return pa.date32()
+    if col in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+def project_schema(columns):
+    return pa.schema([pa.field(col, arrow_type(col)) for col in columns])
+
+
+def write_parquet(df, parquet_path):
+    """Write the project table to parquet_path with the typed schema."""
+    if pa is None:
+        raise RuntimeError('pyarrow is required for Parquet output (pip install pyarrow)')
+    typed = typed_frame(df)
+    schema = project_schema(list(typed.columns))
+    arrays = []
+    for field in schema:
+        values = typed[field.name].astype(object).where(typed[field.name].notna(), None).tolist()
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    table = pa.Table.from_arrays(arrays, schema=schema)
+    tmp_path = parquet_path + '.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, parquet_path)
+    print(f'Wrote {table.num_rows} projects to {parquet_path}')
+    return table
+
+
+def read_source(path):
+    """Project rows as text from an output CSV (with its overflow columns) or a
+    gujrera_store SQLite file."""
+    if path.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        import sqlite3
+        conn = sqlite3.connect(path)
+        try:
+            return pd.read_sql_query('SELECT * FROM projects', conn, dtype=str).drop(columns=['reg_key'])
+        finally:
+            conn.close()
+    return read_projects(path)
+
+
+def export_parquet(source_path, parquet_path=None, order_columns=None):
+    parquet_path = parquet_path or os.path.splitext(source_path)[0] + '.parquet'
+    df = read_source(source_path)
+    if order_columns is not None:
+        df = df[order_columns([], list(df.columns))]
+    return write_parquet(df, parquet_path)
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    source = argv[0] if argv else 'ahmedabad_projects.csv'
+    target = argv[1] if len(argv) > 1 else None
+    from scrape_gujrera_ahmedabad import _order_columns
+    export_parquet(source, target, _order_columns)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,177 @@
+# Append-only raw record log for scraped rows, compacted into the project table
+# Requirements: none (standard library); compaction uses the scraper's save_rows
+# Usage: python gujrera_rawlog.py crawl_rows.jsonl [--db ahmedabad_projects.db | --csv ahmedabad_projects.csv] [--from-start]
+#
+# Each scraped row is appended (and fsync'd) as one JSON line
+#   {"ts": 1718000000.0, "shard": "380006", "row": {...}}
+# so saving a project is a single sequential write whatever the size of the table.
+# A background thread folds the lines added since the last compaction into the CSV
+# or SQLite store with save_rows (same reg no merged, empty fields filled, non-empty
+# fields never overwritten) and, only once that write has succeeded (save_rows raises
+# when it fails), records the byte offset it reached in <log>.offset. Each folded row
+# carries its line's ts under SCRAPED_AT, so field history is recorded with the time
+# the row was scraped. Folding a line twice leaves the table as it was (fill-empty) and
+# the history too (rows no newer than a field's latest value are ignored), so a crash
+# between the write and the offset update only means those lines are folded again.
+# The log itself is never rewritten and keeps the full scrape history.
+
+import argparse
+import json
+import os
+import threading
+import time
+
+from gujrera_writebuffer import SCRAPED_AT, _install_sigterm_handler
+
+
+class RawRecordLog:
+    """Append-only row log with background compaction through compact_fn(rows).
+    Offers the same add()/close() interface as RowWriteBuffer."""
+
+    def __init__(self, path, compact_fn, shard='', interval=60.0, batch_rows=500):
+        self.path = path
+        self.offset_path = path + '.offset'
+        self.compact_fn = compact_fn
+        self.shard = str(shard or '')
+        self.interval = interval
+        self.batch_rows = max(1, batch_rows)
+        self.appended = 0
+        self.compacted = 0
+        self._write_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._closed = False
+        self._terminate_torn_line()
+        self._stop = threading.Event()
+        self._thread = None
+        if interval and interval > 0:
+            self._thread = threading.Thread(target=self._run, name='raw-log-compactor', daemon=True)
+            self._thread.start()
+        _install_sigterm_handler()
+
+    def _terminate_torn_line(self):
+        """End a line torn by a crash mid-append, so the next row starts on its own line
+        (the torn line is then skipped as unreadable by compaction)."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, 'rb+') as fh:
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b'\n':
+                fh.write(b'\n')
+
+    def add(self, row, shard=None):
+        shard = shard if shard is not None else row.get('Pincode') or self.shard
+        line = json.dumps({'ts': time.time(), 'shard': str(shard or ''), 'row': row},
+                          ensure_ascii=False, default=str) + '\n'
+        with self._write_lock:
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write(line)
+                fh.flush()
+                os.fsync(fh.fileno())
+            self.appended += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.compact()
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path, encoding='utf-8') as fh:
+                return int(fh.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self, offset):
+        tmp = self.offset_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            fh.write(str(offset))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.offset_path)
+
+    def compact(self, from_start=False):
+        """Fold the lines added since the last compaction into the table. Returns the
+        number of rows folded (0 when there was nothing new or compact_fn failed)."""
+        with self._compact_lock:
+            if not os.path.exists(self.path):
+                return 0
+            offset = 0 if from_start else self._read_offset()
+            if offset > os.path.getsize(self.path):
+                print(f"[WARN] {self.offset_path} is past the end of {self.path}; compacting from the start.")
+                offset = 0
+            folded = 0
+            with open(self.path, 'rb') as fh:
+                fh.seek(offset)
+                while True:
+                    rows, end = self._read_batch(fh, offset)
+                    if end == offset:
+                        break
+                    if rows:
+                        try:
+                            self.compact_fn(rows)
+                        except Exception as e:
+                            # Nothing was written: the offset stays put and the same
+                            # lines are retried next time
+                            print(f"[ERROR] Compacting {len(rows)} rows from {self.path} failed: {e}")
+                            break
+                    self._write_offset(end)
+                    folded += len(rows)
+                    offset = end
+            self.compacted += folded
+            return folded
+
+    def _read_batch(self, fh, offset):
+        """Up to batch_rows complete lines from fh; a line still being written (no
+        newline yet) is left for the next compaction."""
+        rows = []
+        end = offset
+        while len(rows) < self.batch_rows:
+            line = fh.readline()
+            if not line.endswith(b'\n'):
+                break
+            end += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"[WARN] Skipping unreadable line at byte {end - len(line)} of {self.path}")
+                continue
+            row = record.get('row')
+            if isinstance(row, dict):
+                if record.get('ts') is not None:
+                    row[SCRAPED_AT] = record['ts']
+                rows.append(row)
+        return rows, end
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.compact()
+        print(f'{self.appended} rows logged to {self.path}; {self.compacted} compacted this run.')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compact a raw row log into the project CSV or SQLite store.')
+    parser.add_argument('log')
+    parser.add_argument('--db', default=None, help='fold into this SQLite store (gujrera_store.py)')
+    parser.add_argument('--csv', default=None, help='fold into this CSV (default: the scraper\'s output CSV)')
+    parser.add_argument('--from-start', action='store_true',
+                        help='fold the whole log again, ignoring the recorded offset')
+    args = parser.parse_args(argv)
+    import functools
+    from scrape_gujrera_ahmedabad import OUTPUT_CSV, DISALLOWED_COLUMNS, save_rows
+    from gujrera_store import ProjectStore
+    store = ProjectStore(args.db, DISALLOWED_COLUMNS) if args.db else None
+    log = RawRecordLog(args.log, functools.partial(save_rows, file_path=args.csv or OUTPUT_CSV, store=store),
+                       interval=0)
+    folded = log.compact(from_start=args.from_start)
+    print(f'Compacted {folded} rows from {args.log}')
+    if store is not None:
+        store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
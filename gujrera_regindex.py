@@ -0,0 +1,190 @@
+# Persistent reg-no index kept next to an output CSV
+# Requirements: pandas
+#
+# <csv>.regidx is a JSON-lines sidecar recording, for every normalised RERA Reg. No.
+# in the CSV, its data-row offset, a hash of its non-empty fields and the names of
+# those fields, plus the CSV header and the file's size/mtime after our last write.
+# It is loaded once per process and only appended to as rows are added, so
+# append_unique_by_regno can tell whether a batch is new, unchanged or would fill
+# empty cells without opening the CSV. If the CSV was changed by anything else (the
+# recorded size/mtime no longer match) the index is treated as stale and rebuilt
+# from the frame the next full read produces.
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+_INDEXES = {}
+
+
+def index_path(csv_path):
+    return csv_path + '.regidx'
+
+
+def _is_empty(value):
+    try:
+        if pd.isna(value):
+            return True
+    except (TypeError, ValueError):
+        pass
+    return str(value).strip() == ''
+
+
+def _filled(row, reg_col):
+    """{column: text} for the non-empty fields of a row (a dict or Series)."""
+    return {str(c): str(v).strip() for c, v in row.items() if c != reg_col and not _is_empty(v)}
+
+
+def content_hash(filled):
+    return hashlib.sha1(json.dumps(sorted(filled.items()), ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _file_stat(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class RegNoIndex:
+    """key -> [first row offset, content hash, filled columns] for one CSV."""
+
+    def __init__(self, csv_path, reg_col):
+        self.csv_path = csv_path
+        self.path = index_path(csv_path)
+        self.reg_col = reg_col
+        self.entries = {}
+        self.columns = []
+        self.rows = 0
+        self.stat = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # Torn last line: the stat check below will not match
+                        continue
+                    self._apply(rec)
+        except OSError:
+            self.stat = None
+
+    def _apply(self, rec):
+        if 'key' in rec:
+            entry = self.entries.get(rec['key'])
+            if entry is None:
+                self.entries[rec['key']] = [rec['offset'], rec['hash'], set(rec['filled'])]
+            else:
+                # Reg no repeated in the CSV: a field only counts as filled if it is
+                # filled in every copy, and no single hash describes them all
+                entry[1] = ''
+                entry[2] &= set(rec['filled'])
+        elif 'columns' in rec:
+            self.columns = rec['columns']
+        elif 'stat' in rec:
+            self.stat = rec['stat']
+            self.rows = rec['rows']
+
+    def is_current(self):
+        """True when the sidecar describes the CSV as it is on disk now."""
+        try:
+            return self.stat is not None and self.columns and _file_stat(self.csv_path) == self.stat
+        except OSError:
+            return False
+
+    def refresh(self):
+        """Reload the sidecar when the CSV changed since this process last wrote it (another
+        process sharing the output may have appended and updated the sidecar)."""
+        if not self.is_current():
+            self.entries, self.columns, self.rows, self.stat = {}, [], 0, None
+            self._load()
+
+    def _entry_records(self, frame, start_offset):
+        records = []
+        for i, row in enumerate(frame.to_dict('records')):
+            key = str(row.get(self.reg_col, '')).strip().upper()
+            filled = _filled(row, self.reg_col)
+            records.append({'key': key, 'offset': start_offset + i, 'hash': content_hash(filled),
+                            'filled': sorted(filled)})
+        return records
+
+    def _write(self, records, mode):
+        with open(self.path, mode, encoding='utf-8') as fh:
+            for rec in records:
+                fh.write(json.dumps(rec, ensure_ascii=False) + '\n')
+        for rec in records:
+            self._apply(rec)
+
+    def rebuild(self, frame):
+        """Replace the index with one describing frame (the CSV's full contents)."""
+        self.entries = {}
+        records = [{'columns': list(frame.columns)}]
+        records += self._entry_records(frame, 0)
+        records.append({'stat': _file_stat(self.csv_path), 'rows': len(frame)})
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            for rec in records:
+                fh.write(json.dumps(rec, ensure_ascii=False) + '\n')
+        os.replace(tmp, self.path)
+        for rec in records:
+            self._apply(rec)
+
+    def record_append(self, frame):
+        """Add rows just appended to the CSV (frame in header order)."""
+        records = self._entry_records(frame, self.rows)
+        records.append({'stat': _file_stat(self.csv_path), 'rows': self.rows + len(frame)})
+        self._write(records, 'a')
+
+    def invalidate(self):
+        self.entries, self.columns, self.rows, self.stat = {}, [], 0, None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def offset(self, key):
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    def unchanged(self, key, row):
+        """True when writing row under key would not change the CSV: same content hash,
+        or every non-empty incoming field is already filled in the stored row."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        filled = _filled(row, self.reg_col)
+        if content_hash(filled) == entry[1]:
+            return True
+        return set(filled) <= entry[2]
+
+    def plan_append(self, df):
+        """Rows of df to append when the batch can be handled from the index alone, or
+        None when the CSV must be read (new columns, empty cells to fill, or repeated
+        new keys within the batch)."""
+        if not self.is_current():
+            return None
+        if any(c not in self.columns for c in df.columns):
+            return None
+        keys = df[self.reg_col]
+        is_dup = keys.isin(self.entries.keys())
+        for key, row in zip(keys[is_dup], df[is_dup].to_dict('records')):
+            if not self.unchanged(key, row):
+                return None
+        df_new = df[~is_dup]
+        if df_new[self.reg_col].duplicated().any():
+            return None
+        return df_new.reindex(columns=self.columns)
+
+
+def reg_index_for(csv_path, reg_col):
+    """The process-wide index for csv_path (loaded from its sidecar on first use)."""
+    key = (os.path.abspath(csv_path), reg_col)
+    if key not in _INDEXES:
+        _INDEXES[key] = RegNoIndex(csv_path, reg_col)
+    return _INDEXES[key]
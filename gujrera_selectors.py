@@ -0,0 +1,149 @@
+# Precompiled label selectors for the live Gujarat RERA scrapers
+# Requirements: selenium
+#
+# The per-label fallbacks used to build a translate(...) XPath and several re.escape
+# patterns on every call, and the translate() made the browser lower-case the text of
+# every <p> on the page for every lookup. Here each label's XPaths and regexes are
+# built once (at import for the known labels, then cached), and index_labels() stamps
+# every <p>, <h2> and <td> with a lower-cased, whitespace-collapsed copy of its text in
+# data-gr-lc in one script call. The XPaths match on that attribute with a plain
+# contains(), so repeated lookups on the same view reuse the stamped text.
+
+import functools
+import re
+from collections import namedtuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from gujrera_extract import FIELD_REGISTRY
+
+LC_ATTR = 'data-gr-lc'
+
+INDEX_LABELS_JS = """
+const attr = arguments[0];
+const nodes = document.querySelectorAll('p, h2, td');
+for (const el of nodes) {
+    const t = (el.textContent || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    if (el.getAttribute(attr) !== t) { el.setAttribute(attr, t); }
+}
+return nodes.length;
+"""
+
+# First text after a <br> inside the element (values not wrapped in a tag)
+AFTER_BR_JS = """
+const p = arguments[0];
+let afterBr = false;
+for (const node of p.childNodes) {
+    if (node.nodeName === 'BR') { afterBr = true; continue; }
+    if (!afterBr) { continue; }
+    if (node.nodeType === Node.TEXT_NODE) {
+        const t = (node.textContent || '').trim();
+        if (t) { return t; }
+    }
+    if (node.nodeType === Node.ELEMENT_NODE) {
+        const t = (node.innerText || node.textContent || '').trim();
+        if (t) { return t; }
+    }
+}
+return '';
+"""
+
+LabelSelectors = namedtuple('LabelSelectors', [
+    'label',
+    'lowered',
+    'p_xpath',              # any <p> on the page containing the label
+    'container_p_xpath',    # .//p.justify-content-between containing the label
+    'container_any_xpath',  # .//p containing the label
+    'prefix_re',            # "Label :-" at the start of a line
+    'inline_re',            # "Label: value" at the end of a text block
+    'body_re',              # "Label :- value" anywhere in the page text
+])
+
+
+def _xpath_literal(text):
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat('" + "', \"'\", '".join(text.split("'")) + "')"
+
+
+def lc_contains(text):
+    """XPath predicate body matching elements stamped by index_labels() whose text contains text."""
+    return f"contains(@{LC_ATTR}, {_xpath_literal(' '.join(text.lower().split()))})"
+
+
+@functools.lru_cache(maxsize=None)
+def label_selectors(label):
+    """Selectors and compiled patterns for one label (built once per label)."""
+    has = lc_contains(label)
+    escaped = re.escape(label)
+    return LabelSelectors(
+        label=label,
+        lowered=label.lower(),
+        p_xpath=f"//p[{has}]",
+        container_p_xpath=f".//p[contains(@class,'justify-content-between') and {has}]",
+        container_any_xpath=f".//p[{has}]",
+        prefix_re=re.compile(rf"^\s*{escaped}\s*[:\-]*\s*", re.IGNORECASE),
+        inline_re=re.compile(rf"{escaped}\s*[:\-：]*\s*([^\r\n]+)$", re.IGNORECASE),
+        body_re=re.compile(rf"{escaped}\s*[\:\-]*\s*(?:\r?\n)?\s*([^\r\n]{{1,100}})", re.IGNORECASE),
+    )
+
+
+def index_labels(driver):
+    """Stamp the current view's <p>/<h2>/<td> elements for the lc_contains() XPaths. Cheap
+    to repeat: only elements whose text changed are touched. False if it failed."""
+    try:
+        driver.execute_script(INDEX_LABELS_JS, LC_ATTR)
+        return True
+    except Exception as e:
+        print(f"[WARN] Could not index page labels: {e}")
+        return False
+
+
+def wait_for_label(driver, xpath, timeout):
+    """Wait for an element matching an lc_contains() XPath, re-stamping the view on each
+    poll so elements rendered after the first index are found too."""
+    def find(d):
+        index_labels(d)
+        return d.find_elements(By.XPATH, xpath) or False
+    return WebDriverWait(driver, timeout).until(find)
+
+
+LABEL_PRESENCE_JS = """
+const labels = arguments[0];
+const text = (document.body.textContent || '').replace(/\\s+/g, ' ').toLowerCase();
+const found = {};
+for (const label of labels) { found[label] = text.includes(label.replace(/\\s+/g, ' ').trim().toLowerCase()); }
+return found;
+"""
+
+
+def label_presence(driver, labels):
+    """{label: bool} for whether each label occurs anywhere on the current view, from one
+    scan of the page text. Hidden text counts, so a label is only reported missing when
+    no element has it; if the scan fails every label is reported present."""
+    labels = list(labels)
+    try:
+        found = driver.execute_script(LABEL_PRESENCE_JS, labels) or {}
+    except Exception as e:
+        print(f"[WARN] Could not scan page labels: {e}")
+        found = {}
+    return {label: bool(found.get(label, True)) for label in labels}
+
+
+def present_targets(driver, targets):
+    """The {column: label variants} targets with at least one variant on the current view."""
+    presence = label_presence(driver, [label for labels in targets.values() for label in labels])
+    return {column: labels for column, labels in targets.items() if any(presence[l] for l in labels)}
+
+
+CONTAINER_LABELS = ('Name', 'Email', 'Email Id', 'Mobile')
+
+# Build the selectors for every registry label and partner-card label up front
+for _field in FIELD_REGISTRY:
+    for _label in _field.labels:
+        label_selectors(_label)
+for _label in CONTAINER_LABELS:
+    label_selectors(_label)
@@ -0,0 +1,323 @@
+# Snapshot-then-parse mode for Gujarat RERA project pages
+# Requirements: lxml, pandas
+# Usage: python gujrera_snapshot.py SNAPSHOT_DIR [--workers N] [--output ahmedabad_projects.csv]
+#
+# During the crawl the browser only navigates: driver.page_source is saved once each
+# for the summary, Project Profile and Promoters views. Everything below runs offline
+# on the saved HTML, so parsing can be re-run and spread across processes. The page
+# scripts have lxml counterparts here (html_payload for PAGE_SNAPSHOT_JS, html_tables
+# for READ_TABLES_JS, html_label_parts for LABEL_PARTS_JS) that return the same JSON,
+# so both modes resolve fields with the same specs and helpers.
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import html as lxml_html
+
+from gujrera_extract import (
+    summary_fields,
+    profile_fields,
+    promoter_fields,
+    LABEL_PARTS,
+    partner_card_xpaths,
+    partner_labels,
+    partner_columns,
+)
+from gujrera_tables import PROJECT_TABLE_SPECS, apply_project_tables
+
+SNAPSHOT_VIEWS = ('summary', 'profile', 'promoters')
+META_FILE = 'meta.json'
+
+# Elements that start a new line in rendered text (approximates HTMLElement.innerText)
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+    'tbody', 'thead', 'tfoot', 'tr', 'ul',
+}
+_CELL_TAGS = {'td', 'th'}
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+# ---------------------------------------------------------------------------
+# Capture (browser side)
+# ---------------------------------------------------------------------------
+
+def save_page_source(driver, project_dir, view):
+    """Write the current page HTML for one view of a project."""
+    os.makedirs(project_dir, exist_ok=True)
+    path = os.path.join(project_dir, f'{view}.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(driver.page_source)
+    return path
+
+
+def write_snapshot_meta(project_dir, meta):
+    os.makedirs(project_dir, exist_ok=True)
+    with open(os.path.join(project_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Offline parsing
+# ---------------------------------------------------------------------------
+
+def inner_text(el):
+    """Rendered-text approximation of an lxml element (line breaks at block elements,
+    tabs between table cells), close enough to WebElement.text for the label rules."""
+    if el is None:
+        return ''
+    parts = []
+
+    def walk(node):
+        tag = node.tag.lower() if isinstance(node.tag, str) else ''
+        if tag in _SKIP_TAGS:
+            return
+        if tag == 'br':
+            parts.append('\n')
+        elif tag in _BLOCK_TAGS:
+            parts.append('\n')
+        if node.text and tag:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if tag in _BLOCK_TAGS:
+            parts.append('\n')
+        elif tag in _CELL_TAGS:
+            parts.append('\t')
+
+    walk(el)
+    text = ''.join(parts).replace('\u00a0', ' ')
+    lines = [re.sub(r'[ \r\f\v]+', ' ', ln).strip(' \t') for ln in text.split('\n')]
+    return '\n'.join(ln for ln in lines if ln)
+
+
+def _first(nodes):
+    return nodes[0] if nodes else None
+
+
+def _closest(el, tag):
+    return _first(el.xpath(f'ancestor-or-self::{tag}[1]'))
+
+
+def html_payload(tree):
+    """Build the same payload PAGE_SNAPSHOT_JS returns, from a parsed HTML document."""
+    payload = {'tds': [], 'strongs': [], 'ps': [], 'body': inner_text(_first(tree.xpath('//body')))}
+    for td in tree.xpath('//td'):
+        t = inner_text(td)
+        if ':-' in t:
+            payload['tds'].append([t, td.get('class') or ''])
+    for st in tree.xpath('//strong'):
+        payload['strongs'].append([inner_text(st), inner_text(_closest(st, 'td')), inner_text(_closest(st, 'tr'))])
+    for p in tree.xpath('//p'):
+        strong = _first(p.xpath('.//strong'))
+        strong_link = _first(strong.xpath('.//a')) if strong is not None else None
+        link = _first(p.xpath('.//a'))
+        payload['ps'].append({
+            'text': inner_text(p),
+            'in_pd': bool(p.xpath("ancestor::ul[contains(concat(' ', normalize-space(@class), ' '), ' pd ')]")),
+            'strong': inner_text(strong),
+            'strong_link': (inner_text(strong_link) or (strong_link.get('href') or '').strip()) if strong_link is not None else '',
+            'next_strong': inner_text(_first(p.xpath('following-sibling::strong[1]'))),
+            'link': (inner_text(link) or (link.get('href') or '').strip()) if link is not None else '',
+            'span': inner_text(_first(p.xpath('.//span'))),
+            'own_strong': inner_text(_first(p.xpath('strong'))),
+            'own_span': inner_text(_first(p.xpath('span'))),
+        })
+    return payload
+
+
+def _norm(text):
+    return ' '.join((text or '').split()).lower()
+
+
+def _texts(nodes):
+    return [inner_text(n) for n in nodes]
+
+
+def _table_json(table):
+    return {
+        'head': _texts(table.xpath('.//thead//th')),
+        'rows': [
+            {'th': _texts(tr.xpath('.//th')), 'td': _texts(tr.xpath('.//td')), 'body': bool(tr.xpath('ancestor::tbody'))}
+            for tr in table.xpath('.//tr')
+        ],
+        'items': _texts(table.xpath('.//p')),
+    }
+
+
+def _row_json(tr):
+    return {
+        'td': _texts(tr.xpath('.//td')),
+        'strongs': [[inner_text(st), inner_text(_closest(st, 'td')), inner_text(tr)] for st in tr.xpath('.//strong')],
+    }
+
+
+def _find_table(tree, spec):
+    if spec.get('headers'):
+        want = [_norm(h) for h in spec['headers']]
+        for table in tree.xpath('//table'):
+            have = {_norm(t) for t in _texts(table.xpath('.//th'))}
+            if all(h in have for h in want):
+                return _table_json(table)
+        return None
+    want = _norm(spec['anchor'])
+    for st in tree.xpath('//strong'):
+        if want not in _norm(st.text_content()):
+            continue
+        if spec['where'] == 'row':
+            tr = _closest(st, 'tr')
+            if tr is not None:
+                return _row_json(tr)
+            continue
+        if spec['where'] == 'following':
+            cell = _closest(st, 'td')
+            if cell is None:
+                cell = _closest(st, 'tr')
+            table = _first(cell.xpath('following::table[1]')) if cell is not None else None
+        else:
+            table = _closest(st, 'table')
+        if table is not None:
+            return _table_json(table)
+    return None
+
+
+def html_tables(tree, specs):
+    """Build the same JSON READ_TABLES_JS returns for specs, from a parsed HTML document."""
+    return {spec['name']: _find_table(tree, spec) for spec in specs}
+
+
+def _lc_contains(text):
+    """Offline counterpart of gujrera_selectors.lc_contains (no data-gr-lc stamps here)."""
+    lowered = "translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return f"contains({lowered}, '{' '.join(text.lower().split())}')"
+
+
+def _after_br(p):
+    """First text after a <br> inside p (offline AFTER_BR_JS)."""
+    seen = False
+    for child in p:
+        is_element = isinstance(child.tag, str)
+        if is_element and child.tag.lower() == 'br':
+            seen = True
+        elif seen and is_element and inner_text(child):
+            return inner_text(child)
+        if seen and child.tail and child.tail.strip():
+            return child.tail.strip()
+    return ''
+
+
+def _label_part(p, xpath, href):
+    el = _first(p.xpath(xpath))
+    if el is None:
+        return None
+    return inner_text(el) or ((el.get('href') or '').strip() if href else '')
+
+
+def html_label_parts(container, labels):
+    """Build the same {label: [parts]} LABEL_PARTS_JS returns for a container element."""
+    out = {}
+    ps = container.xpath('.//p')
+    for label in labels:
+        want = _norm(label)
+        having = [p for p in ps if want in _norm(p.text_content())]
+        between = [p for p in having if 'justify-content-between' in (p.get('class') or '')]
+        out[label] = [
+            dict({'text': inner_text(p), 'after_br': _after_br(p)},
+                 **{name: _label_part(p, xpath, href) for name, xpath, href in LABEL_PARTS})
+            for p in (between or having)
+        ]
+    return out
+
+
+def partners_from_tree(tree):
+    """Partner 1..N cells ("Name, Mobile, Email") from the Promoters view."""
+    card_xpath, signatory_xpath = partner_card_xpaths(_lc_contains)
+    cards = [
+        html_label_parts(card, partner_labels())
+        for card in tree.xpath(card_xpath)
+        if not card.xpath(signatory_xpath)
+    ]
+    return partner_columns(cards)
+
+
+def _load_view(project_dir, view):
+    path = os.path.join(project_dir, f'{view}.html')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return lxml_html.fromstring(f.read())
+
+
+def parse_snapshot(project_dir):
+    """Rebuild a project's combined row from its saved views."""
+    row = {}
+    meta_path = os.path.join(project_dir, META_FILE)
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('Pincode'):
+            row['Pincode'] = meta['Pincode']
+
+    summary = _load_view(project_dir, 'summary')
+    if summary is not None:
+        row.update(summary_fields(html_payload(summary)))
+        apply_project_tables(row, html_tables(summary, PROJECT_TABLE_SPECS))
+
+    profile = _load_view(project_dir, 'profile')
+    if profile is not None:
+        row.update(profile_fields(html_payload(profile)))
+
+    promoters = _load_view(project_dir, 'promoters')
+    if promoters is not None:
+        row.update(promoter_fields(html_payload(promoters)))
+        row.update(partners_from_tree(promoters))
+    return row
+
+
+def list_snapshot_dirs(root):
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        os.path.join(root, d) for d in os.listdir(root)
+        if os.path.isdir(os.path.join(root, d))
+    )
+
+
+def parse_snapshots(root, workers=1):
+    """Parse every project directory under root, optionally across processes."""
+    dirs = list_snapshot_dirs(root)
+    if workers <= 1:
+        return [parse_snapshot(d) for d in dirs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_snapshot, dirs, chunksize=8))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse saved gujrera project snapshots into the projects CSV.')
+    parser.add_argument('snapshot_dir')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--output', default='ahmedabad_projects.csv')
+    args = parser.parse_args()
+
+    import pandas as pd
+    from scrape_gujrera_ahmedabad import append_unique_by_regno
+
+    rows = [r for r in parse_snapshots(args.snapshot_dir, args.workers) if r]
+    print(f'Parsed {len(rows)} project snapshots from {args.snapshot_dir}.')
+    if rows:
+        try:
+            append_unique_by_regno(pd.DataFrame(rows), args.output)
+        except Exception:
+            # Already reported by append_unique_by_regno; the snapshots can be parsed again
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
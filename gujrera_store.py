@@ -0,0 +1,287 @@
+# SQLite project store for the Gujarat RERA scrapers
+# Requirements: none (standard library sqlite3, SQLite >= 3.24 for upserts)
+# Usage: python gujrera_store.py ahmedabad_projects.db [ahmedabad_projects.csv]
+#
+# Rows are upserted one statement at a time into a table keyed by a unique index on
+# the normalised RERA Reg. No. (stripped, upper-cased), so the cost of saving a
+# project does not grow with the number already saved (the CSV path re-reads and
+# rewrites the whole file each time). As in append_unique_by_regno, an existing row
+# only gains values for fields that are still empty; non-empty values are never
+# overwritten. Columns are added with ALTER TABLE the first time a row carries them
+# and their discovery order is kept, so export_csv() can write DESIRED_COLUMNS first.
+#
+# The flattened repeated fields are also kept as child tables keyed by reg_key, rebuilt
+# from the stored row whenever an upsert touches their source columns:
+#   project_partners    Partner 1..N cells ("Name, Mobile, Email") -> one row each
+#   project_unit_types  '; '-joined Unit Type / Block -> one row per type; Total Units and
+#                       Available Units are typed per row when they split the same way
+#                       (the site usually gives project totals, which stay on projects)
+#   project_amenities   the comma-separated Amenities cell -> one row per amenity
+# e.g. SELECT p."Pincode", u.unit_type, COUNT(*) FROM project_unit_types u
+#      JOIN projects p USING (reg_key) GROUP BY 1, 2
+
+import csv
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+from gujrera_filelock import output_lock
+
+REG_COL = 'RERA Reg. No.'
+ALT_REG_COLS = ('RERA Reg Number', 'regno', 'Registration No.', 'Registration Number', 'RERA No')
+
+
+def normalise_reg_no(value):
+    return str(value).strip().upper()
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _is_empty(value):
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:  # NaN
+        return True
+    return str(value).strip() == ''
+
+
+PARTNER_COLUMN = re.compile(r'^Partner (\d+)$')
+CHILD_SOURCE_COLUMNS = ('Unit Type', 'Block', 'Total Units', 'Available Units', 'Amenities')
+SIGNATORY_MARK = '(Authorized Signatory)'
+NO_INVENTORY = 'no inventory data available'  # shown in Unit Type when the table is empty
+
+CHILD_TABLES = (
+    """CREATE TABLE IF NOT EXISTS project_partners (
+        reg_key TEXT NOT NULL, position INTEGER NOT NULL, name TEXT, mobile TEXT, email TEXT,
+        signatory INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (reg_key, position))""",
+    """CREATE TABLE IF NOT EXISTS project_unit_types (
+        reg_key TEXT NOT NULL, position INTEGER NOT NULL, unit_type TEXT, block TEXT,
+        total_units INTEGER, available_units INTEGER, PRIMARY KEY (reg_key, position))""",
+    'CREATE INDEX IF NOT EXISTS project_unit_types_type ON project_unit_types (unit_type)',
+    """CREATE TABLE IF NOT EXISTS project_amenities (
+        reg_key TEXT NOT NULL, amenity TEXT NOT NULL, PRIMARY KEY (reg_key, amenity))""",
+    'CREATE INDEX IF NOT EXISTS project_amenities_amenity ON project_amenities (amenity)',
+)
+
+
+def _is_child_source(name):
+    return name in CHILD_SOURCE_COLUMNS or PARTNER_COLUMN.match(name) is not None
+
+
+def partner_records(row):
+    """(position, name, mobile, email, signatory) for each non-empty Partner N cell."""
+    records = []
+    for col, value in row.items():
+        m = PARTNER_COLUMN.match(str(col))
+        if not m or _is_empty(value):
+            continue
+        name_parts, mobile, email = [], None, None
+        for part in (p.strip() for p in str(value).split(',')):
+            if '@' in part and email is None:
+                email = part
+            elif part.isdigit() and mobile is None:
+                mobile = part
+            elif part:
+                name_parts.append(part)
+        name = ', '.join(name_parts)
+        signatory = int(SIGNATORY_MARK.lower() in name.lower())
+        if signatory:
+            name = re.sub(re.escape(SIGNATORY_MARK), '', name, flags=re.I).strip()
+        records.append((int(m.group(1)), name or None, mobile, email, signatory))
+    return records
+
+
+def _split(value, sep):
+    return [] if _is_empty(value) else [v.strip() for v in str(value).split(sep)]
+
+
+def _count(value):
+    text = str(value).replace(',', '').strip()
+    return int(text) if text.isdigit() else None
+
+
+def unit_type_records(row):
+    """(position, unit_type, block, total_units, available_units) per Type Details row."""
+    types = _split(row.get('Unit Type'), ';')
+    if [t.lower() for t in types] == [NO_INVENTORY]:
+        types = []
+    blocks = _split(row.get('Block'), ';')
+    totals = _split(row.get('Total Units'), ';')
+    available = _split(row.get('Available Units'), ';')
+    n = max(len(types), len(blocks))
+    def at(values, i):
+        return values[i] if len(values) == n and values[i] else None
+    records = []
+    for i in range(n):
+        total, avail = at(totals, i), at(available, i)
+        records.append((i + 1, at(types, i), at(blocks, i),
+                        _count(total) if total else None, _count(avail) if avail else None))
+    return records
+
+
+def amenity_records(row):
+    return list(dict.fromkeys(a for a in _split(row.get('Amenities'), ',') if a))
+
+
+class ProjectStore:
+    """Embedded project table with fill-empty-only upserts by reg no."""
+
+    def __init__(self, path, disallowed_columns=()):
+        self.path = path
+        self.disallowed = set(disallowed_columns)
+        # Batches may be flushed from the write buffer's timer thread while the main
+        # thread reads counts or exports, so the connection is shared across threads and
+        # every use of it holds self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS projects (reg_key TEXT NOT NULL)')
+        self.conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS projects_reg_key ON projects (reg_key)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS project_columns (position INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)')
+        backfill = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_partners'").fetchone() is None
+        for statement in CHILD_TABLES:
+            self.conn.execute(statement)
+        self.conn.commit()
+        self._columns = [r[0] for r in self.conn.execute('SELECT name FROM project_columns ORDER BY position')]
+        self._column_set = set(self._columns)
+        if backfill and self.count():
+            self.rebuild_children()
+
+    def columns(self):
+        """Data columns in discovery order."""
+        return list(self._columns)
+
+    def _ensure_columns(self, names):
+        for name in names:
+            if name in self._column_set:
+                continue
+            self.conn.execute(f'ALTER TABLE projects ADD COLUMN {_quote(name)} TEXT')
+            self.conn.execute('INSERT INTO project_columns (name) VALUES (?)', (name,))
+            self._columns.append(name)
+            self._column_set.add(name)
+
+    def upsert_row(self, row, commit=True):
+        """Insert a row, or fill the empty fields of the stored row with the same reg no.
+        Returns 'inserted', 'updated' or None when the row has no reg no."""
+        with self.lock:
+            return self._upsert(row, commit)
+
+    def upsert_rows(self, rows):
+        """upsert_row for each row in one transaction; returns the number stored."""
+        with self.lock:
+            stored = sum(1 for row in rows if self._upsert(row, commit=False))
+            self.conn.commit()
+            return stored
+
+    def _upsert(self, row, commit):
+        row = {k: v for k, v in row.items() if k not in self.disallowed}
+        if _is_empty(row.get(REG_COL)):
+            for alt in ALT_REG_COLS:
+                if not _is_empty(row.get(alt)):
+                    row[REG_COL] = row[alt]
+                    break
+        if _is_empty(row.get(REG_COL)):
+            print(f"[WARN] Missing '{REG_COL}'; row not stored in {self.path}.")
+            return None
+        row[REG_COL] = normalise_reg_no(row[REG_COL])
+        names = [k for k in row if k != 'reg_key']
+        self._ensure_columns(names)
+        values = [None if _is_empty(row[k]) else str(row[k]) for k in names]
+        cols = ', '.join(_quote(n) for n in names)
+        marks = ', '.join('?' for _ in names)
+        fills = ', '.join(
+            f"{_quote(n)} = CASE WHEN projects.{_quote(n)} IS NULL OR TRIM(projects.{_quote(n)}) = '' "
+            f"THEN excluded.{_quote(n)} ELSE projects.{_quote(n)} END"
+            for n in names
+        )
+        existed = self.conn.execute('SELECT 1 FROM projects WHERE reg_key = ?', (row[REG_COL],)).fetchone()
+        self.conn.execute(
+            f'INSERT INTO projects (reg_key, {cols}) VALUES (?, {marks}) '
+            f'ON CONFLICT(reg_key) DO UPDATE SET {fills}',
+            [row[REG_COL]] + values,
+        )
+        if any(_is_child_source(n) for n in names):
+            self._write_children(row[REG_COL])
+        if commit:
+            self.conn.commit()
+        return 'updated' if existed else 'inserted'
+
+    def _stored_row(self, reg_key):
+        cursor = self.conn.execute('SELECT * FROM projects WHERE reg_key = ?', (reg_key,))
+        record = cursor.fetchone()
+        return dict(zip((d[0] for d in cursor.description), record)) if record else {}
+
+    def _write_children(self, reg_key, row=None):
+        """Replace the child rows of reg_key with those derived from its stored row."""
+        row = row if row is not None else self._stored_row(reg_key)
+        for table in ('project_partners', 'project_unit_types', 'project_amenities'):
+            self.conn.execute(f'DELETE FROM {table} WHERE reg_key = ?', (reg_key,))
+        self.conn.executemany('INSERT INTO project_partners VALUES (?, ?, ?, ?, ?, ?)',
+                              [(reg_key,) + r for r in partner_records(row)])
+        self.conn.executemany('INSERT INTO project_unit_types VALUES (?, ?, ?, ?, ?, ?)',
+                              [(reg_key,) + r for r in unit_type_records(row)])
+        self.conn.executemany('INSERT INTO project_amenities VALUES (?, ?)',
+                              [(reg_key, a) for a in amenity_records(row)])
+
+    def rebuild_children(self):
+        """Derive every project's child rows again (used once for stores created before
+        the child tables existed)."""
+        with self.lock:
+            cursor = self.conn.execute('SELECT * FROM projects')
+            names = [d[0] for d in cursor.description]
+            for record in cursor.fetchall():
+                row = dict(zip(names, record))
+                self._write_children(row['reg_key'], row)
+            self.conn.commit()
+        print(f'Rebuilt partner, unit-type and amenity rows for {self.count()} projects in {self.path}')
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM projects').fetchone()[0]
+
+    def export_csv(self, csv_path, columns=None):
+        """Write every stored project to csv_path (columns default to discovery order).
+        The file is written to a temporary name, fsync'd and then moved into place under
+        the output lock."""
+        columns = [c for c in (columns or self._columns) if c in self._column_set]
+        tmp_path = csv_path + '.tmp'
+        with self.lock, output_lock(csv_path):
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as fh:
+                writer = csv.writer(fh)
+                writer.writerow(columns)
+                select = ', '.join(_quote(c) for c in columns)
+                for record in self.conn.execute(f'SELECT {select} FROM projects ORDER BY rowid'):
+                    writer.writerow(['' if v is None else v for v in record])
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, csv_path)
+        print(f'Exported {self.count()} projects from {self.path} to {csv_path}')
+
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    if not argv:
+        print('Usage: python gujrera_store.py DB [CSV]')
+        return 1
+    db_path = argv[0]
+    csv_path = argv[1] if len(argv) > 1 else os.path.splitext(db_path)[0] + '.csv'
+    from scrape_gujrera_ahmedabad import DISALLOWED_COLUMNS, _order_columns
+    store = ProjectStore(db_path, DISALLOWED_COLUMNS)
+    store.export_csv(csv_path, _order_columns([], store.columns()))
+    store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
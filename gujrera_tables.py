@@ -0,0 +1,155 @@
+# Single-call table extraction for the Gujarat RERA scrapers
+# Requirements: selenium
+#
+# Reading a table cell by cell costs one WebDriver round-trip per find_elements and per
+# .text, thousands of calls for a project with a long Type Details table. read_tables()
+# locates every requested table (or row) inside the page and returns all of them as
+# JSON from a single execute_script. A spec finds its table either by anchor - a
+# <strong> whose text contains the label, then its enclosing table ('ancestor'), the
+# first table after its cell ('following') or its own row ('row') - or by header
+# signature (every header text present among the table's <th>). The helpers below turn
+# the JSON into the shapes the scrapers already store; gujrera_snapshot.html_tables()
+# builds the same JSON from saved HTML, so the offline parser shares them too.
+
+from gujrera_extract import summary_fields
+
+READ_TABLES_JS = """
+const specs = arguments[0];
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const norm = (t) => (t || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+const texts = (els) => Array.from(els, text);
+function anchors(label) {
+    const want = norm(label);
+    return Array.from(document.querySelectorAll('strong')).filter((st) => norm(st.textContent).includes(want));
+}
+function followingTable(st) {
+    const cell = st.closest('td') || st.closest('tr');
+    if (!cell) { return null; }
+    for (const t of document.querySelectorAll('table')) {
+        if (!cell.contains(t) && (cell.compareDocumentPosition(t) & Node.DOCUMENT_POSITION_FOLLOWING)) { return t; }
+    }
+    return null;
+}
+function bySignature(headers) {
+    const want = headers.map(norm);
+    for (const t of document.querySelectorAll('table')) {
+        const have = new Set(texts(t.querySelectorAll('th')).map(norm));
+        if (want.every((h) => have.has(h))) { return t; }
+    }
+    return null;
+}
+function table(t) {
+    return {
+        head: texts(t.querySelectorAll('thead th')),
+        rows: Array.from(t.querySelectorAll('tr'), (tr) => ({
+            th: texts(tr.querySelectorAll('th')),
+            td: texts(tr.querySelectorAll('td')),
+            body: !!tr.closest('tbody'),
+        })),
+        items: texts(t.querySelectorAll('p')),
+    };
+}
+function row(tr) {
+    return {
+        td: texts(tr.querySelectorAll('td')),
+        strongs: Array.from(tr.querySelectorAll('strong'), (st) => [text(st), text(st.closest('td')), text(tr)]),
+    };
+}
+const out = {};
+for (const spec of specs) {
+    out[spec.name] = null;
+    if (spec.headers) {
+        const t = bySignature(spec.headers);
+        out[spec.name] = t ? table(t) : null;
+        continue;
+    }
+    for (const st of anchors(spec.anchor)) {
+        if (spec.where === 'row') {
+            const tr = st.closest('tr');
+            if (tr) { out[spec.name] = row(tr); break; }
+            continue;
+        }
+        const t = spec.where === 'following' ? followingTable(st) : st.closest('table');
+        if (t) { out[spec.name] = table(t); break; }
+    }
+}
+return out;
+"""
+
+AMENITIES_SPEC = {'name': 'amenities', 'anchor': 'Common Amenities', 'where': 'following'}
+TYPE_DETAILS_SPEC = {'name': 'type_details', 'anchor': 'Type Details', 'where': 'ancestor'}
+ESTIMATED_COST_SPEC = {'name': 'estimated_cost', 'anchor': 'Project Estimated Cost', 'where': 'row'}
+
+# Everything the summary view reads through the specs above
+PROJECT_TABLE_SPECS = (AMENITIES_SPEC, TYPE_DETAILS_SPEC, ESTIMATED_COST_SPEC)
+
+
+def read_tables(driver, specs):
+    """{spec name: table/row JSON or None} for every spec, in one round-trip."""
+    try:
+        return driver.execute_script(READ_TABLES_JS, list(specs)) or {}
+    except Exception as e:
+        print(f"[WARN] Could not read tables: {e}")
+        return {}
+
+
+def unique_items(table):
+    """The table's non-empty <p> texts, first spelling of each (case-insensitive)."""
+    items = []
+    for item in (table or {}).get('items', ()):
+        if item and item.lower() not in [i.lower() for i in items]:
+            items.append(item)
+    return items
+
+
+def type_details_columns(table):
+    """Unit Type and Block columns of a Type Details table, '; '-joined."""
+    data = {}
+    if not table:
+        return data
+    headers = table['head']
+    idx_unit = next((i for i, h in enumerate(headers) if 'unit' in h.lower() and 'type' in h.lower()), None)
+    idx_block = next((i for i, h in enumerate(headers) if 'block' in h.lower()), None)
+    vals_unit, vals_block = [], []
+    for r in table['rows']:
+        if not r['body']:
+            continue
+        cells = r['td']
+        if idx_unit is not None and idx_unit < len(cells) and cells[idx_unit]:
+            vals_unit.append(cells[idx_unit])
+        if idx_block is not None and idx_block < len(cells) and cells[idx_block]:
+            vals_block.append(cells[idx_block])
+    if vals_unit:
+        data['Unit Type'] = '; '.join(vals_unit)
+    if vals_block:
+        data['Block'] = '; '.join(vals_block)
+    return data
+
+
+def table_records(table):
+    """Rows after the first as {header: cell} dicts keyed by the first row's <th>, for
+    rows with one cell per header and at least one non-empty cell."""
+    if not table or len(table['rows']) < 2:
+        return []
+    headers = table['rows'][0]['th']
+    records = []
+    for r in table['rows'][1:]:
+        if len(r['td']) == len(headers):
+            record = dict(zip(headers, r['td']))
+            if any(record.values()):
+                records.append(record)
+    return records
+
+
+def apply_project_tables(project_data, tables):
+    """Merge PROJECT_TABLE_SPECS JSON into a summary row: Amenities, Unit Type and Block,
+    and the financial cells the summary snapshot left empty from the cost row."""
+    amenities = unique_items(tables.get('amenities'))
+    if amenities:
+        project_data['Amenities'] = ', '.join(amenities)
+    project_data.update(type_details_columns(tables.get('type_details')))
+    if tables.get('estimated_cost'):
+        for key, value in summary_fields(tables['estimated_cost']).items():
+            if not project_data.get(key):
+                project_data[key] = value
+    return project_data
@@ -0,0 +1,239 @@
+# Condition-driven waits for the Gujarat RERA scrapers
+# Requirements: selenium
+#
+# Every wait returns as soon as its condition holds. Its timeout is the longest it may
+# take (typically the fixed time.sleep it replaces), so a wait is never slower than the
+# old sleep. Each call returns a WaitResult(ok, elapsed, value) and is added to
+# WAIT_STATS, which print_wait_summary() reports at the end of a run.
+
+import time
+from collections import namedtuple
+
+WaitResult = namedtuple('WaitResult', ['ok', 'elapsed', 'value'])
+
+# name -> [calls, timeouts, total seconds waited]
+WAIT_STATS = {}
+
+# Print one line per wait (very chatty; off by default)
+VERBOSE = False
+
+# Stay below the WebDriver script timeout (30 s by default) for async scripts
+_MAX_ASYNC_MS = 25000
+
+DOM_QUIESCENT_JS = """
+const quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const start = performance.now();
+let last = start;
+const obs = new MutationObserver(() => { last = performance.now(); });
+obs.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+(function check() {
+    const now = performance.now();
+    if (now - last >= quietMs) { obs.disconnect(); done(true); }
+    else if (now - start >= timeoutMs) { obs.disconnect(); done(false); }
+    else { setTimeout(check, Math.min(50, quietMs)); }
+})();
+"""
+
+ANGULAR_STABLE_JS = """
+const timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+let finished = false;
+const finish = (v) => { if (!finished) { finished = true; done(v); } };
+setTimeout(() => finish(false), timeoutMs);
+try {
+    if (window.getAllAngularTestabilities) {
+        const all = window.getAllAngularTestabilities();
+        let pending = all.length;
+        if (!pending) { finish(true); }
+        all.forEach((t) => t.whenStable(() => { if (--pending === 0) { finish(true); } }));
+    } else if (window.angular && window.angular.element) {
+        const injector = window.angular.element(document.body).injector();
+        injector.get('$browser').notifyWhenNoOutstandingRequests(() => finish(true));
+    } else {
+        finish(null);
+    }
+} catch (e) {
+    finish(null);
+}
+"""
+
+# Settle detection for the numeric values under ul.pd: values are re-read whenever the
+# DOM changes, and the wait ends once every target has held the same value for
+# stableMs. A target that is still missing (or reads 0, which the page shows before
+# its data arrives) is only accepted once the list has rendered and no value has
+# changed for idleMs.
+LI_VALUES_SETTLED_JS = """
+const targets = arguments[0], stableMs = arguments[1], idleMs = arguments[2], timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const norm = (t) => (t || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+const esc = (t) => t.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+const digits = (t) => { const m = (t || '').match(/\\d+/); return m ? m[0] : ''; };
+function readLabel(label) {
+    const lowered = norm(label);
+    for (const p of document.querySelectorAll('ul.pd > li > p')) {
+        const text = p.innerText || p.textContent || '';
+        if (!norm(text).includes(lowered)) { continue; }
+        const strong = p.querySelector('strong');
+        let v = strong ? digits(strong.innerText || strong.textContent) : '';
+        if (v) { return v; }
+        const sib = p.nextElementSibling;
+        v = sib ? digits(sib.innerText || sib.textContent) : '';
+        if (v) { return v; }
+        const lines = text.split(/[\\r\\n]+/).map((l) => l.trim()).filter(Boolean);
+        for (let i = 0; i + 1 < lines.length; i++) {
+            if (norm(lines[i]).includes(lowered)) { v = digits(lines[i + 1]); if (v) { return v; } }
+        }
+        const m = text.match(new RegExp(esc(label) + '\\\\s*[:\\\\-]*\\\\s*(\\\\d+)', 'i'));
+        if (m) { return m[1]; }
+    }
+    return '';
+}
+const keys = Object.keys(targets);
+const values = {}, changedAt = {};
+const start = performance.now();
+let lastChange = start, dirty = true, present = false;
+const obs = new MutationObserver(() => { dirty = true; });
+obs.observe(document.body, {childList: true, subtree: true, characterData: true});
+(function check() {
+    const now = performance.now();
+    if (dirty) {
+        dirty = false;
+        present = document.querySelectorAll('ul.pd > li > p').length > 0;
+        for (const key of keys) {
+            let v = '';
+            for (const label of targets[key]) { v = readLabel(label); if (v) { break; } }
+            if (!(key in values) || values[key] !== v) { values[key] = v; changedAt[key] = now; lastChange = now; }
+        }
+    }
+    const settled = keys.every((k) => now - changedAt[k] >= stableMs && values[k] && values[k] !== '0');
+    if (settled || (present && now - lastChange >= idleMs)) { obs.disconnect(); done({settled: settled, values: values}); }
+    else if (now - start >= timeoutMs) { obs.disconnect(); done({settled: false, values: values}); }
+    else { setTimeout(check, 50); }
+})();
+"""
+
+
+def _record(name, ok, elapsed, value=None):
+    stats = WAIT_STATS.setdefault(name, [0, 0, 0.0])
+    stats[0] += 1
+    if not ok:
+        stats[1] += 1
+    stats[2] += elapsed
+    if VERBOSE:
+        print(f"[WAIT] {name}: {'ok' if ok else 'timeout'} after {elapsed:.2f}s")
+    return WaitResult(ok, elapsed, value)
+
+
+def wait_for(condition, timeout, poll=0.1, name='condition'):
+    """Poll condition() until it returns a truthy value or timeout seconds pass."""
+    start = time.monotonic()
+    value = None
+    while True:
+        try:
+            value = condition()
+        except Exception:
+            value = None
+        if value:
+            return _record(name, True, time.monotonic() - start, value)
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            return _record(name, False, time.monotonic() - start, value)
+        time.sleep(min(poll, remaining))
+
+
+def wait_for_dom_quiescent(driver, timeout, quiet_ms=150, name='dom quiescent'):
+    """Return once the document has had no DOM mutations for quiet_ms."""
+    start = time.monotonic()
+    timeout_ms = int(min(timeout * 1000, _MAX_ASYNC_MS))
+    quiet_ms = min(quiet_ms, timeout_ms)
+    try:
+        ok = bool(driver.execute_async_script(DOM_QUIESCENT_JS, quiet_ms, timeout_ms))
+    except Exception:
+        ok = False
+    return _record(name, ok, time.monotonic() - start)
+
+
+def wait_for_angular_stable(driver, timeout, name='angular stable'):
+    """Return once Angular reports no pending macrotasks/HTTP requests.
+
+    value is None when the page exposes no Angular testability API."""
+    start = time.monotonic()
+    timeout_ms = int(min(timeout * 1000, _MAX_ASYNC_MS))
+    try:
+        result = driver.execute_async_script(ANGULAR_STABLE_JS, timeout_ms)
+    except Exception:
+        result = False
+    return _record(name, result is not False, time.monotonic() - start, result)
+
+
+def settle(driver, timeout, name='settle'):
+    """Wait for the UI to settle after an interaction: Angular stable (when available),
+    then a short DOM-quiet window, within timeout seconds in total."""
+    start = time.monotonic()
+    angular = wait_for_angular_stable(driver, timeout, name=f'{name} (angular)')
+    remaining = timeout - (time.monotonic() - start)
+    ok = angular.ok
+    if remaining > 0:
+        ok = wait_for_dom_quiescent(driver, remaining, name=f'{name} (dom)').ok and ok
+    return _record(name, ok, time.monotonic() - start)
+
+
+def wait_for_li_values(driver, targets, timeout, stable_ms=600, idle_ms=1500, name='ul.pd values settled'):
+    """Wait in the page for the numbers under ul.pd to settle and read them together.
+
+    targets maps a column to its label variants (the first variant with a number wins).
+    value is {column: number text, '' when not found}; ok is False when some value
+    was still missing or zero when the wait ended."""
+    start = time.monotonic()
+    timeout_ms = int(min(timeout * 1000, _MAX_ASYNC_MS))
+    targets = {column: list(labels) for column, labels in targets.items()}
+    try:
+        result = driver.execute_async_script(LI_VALUES_SETTLED_JS, targets, stable_ms, idle_ms, timeout_ms) or {}
+    except Exception:
+        result = {}
+    values = {column: str(result.get('values', {}).get(column) or '') for column in targets}
+    return _record(name, bool(result.get('settled')), time.monotonic() - start, values)
+
+
+def wait_for_element_count_above(driver, by, selector, count, timeout, name='element count above'):
+    """Return as soon as more than count elements match (e.g. after triggering lazy loading)."""
+    result = wait_for(lambda: len(driver.find_elements(by, selector)) > count, timeout, poll=0.2, name=name)
+    return result._replace(value=len(driver.find_elements(by, selector)))
+
+
+def wait_for_element_count_stable(driver, by, selector, timeout, stable_for=0.5, name='element count stable'):
+    """Return once the number of matching elements has not changed for stable_for seconds."""
+    start = time.monotonic()
+    last_count = len(driver.find_elements(by, selector))
+    last_change = start
+    while True:
+        now = time.monotonic()
+        if now - last_change >= stable_for:
+            return _record(name, True, now - start, last_count)
+        if now - start >= timeout:
+            return _record(name, False, now - start, last_count)
+        time.sleep(min(0.1, stable_for))
+        count = len(driver.find_elements(by, selector))
+        if count != last_count:
+            last_count = count
+            last_change = time.monotonic()
+
+
+def wait_for_text_non_empty(element, timeout, poll=0.1, name='text non-empty'):
+    """Return the element's stripped text as soon as it is non-empty."""
+    return wait_for(lambda: (element.text or '').strip(), timeout, poll=poll, name=name)
+
+
+def wait_for_presence(driver, by, selector, timeout, name='element present'):
+    """Return the first matching element as soon as one exists."""
+    def first():
+        found = driver.find_elements(by, selector)
+        return found[0] if found else None
+    return wait_for(first, timeout, poll=0.1, name=name)
+
+
+def print_wait_summary():
+    if not WAIT_STATS:
+        return
+    print('[WAIT] Summary (calls, timeouts, seconds waited):')
+    for name, (calls, timeouts, total) in sorted(WAIT_STATS.items(), key=lambda kv: -kv[1][2]):
+        print(f'[WAIT]   {name}: {calls} calls, {timeouts} timeouts, {total:.1f}s')
@@ -0,0 +1,185 @@
+# Write-behind buffer for scraped rows
+# Requirements: none (standard library)
+#
+# Rows are collected in memory and handed to a flush function in batches: every
+# max_rows rows, every max_seconds seconds (checked on add and by a background timer),
+# on close(), at interpreter exit and on SIGTERM. Each row is also appended (and
+# fsync'd) to a small JSON-lines spill file before add() returns, and the spill is
+# truncated only after a successful flush, so a crash between flushes loses nothing:
+# the next run flushes whatever the spill still holds before taking new rows.
+# add() stamps each row with the time it was produced under SCRAPED_AT, which the
+# spill keeps, so a recovered row still carries its original scrape time.
+#
+# Several crawler processes can write to the same output, so each buffer spills to its
+# own <spill_base>.<pid>.jsonl and holds an exclusive lock on it while it runs. On
+# start-up a buffer also flushes the spills of processes that died (those whose lock
+# it can take); spills still locked belong to live processes and are left alone.
+
+import atexit
+import glob
+import json
+import os
+import re
+import signal
+import threading
+import time
+
+from gujrera_filelock import try_lock, unlock
+
+# Row key holding the epoch time a row was scraped; flush functions strip it before writing
+SCRAPED_AT = '_scraped_at'
+
+_SPILL_SUFFIX = re.compile(r'(\.\d+)?\.jsonl')
+
+
+class RowWriteBuffer:
+    """Batch rows for flush_fn(list_of_rows), with a crash-safe per-process spill file."""
+
+    def __init__(self, flush_fn, spill_base, max_rows=25, max_seconds=30.0):
+        self.flush_fn = flush_fn
+        self.spill_base = spill_base
+        self.spill_path = f'{spill_base}.{os.getpid()}.jsonl'
+        self._spill = open(self.spill_path, 'a+', encoding='utf-8')
+        if not try_lock(self._spill):
+            print(f"[WARN] {self.spill_path} is locked by another process; its rows may be written twice.")
+        self.max_rows = max(1, max_rows)
+        self.max_seconds = max_seconds
+        self.rows = []
+        self.flushed = 0
+        self._lock = threading.RLock()
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._recover()
+        self._stop = threading.Event()
+        self._timer = None
+        if max_seconds and max_seconds > 0:
+            self._timer = threading.Thread(target=self._tick, name='row-write-buffer', daemon=True)
+            self._timer.start()
+        atexit.register(self.close)
+        _install_sigterm_handler()
+
+    def _recover(self):
+        # Our own file only has rows if a dead process had the same pid
+        self._spill.seek(0)
+        text = self._spill.read()
+        if text and not text.endswith('\n'):
+            self._spill.write('\n')
+        pending = _spill_rows(text)
+        if pending:
+            print(f"[INFO] Recovering {len(pending)} unflushed rows from {self.spill_path}...")
+            self.rows = pending
+            self.flush()
+        # Includes <spill_base>.jsonl from runs before spills were per process
+        for path in sorted(glob.glob(glob.escape(self.spill_base) + '*.jsonl')):
+            if path != self.spill_path and _SPILL_SUFFIX.fullmatch(path[len(self.spill_base):]):
+                self._recover_orphan(path)
+
+    def _recover_orphan(self, path):
+        """Flush the spill of a process that is no longer running, then delete it."""
+        try:
+            fh = open(path, 'r+', encoding='utf-8')
+        except OSError:
+            return
+        try:
+            if not try_lock(fh):
+                return  # a live process owns it
+            pending = _spill_rows(fh.read())
+            if pending:
+                print(f"[INFO] Recovering {len(pending)} unflushed rows from {path}...")
+                try:
+                    self.flush_fn(pending)
+                except Exception as e:
+                    print(f"[ERROR] Flushing {len(pending)} rows from {path} failed; keeping it: {e}")
+                    unlock(fh)
+                    return
+                self.flushed += len(pending)
+            # Emptied under the lock, so nobody else can flush these rows again
+            fh.seek(0)
+            fh.truncate()
+            unlock(fh)
+        finally:
+            fh.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _tick(self):
+        while not self._stop.wait(1.0):
+            if self.rows and time.monotonic() - self._last_flush >= self.max_seconds:
+                self.flush()
+
+    def add(self, row):
+        if SCRAPED_AT not in row:
+            row = dict(row, **{SCRAPED_AT: time.time()})
+        with self._lock:
+            self._spill.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+            self._spill.flush()
+            os.fsync(self._spill.fileno())
+            self.rows.append(row)
+            if len(self.rows) >= self.max_rows or time.monotonic() - self._last_flush >= self.max_seconds:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self.rows:
+                return
+            batch = self.rows
+            try:
+                self.flush_fn(batch)
+            except Exception as e:
+                # Keep the rows (and the spill) for the next attempt
+                print(f"[ERROR] Flushing {len(batch)} buffered rows failed: {e}")
+                return
+            self.rows = []
+            self.flushed += len(batch)
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._spill.flush()
+            os.fsync(self._spill.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._stop.set()
+            self.flush()
+            atexit.unregister(self.close)
+            unlock(self._spill)
+            self._spill.close()
+            if not self.rows:
+                os.remove(self.spill_path)
+
+
+def _spill_rows(text):
+    rows = []
+    for line in text.splitlines():
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            # Row torn by the crash; its project was not journaled either
+            continue
+    return rows
+
+
+_SIGTERM_INSTALLED = False
+
+
+def _install_sigterm_handler():
+    """Turn SIGTERM into SystemExit so finally blocks and atexit flushes run (Ctrl+C
+    already raises KeyboardInterrupt). Only possible from the main thread."""
+    global _SIGTERM_INSTALLED
+    if _SIGTERM_INSTALLED or threading.current_thread() is not threading.main_thread():
+        return
+    def handle(signum, frame):
+        raise SystemExit(128 + signum)
+    for name in ('SIGTERM', 'SIGBREAK'):
+        sig = getattr(signal, name, None)
+        if sig is not None:
+            try:
+                signal.signal(sig, handle)
+            except (ValueError, OSError):
+                pass
+    _SIGTERM_INSTALLED = True
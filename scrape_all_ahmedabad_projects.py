@@ -1,6 +1,9 @@
 # Multi-Project Real Estate Scraper for Gujarat RERA (All Ahmedabad Projects)
 # Requirements: selenium, pandas, openpyxl
-# Usage: python scrape_all_ahmedabad_projects.py
+# Usage: python scrape_all_ahmedabad_projects.py [--fresh]
+#   Finished projects are journaled to ahmedabad_all_projects_journal.jsonl; a restarted
+#   run resumes from it (moved to .done once every card is finished). --fresh ignores
+#   the journal and starts from card 1.
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,21 +13,28 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
-import time
 import traceback
 import re
+import sys
 
-# Setup Selenium
-options = webdriver.ChromeOptions()
-options.add_argument('--start-maximized')
-# Keep headless mode OFF for debugging
-# options.add_argument('--headless')
-options.add_argument('--disable-gpu')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-dev-shm-usage')
-options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.7204.183 Safari/537.36')
+from gujrera_navigation import harvest_detail_routes, route_at, card_text_at, open_detail_route
+from gujrera_browser import profile_name, build_chrome_options, apply_cdp_settings
+from gujrera_checkpoint import CheckpointJournal
+from gujrera_selectors import lc_contains, index_labels
+from gujrera_tables import AMENITIES_SPEC, read_tables, unique_items, table_records
+from gujrera_waits import settle, wait_for_presence, wait_for_element_count_above, wait_for_element_count_stable, print_wait_summary
+
+JOURNAL_PATH = 'ahmedabad_all_projects_journal.jsonl'
+JOURNAL_SHARD = 'ahmedabad'
+TYPE_DETAILS_SIGNATURE_SPEC = {'name': 'type_details', 'headers': ['Unit Type', 'Block', 'Total Units']}
+
+# Setup Selenium (headed by default; set GUJRERA_BROWSER_PROFILE=production to crawl headless)
+browser_profile = profile_name()
+print(f'Starting Chrome with the {browser_profile} profile...')
+options = build_chrome_options(browser_profile)
 service = Service('H:\\DataAnalytics_project\\real_estate_analysis\\chromedriver-win64\\chromedriver.exe')
 driver = webdriver.Chrome(service=service, options=options)
+apply_cdp_settings(driver, browser_profile)
 
 # Set longer page load timeout
 print('Setting page load timeout to 180 seconds...')
@@ -33,6 +43,21 @@ driver.set_page_load_timeout(180)
 wait = WebDriverWait(driver, 20)
 actions = ActionChains(driver)
 
+
+def card_data_from_text(card_text):
+    """Card counters from a listing card's text (used when the card is not clicked)."""
+    card_data = {'Total Units': '', 'Available Units': '', 'Total No. of Towers/Blocks': ''}
+    available_match = re.search(r'available units[^\d]*?(\d+)', card_text, re.IGNORECASE)
+    if available_match:
+        card_data['Available Units'] = available_match.group(1)
+    towers_match = re.search(r'(?:total no\. of towers/blocks|towers?|blocks?)[^\d]*?(\d+)', card_text, re.IGNORECASE)
+    if towers_match:
+        card_data['Total No. of Towers/Blocks'] = towers_match.group(1)
+    total_match = re.search(r'total units[^\d]*?(\d+)', card_text, re.IGNORECASE)
+    if total_match:
+        card_data['Total Units'] = total_match.group(1)
+    return card_data
+
 print('Starting multi-project scraper for all Ahmedabad projects...')
 
 # Try loading the base URL first, then /#/home
@@ -53,7 +78,7 @@ try:
     search_bar.clear()
     search_bar.send_keys('district')
     search_bar.send_keys(u'\ue007')  # Press Enter key
-    time.sleep(3)
+    settle(driver, 3, name='search results')
     print('Waiting for filter panel link (id=clickForFilter) to appear...')
     filter_panel_link = wait.until(EC.element_to_be_clickable((By.ID, 'clickForFilter')))
     filter_panel_link.click()
@@ -65,32 +90,36 @@ try:
     # Click the dropdown to expand
     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", district_dropdown)
     actions.move_to_element(district_dropdown).click().perform()
-    time.sleep(1)
+    settle(driver, 1, name='district dropdown')
     # Use Selenium's Select class for standard <select>
     from selenium.webdriver.support.ui import Select
     print('Selecting Ahmedabad in district dropdown using Select class...')
     select = Select(district_dropdown)
     select.select_by_visible_text('Ahmedabad')
     print('Ahmedabad selected.')
-    time.sleep(1)
+    settle(driver, 1, name='district selected')
     print('Ahmedabad selected. Scrolling to Apply button (as <a> tag)...')
     apply_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.fBtn.applyButtonCl')))
     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", apply_btn)
-    time.sleep(0.5)
+    settle(driver, 0.5, name='scroll into view')
     print('Clicking Apply <a> button...')
     apply_btn.click()
     print('Clicked Apply. Waiting for project cards/results to load...')
-    time.sleep(8)
+    cards = wait_for_presence(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', 8, name='results after Apply')
+    settle(driver, max(0.5, 8 - cards.elapsed), name='results after Apply')
     print('Project results should now be visible.')
 
     # Scroll down slightly to bring cards into view
     driver.execute_script('window.scrollBy(0, 250);')
-    time.sleep(1)
+    settle(driver, 1, name='scroll')
 
-    # Initialize list to store all projects data and track processed projects
-    all_projects_data = []
-    processed_projects = set()  # Track processed projects to avoid duplicates
-    project_count = 0
+    # Initialize list to store all projects data and track processed projects; a
+    # restarted run picks up the rows and finished cards recorded in the journal
+    journal = CheckpointJournal(JOURNAL_PATH, fresh='--fresh' in sys.argv)
+    all_projects_data = list(journal.rows.get(JOURNAL_SHARD, []))
+    processed_projects = set(f"{row.get('Project Name', '')}|{row.get('RERA Reg. No.', '')}"
+                             for row in all_projects_data)  # Track processed projects to avoid duplicates
+    project_count = len(all_projects_data)
 
     # Ensure all projects are loaded by scrolling to bottom and checking for pagination
     print('Loading all projects by scrolling and checking pagination...')
@@ -103,12 +132,13 @@ try:
     while scroll_attempts < max_scroll_attempts:
         # Scroll down to load more projects
         driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
-        time.sleep(5)  # Increased from 3 to 5 seconds
+        if wait_for_element_count_above(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', last_project_count, 5, name='lazy load').ok:  # up to 5 seconds
+            wait_for_element_count_stable(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', 2, stable_for=0.3, name='lazy load batch')
         
         # Also try scrolling in smaller increments to trigger lazy loading
         for i in range(3):
             driver.execute_script(f'window.scrollBy(0, {500 * (i + 1)});')
-            time.sleep(2)
+            settle(driver, 2, name='lazy load step')
         
         # Check current number of projects
         view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
@@ -139,10 +169,10 @@ try:
                     try:
                         if btn.is_displayed() and btn.is_enabled():
                             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                            time.sleep(2)
+                            settle(driver, 2, name='scroll into view')
                             btn.click()
                             print(f'Clicked pagination button: {btn.text}')
-                            time.sleep(5)  # Wait longer after clicking pagination
+                            settle(driver, 5, name='pagination')  # Wait longer after clicking pagination
                             button_clicked = True
                             break
                     except Exception as btn_e:
@@ -193,20 +223,35 @@ try:
     total_projects = len(view_more_buttons)
     print(f'Final count using selector "{best_selector}": Found {total_projects} projects to process')
     
+    # Read every card's detail route once; projects are then opened directly instead of
+    # returning to Project Profile and re-applying the Ahmedabad filter each time
+    harvested = harvest_detail_routes(driver, best_selector or 'a.vmore.mb-2')
+    detail_routes = harvested
+    if not (detail_routes and all(c['route'] for c in detail_routes)):
+        print('Not every card exposes a detail route; rebuilding the listing between projects.')
+        detail_routes = None
+
     # Scroll back to top
     driver.execute_script('window.scrollTo(0, 0);')
-    time.sleep(2)
+    settle(driver, 2, name='scroll')
 
     # Process each project
     for project_index in range(total_projects):
+        # Skipped only while the card is still the project that was journaled
+        if journal.is_done(JOURNAL_SHARD, project_index, route_at(harvested, project_index),
+                           card_text_at(harvested, driver, project_index)):
+            print(f'Project {project_index + 1} already finished in a previous run; skipping.')
+            continue
         try:
             print(f'\n=== Processing Project {project_index + 1} of {total_projects} ===')
             
+            route = route_at(detail_routes, project_index)
+
             # Navigate back to project listing if not first project
-            if project_index > 0:
+            if project_index > 0 and not route:
                 print('Navigating back to project listing...')
                 driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
+                settle(driver, 2, name='scroll')
                 
                 # Look for "Project Profile" link in header
                 project_profile_selectors = [
@@ -223,7 +268,7 @@ try:
                         for element in elements:
                             if element.is_displayed() and element.is_enabled():
                                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                                time.sleep(1)
+                                settle(driver, 1, name='scroll into view')
                                 element.click()
                                 print('Clicked on Project Profile link')
                                 project_profile_clicked = True
@@ -234,7 +279,7 @@ try:
                         continue
                 
                 if project_profile_clicked:
-                    time.sleep(3)
+                    settle(driver, 3, name='project profile')
                     print('Successfully navigated back to project listing')
                     
                     # Reapply Ahmedabad filter using same method as initial setup
@@ -245,12 +290,12 @@ try:
                         search_bar.clear()
                         search_bar.send_keys('district')
                         search_bar.send_keys(u'\ue007')  # Press Enter key
-                        time.sleep(3)
+                        settle(driver, 3, name='search results')
                         
                         # Click filter panel
                         filter_panel_link = wait.until(EC.element_to_be_clickable((By.ID, 'clickForFilter')))
                         filter_panel_link.click()
-                        time.sleep(2)
+                        settle(driver, 2, name='filter panel')
                         
                         # Select Ahmedabad district
                         district_dropdown = WebDriverWait(driver, 30).until(
@@ -258,101 +303,106 @@ try:
                         )
                         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", district_dropdown)
                         actions.move_to_element(district_dropdown).click().perform()
-                        time.sleep(1)
+                        settle(driver, 1, name='district dropdown')
                         select = Select(district_dropdown)
                         select.select_by_visible_text('Ahmedabad')
-                        time.sleep(1)
+                        settle(driver, 1, name='district selected')
                         
                         # Click Apply button
                         apply_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.fBtn.applyButtonCl')))
                         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", apply_btn)
-                        time.sleep(0.5)
+                        settle(driver, 0.5, name='scroll into view')
                         apply_btn.click()
                         print('Applied filter. Waiting for results...')
-                        time.sleep(8)  # Increased timeout for filter results
+                        cards = wait_for_presence(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', 8, name='results after Apply')
+                        settle(driver, max(0.5, 8 - cards.elapsed), name='results after Apply')
                     except Exception as filter_e:
                         print(f'Error reapplying filter: {filter_e}')
                         # Try to continue anyway
-                        time.sleep(3)
+                        settle(driver, 3, name='filter results')
                 else:
                     print('Could not navigate back to project listing')
                     continue
             
             # Find and extract data from project card before clicking View More
             try:
-                driver.execute_script('window.scrollBy(0, 250);')
-                time.sleep(2)
+                if route:
+                    card_data = card_data_from_text(detail_routes[project_index]['card_text'])
+                    open_detail_route(driver, route)
+                else:
+                    driver.execute_script('window.scrollBy(0, 250);')
+                    settle(driver, 2, name='scroll')
                 
-                # Re-find all View More buttons and their parent project cards
-                view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
+                    # Re-find all View More buttons and their parent project cards
+                    view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
                 
-                if project_index >= len(view_more_buttons):
-                    print(f'Project {project_index + 1} not found. Stopping.')
-                    break
+                    if project_index >= len(view_more_buttons):
+                        print(f'Project {project_index + 1} not found. Stopping.')
+                        break
                     
-                view_more_btn = view_more_buttons[project_index]
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", view_more_btn)
+                    view_more_btn = view_more_buttons[project_index]
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", view_more_btn)
                 
-                # Extract data from project card before clicking using the correct HTML structure
-                card_data = {'Total Units': '', 'Available Units': '', 'Total No. of Towers/Blocks': ''}
-                try:
-                    # Find the parent project card
-                    project_card = view_more_btn.find_element(By.XPATH, "./ancestor::div[contains(@class, 'card') or contains(@class, 'project')]")
-                    
-                    # Extract Available Units from <strong> tag following "Available Units" text
+                    # Extract data from project card before clicking using the correct HTML structure
+                    card_data = {'Total Units': '', 'Available Units': '', 'Total No. of Towers/Blocks': ''}
                     try:
-                        available_units_elements = project_card.find_elements(By.XPATH, ".//li[contains(., 'Available Units')]//strong")
-                        if available_units_elements:
-                            card_data['Available Units'] = available_units_elements[0].text.strip()
-                            print(f"[DEBUG] Found Available Units in card: {card_data['Available Units']}")
-                        else:
-                            # Fallback: look for pattern in text
-                            card_text = project_card.text
-                            available_match = re.search(r'available units[^\d]*?(\d+)', card_text, re.IGNORECASE)
-                            if available_match:
-                                card_data['Available Units'] = available_match.group(1)
-                                print(f"[DEBUG] Found Available Units via regex: {card_data['Available Units']}")
-                    except Exception as e:
-                        print(f"[DEBUG] Error extracting Available Units from card: {e}")
+                        # Find the parent project card
+                        project_card = view_more_btn.find_element(By.XPATH, "./ancestor::div[contains(@class, 'card') or contains(@class, 'project')]")
                     
-                    # Extract Total No. of Towers/Blocks from <strong> tag
-                    try:
-                        towers_elements = project_card.find_elements(By.XPATH, ".//li[contains(., 'Total No. of Towers/Blocks')]//strong")
-                        if towers_elements:
-                            card_data['Total No. of Towers/Blocks'] = towers_elements[0].text.strip()
-                            print(f"[DEBUG] Found Towers/Blocks in card: {card_data['Total No. of Towers/Blocks']}")
-                        else:
-                            # Fallback: look for pattern in text
-                            card_text = project_card.text
-                            towers_match = re.search(r'(?:total no\. of towers/blocks|towers?|blocks?)[^\d]*?(\d+)', card_text, re.IGNORECASE)
-                            if towers_match:
-                                card_data['Total No. of Towers/Blocks'] = towers_match.group(1)
-                                print(f"[DEBUG] Found Towers/Blocks via regex: {card_data['Total No. of Towers/Blocks']}")
-                    except Exception as e:
-                        print(f"[DEBUG] Error extracting Towers/Blocks from card: {e}")
+                        # Extract Available Units from <strong> tag following "Available Units" text
+                        try:
+                            available_units_elements = project_card.find_elements(By.XPATH, ".//li[contains(., 'Available Units')]//strong")
+                            if available_units_elements:
+                                card_data['Available Units'] = available_units_elements[0].text.strip()
+                                print(f"[DEBUG] Found Available Units in card: {card_data['Available Units']}")
+                            else:
+                                # Fallback: look for pattern in text
+                                card_text = project_card.text
+                                available_match = re.search(r'available units[^\d]*?(\d+)', card_text, re.IGNORECASE)
+                                if available_match:
+                                    card_data['Available Units'] = available_match.group(1)
+                                    print(f"[DEBUG] Found Available Units via regex: {card_data['Available Units']}")
+                        except Exception as e:
+                            print(f"[DEBUG] Error extracting Available Units from card: {e}")
                     
-                    # Extract Total Units from <strong> tag
-                    try:
-                        total_units_elements = project_card.find_elements(By.XPATH, ".//li[contains(., 'Total Units')]//strong")
-                        if total_units_elements:
-                            card_data['Total Units'] = total_units_elements[0].text.strip()
-                            print(f"[DEBUG] Found Total Units in card: {card_data['Total Units']}")
-                        else:
-                            # Fallback: look for pattern in text
-                            card_text = project_card.text
-                            total_match = re.search(r'total units[^\d]*?(\d+)', card_text, re.IGNORECASE)
-                            if total_match:
-                                card_data['Total Units'] = total_match.group(1)
-                                print(f"[DEBUG] Found Total Units via regex: {card_data['Total Units']}")
-                    except Exception as e:
-                        print(f"[DEBUG] Error extracting Total Units from card: {e}")
+                        # Extract Total No. of Towers/Blocks from <strong> tag
+                        try:
+                            towers_elements = project_card.find_elements(By.XPATH, ".//li[contains(., 'Total No. of Towers/Blocks')]//strong")
+                            if towers_elements:
+                                card_data['Total No. of Towers/Blocks'] = towers_elements[0].text.strip()
+                                print(f"[DEBUG] Found Towers/Blocks in card: {card_data['Total No. of Towers/Blocks']}")
+                            else:
+                                # Fallback: look for pattern in text
+                                card_text = project_card.text
+                                towers_match = re.search(r'(?:total no\. of towers/blocks|towers?|blocks?)[^\d]*?(\d+)', card_text, re.IGNORECASE)
+                                if towers_match:
+                                    card_data['Total No. of Towers/Blocks'] = towers_match.group(1)
+                                    print(f"[DEBUG] Found Towers/Blocks via regex: {card_data['Total No. of Towers/Blocks']}")
+                        except Exception as e:
+                            print(f"[DEBUG] Error extracting Towers/Blocks from card: {e}")
+                    
+                        # Extract Total Units from <strong> tag
+                        try:
+                            total_units_elements = project_card.find_elements(By.XPATH, ".//li[contains(., 'Total Units')]//strong")
+                            if total_units_elements:
+                                card_data['Total Units'] = total_units_elements[0].text.strip()
+                                print(f"[DEBUG] Found Total Units in card: {card_data['Total Units']}")
+                            else:
+                                # Fallback: look for pattern in text
+                                card_text = project_card.text
+                                total_match = re.search(r'total units[^\d]*?(\d+)', card_text, re.IGNORECASE)
+                                if total_match:
+                                    card_data['Total Units'] = total_match.group(1)
+                                    print(f"[DEBUG] Found Total Units via regex: {card_data['Total Units']}")
+                        except Exception as e:
+                            print(f"[DEBUG] Error extracting Total Units from card: {e}")
                         
-                except Exception as card_e:
-                    print(f"[DEBUG] Error extracting from project card: {card_e}")
+                    except Exception as card_e:
+                        print(f"[DEBUG] Error extracting from project card: {card_e}")
                 
-                print(f'Clicking View More for project {project_index + 1}...')
-                view_more_btn.click()
-                time.sleep(3)
+                    print(f'Clicking View More for project {project_index + 1}...')
+                    view_more_btn.click()
+                settle(driver, 3, name='details page')
                 
                 # Wait for details page to load
                 wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Project Name') or contains(text(), 'Registration') or contains(text(), 'RERA')]")))
@@ -367,8 +417,8 @@ try:
             last_height = driver.execute_script('return document.body.scrollHeight')
             for y in range(0, last_height, 400):
                 driver.execute_script(f'window.scrollTo(0, {y});')
-                time.sleep(0.5)
-            time.sleep(1)
+                settle(driver, 0.5, name='details scroll step')
+            settle(driver, 1, name='details scroll')
 
             # Initialize project data dictionary
             project_data = {
@@ -394,10 +444,12 @@ try:
             }
             type_details_rows = []
 
-            # Extract all project fields (using same logic as original script)
+            # Extract all project fields (using same logic as original script);
+            # the cells are stamped once so each lookup is a plain attribute match
+            index_labels(driver)
             def extract_field(field_name, marker):
                 """Helper function to extract field values"""
-                td_elems = driver.find_elements(By.XPATH, f"//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{field_name.lower()}')]")
+                td_elems = driver.find_elements(By.XPATH, f"//td[{lc_contains(field_name)}]")
                 for td in td_elems:
                     try:
                         full_text = td.text.strip()
@@ -427,6 +479,8 @@ try:
             # Check for duplicates - skip if already processed
             if project_identifier in processed_projects:
                 print(f"[SKIP] Project '{project_data['Project Name']}' (RERA: {project_data['RERA Reg. No.']}) already processed. Skipping duplicate.")
+                journal.record_project(JOURNAL_SHARD, project_index, project_data['RERA Reg. No.'],
+                                       route=route_at(harvested, project_index))
                 continue
             
             # Add to processed set
@@ -442,27 +496,8 @@ try:
             project_data['Carpet Area of Units (Range)'] = extract_field('carpet area of units (range)', 'Carpet Area of Units (Range):-')
             project_data['Plan Passing Authority'] = extract_field('plan passing authority', 'Plan Passing Authority:-')
 
-            # Extract Amenities
-            amenities = []
-            try:
-                amenity_labels = driver.find_elements(By.XPATH, "//strong[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'common amenities')]")
-                for label in amenity_labels:
-                    try:
-                        table = label.find_element(By.XPATH, "ancestor::td/following::table[1]")
-                    except Exception:
-                        try:
-                            table = label.find_element(By.XPATH, "ancestor::tr/following::tr//table[1]")
-                        except Exception:
-                            continue
-                    if table:
-                        ps = table.find_elements(By.XPATH, ".//p")
-                        for p in ps:
-                            amenity = p.text.strip()
-                            if amenity and amenity.lower() not in [a.lower() for a in amenities]:
-                                amenities.append(amenity)
-                        break
-            except Exception:
-                pass
+            # Read the amenities table in one round-trip
+            amenities = unique_items(read_tables(driver, [AMENITIES_SPEC]).get('amenities'))
             if amenities:
                 project_data['Amenities'] = ', '.join(amenities)
 
@@ -686,7 +721,7 @@ try:
             # Extract Partners
             partners = []
             try:
-                td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'partners')]")
+                td_elems = driver.find_elements(By.XPATH, f"//td[{lc_contains('partners')}]")
                 for td in td_elems:
                     try:
                         full_text = td.text.strip()
@@ -706,27 +741,9 @@ try:
             for i, partner in enumerate(partners, 1):
                 project_data[f'Partner {i}'] = partner
 
-            # Extract Type Details table
-            try:
-                type_details_found = False
-                tables = driver.find_elements(By.XPATH, "//table")
-                for table in tables:
-                    headers = table.find_elements(By.XPATH, ".//th")
-                    header_texts = [th.text.strip().lower() for th in headers]
-                    if ('unit type' in header_texts and 'block' in header_texts and 'total units' in header_texts):
-                        rows = table.find_elements(By.XPATH, ".//tr")
-                        if len(rows) >= 2:
-                            headers = [th.text.strip() for th in rows[0].find_elements(By.XPATH, ".//th")]
-                            for row in rows[1:]:
-                                cells = row.find_elements(By.XPATH, ".//td")
-                                if len(cells) == len(headers):
-                                    row_dict = {headers[i]: cells[i].text.strip() for i in range(len(headers))}
-                                    if any(row_dict.values()):
-                                        type_details_rows.append(row_dict)
-                            type_details_found = True
-                            break
-            except Exception as e:
-                print(f'Error extracting Type Details: {e}')
+            # Type Details rows (table found by its Unit Type / Block / Total Units headers)
+            tables = read_tables(driver, [TYPE_DETAILS_SIGNATURE_SPEC])
+            type_details_rows.extend(table_records(tables.get('type_details')))
 
             # Combine Type Details into single row
             combined_row = project_data.copy()
@@ -742,6 +759,8 @@ try:
             # Add current project to all_projects_data list
             all_projects_data.append(combined_row)
             project_count += 1
+            journal.record_project(JOURNAL_SHARD, project_index, combined_row.get('RERA Reg. No.', ''), row=combined_row,
+                                   route=route_at(harvested, project_index))
             
             print(f'✓ Successfully processed project {project_count}: {combined_row.get("Project Name", "Unknown")}')
             
@@ -765,6 +784,9 @@ try:
         df_final = pd.DataFrame(all_projects_data)
         df_final.to_csv('ahmedabad_all_projects_final.csv', index=False)
         print(f'✓ All {len(all_projects_data)} projects saved to ahmedabad_all_projects_final.csv')
+        if all(journal.is_done(JOURNAL_SHARD, i, route_at(harvested, i), card_text_at(harvested, driver, i))
+               for i in range(total_projects)):
+            journal.complete()
         
         # Print summary
         project_names = [proj.get('Project Name', 'Unknown') for proj in all_projects_data]
@@ -790,5 +812,6 @@ except Exception as e:
         print(f'Progress saved. {len(all_projects_data)} projects completed before error.')
 
 finally:
+    print_wait_summary()
     driver.quit()
     print('Browser closed. Multi-project scraping completed!')
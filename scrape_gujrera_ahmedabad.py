@@ -1,6 +1,6 @@
 # Real Estate Project Scraper for Gujarat RERA (Ahmedabad)
-# Requirements: selenium, pandas, openpyxl
-# Usage: python scrape_gujrera_ahmedabad.py
+# Requirements: selenium, pandas, openpyxl, lxml, requests (psutil optional, for --measure; pyarrow optional, for --parquet)
+# Usage: python scrape_gujrera_ahmedabad.py [--workers N] [--pincode PIN | --pincodes-xlsx [XLSX]] [--snapshot-dir DIR | --network [--capture-dir DIR]] [--profile production] [--measure CSV] [--parquet PATH] [--raw-log JSONL] [--history SQLITE]
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,6 +14,60 @@ import pandas as pd
 import time
 import os
 import re
+import argparse
+import multiprocessing as mp
+import queue
+import functools
+import traceback
+
+from gujrera_extract import (
+    snapshot_page,
+    summary_fields,
+    profile_fields,
+    promoter_fields,
+    view_columns,
+    PROFILE_NUMBER_TARGETS,
+    PROFILE_TEXT_LABELS,
+    LABEL_PARTS,
+    LABEL_PARTS_JS,
+    partner_card_xpaths,
+    partner_labels,
+    partner_columns,
+)
+from gujrera_snapshot import save_page_source, write_snapshot_meta, parse_snapshot
+from gujrera_navigation import harvest_detail_routes, route_at, card_text_at, open_detail_route
+from gujrera_browser import PROFILES, ProjectMetrics, profile_name, build_chrome_options, apply_cdp_settings
+from gujrera_network import enable_network_capture, drain_xhr_responses, json_fields, save_captures
+from gujrera_http import DEFAULT_WORKERS as DEFAULT_HTTP_WORKERS, fetch_projects, project_id_from_route
+from gujrera_checkpoint import CheckpointJournal, QueueJournal, apply_queued_record
+from gujrera_store import ProjectStore
+from gujrera_history import FieldHistory
+from gujrera_regindex import reg_index_for
+from gujrera_overflow import split_overflow, append_overflow
+from gujrera_filelock import output_lock, atomic_write_csv, append_csv
+from gujrera_writebuffer import SCRAPED_AT, RowWriteBuffer
+from gujrera_rawlog import RawRecordLog
+from gujrera_parquet import export_parquet
+from gujrera_tables import PROJECT_TABLE_SPECS, read_tables, apply_project_tables
+from gujrera_selectors import (
+    AFTER_BR_JS,
+    label_selectors,
+    lc_contains,
+    index_labels,
+    wait_for_label,
+    label_presence,
+    present_targets,
+)
+from gujrera_waits import (
+    settle,
+    wait_for,
+    wait_for_presence,
+    wait_for_element_count_above,
+    wait_for_element_count_stable,
+    wait_for_text_non_empty,
+    wait_for_li_values,
+    print_wait_summary,
+)
 
 # Desired CSV column order
 DESIRED_COLUMNS = [
@@ -84,10 +138,17 @@ def _order_columns(existing_cols, incoming_cols):
             union.append(c); seen.add(c)
     return union
 
+def _empty_cells(frame):
+    """Boolean frame: True where a cell is NaN or an empty/whitespace string."""
+    return frame.isna() | frame.apply(lambda col: col.astype(str).str.strip().eq(''))
+
+REG_ALT_COLUMNS = ('RERA Reg Number', 'regno', 'Registration No.', 'Registration Number', 'RERA No')
+
 # Utility: append rows to CSV without duplicating by RERA Reg. No.
+# Errors are printed and re-raised, so callers know the rows were not written.
 def append_unique_by_regno(df: pd.DataFrame, file_path: str,
                            reg_col: str = 'RERA Reg. No.',
-                           alt_cols = ('RERA Reg Number', 'regno', 'Registration No.', 'Registration Number', 'RERA No')):
+                           alt_cols = REG_ALT_COLUMNS):
     try:
         if df is None or df.empty:
             print(f"No data to append to {file_path}.")
@@ -112,245 +173,239 @@ def append_unique_by_regno(df: pd.DataFrame, file_path: str,
         # Normalize values for comparison
         df[reg_col] = df[reg_col].astype(str).str.strip().str.upper()
 
-        existing = set()
-        existing_cols = None
-        file_exists = os.path.exists(file_path)
-        if file_exists:
-            try:
-                # get existing regnos and columns
-                existing_header = pd.read_csv(file_path, nrows=0)
-                existing_cols = list(existing_header.columns)
-                if reg_col in existing_header.columns:
-                    existing_only_reg = pd.read_csv(file_path, usecols=[reg_col])
-                    existing = set(existing_only_reg[reg_col].astype(str).str.strip().str.upper().tolist())
+        # One writer at a time: other crawler processes may share this CSV
+        with output_lock(file_path):
+            reg_index = reg_index_for(file_path, reg_col)
+            reg_index.refresh()
+            if not os.path.exists(file_path):
+                # First write
+                # The header is fixed from here on, so it gets every DESIRED_COLUMNS entry
+                # (not just those this batch happened to fill) followed by the batch's extras
+                first_cols = _order_columns(DESIRED_COLUMNS, list(df.columns))
+                df = df.reindex(columns=first_cols)
+                atomic_write_csv(df, file_path)
+                reg_index.rebuild(df)
+                print(f"Appended {len(df)} new rows to {file_path} (skipped 0 duplicates).")
+                return
+
+            # The header is fixed once written: cells in columns it lacks go to the long
+            # overflow sidecar instead of widening the header with a full-file rewrite
+            header = reg_index.columns if reg_index.is_current() else list(pd.read_csv(file_path, nrows=0).columns)
+            df, overflow = split_overflow(df, header, reg_col)
+            append_overflow(file_path, overflow, reg_col)
+
+            # Duplicate / "would this change anything?" checks from the sidecar index: when
+            # the batch only adds new reg nos or repeats known content, the CSV is not read
+            df_new = reg_index.plan_append(df)
+            if df_new is not None:
+                if not df_new.empty:
+                    append_csv(df_new, file_path)
+                    reg_index.record_append(df_new)
+                    print(f"Appended {len(df_new)} new rows to {file_path} (skipped {len(df) - len(df_new)} duplicates).")
                 else:
-                    existing_full = pd.read_csv(file_path)
-                    if reg_col in existing_full.columns:
-                        existing = set(existing_full[reg_col].astype(str).str.strip().str.upper().tolist())
-            except Exception:
-                try:
-                    existing_full = pd.read_csv(file_path)
-                    if reg_col in existing_full.columns:
-                        existing = set(existing_full[reg_col].astype(str).str.strip().str.upper().tolist())
-                        existing_cols = list(existing_full.columns)
-                except Exception:
-                    existing = set()
-
-        # Split into new vs duplicates (existing reg nos)
-        df_new = df[~df[reg_col].isin(existing)]
-        df_dup = df[df[reg_col].isin(existing)]
+                    print(f"No new rows to append to {file_path} (all duplicates by {reg_col}).")
+                return
 
-        # If file exists, optionally UPDATE existing rows for duplicates (upsert)
-        if file_exists:
+            # Read the existing file once, as text (a numeric column with gaps would
+            # otherwise come back as float and be rewritten as 120.0)
             try:
-                existing_full = pd.read_csv(file_path)
+                existing_full = pd.read_csv(file_path, dtype=str, keep_default_na=False)
             except Exception as e:
-                existing_full = None
                 print(f"[WARN] Could not load existing CSV for update: {e}")
-
-            if existing_full is not None:
-                # If existing file contains disallowed columns, drop them and rewrite
-                existing_drop = [c for c in existing_full.columns if c in DISALLOWED_COLUMNS]
-                if existing_drop:
-                    existing_full = existing_full.drop(columns=existing_drop)
-                    existing_full.to_csv(file_path, index=False)
-                    print(f"Removed columns {existing_drop} from {file_path}.")
-                # Ensure union columns exist and apply DESIRED_COLUMNS-first order
-                union_cols = _order_columns(list(existing_full.columns), list(df.columns))
-                header_changed = list(existing_full.columns) != union_cols
-                existing_full = existing_full.reindex(columns=union_cols)
-                df_new = df_new.reindex(columns=union_cols)
-                df_dup = df_dup.reindex(columns=union_cols)
-
-                # Build a normalized key for matching
-                existing_keys = existing_full[reg_col].astype(str).str.strip().str.upper()
-                # Update existing rows with non-empty incoming values
-                updated_count = 0
-                if not df_dup.empty:
-                    for _, r in df_dup.iterrows():
-                        key = str(r[reg_col]).strip().upper()
-                        mask = (existing_keys == key)
-                        if mask.any():
-                            idxs = existing_full.index[mask]
-                            for idx in idxs:
-                                for col in df.columns:
-                                    if col == reg_col:
-                                        continue
-                                    incoming_val = r.get(col, None)
-                                    if pd.isna(incoming_val) or str(incoming_val).strip() == '':
-                                        continue
-                                    # Write if target is NaN or empty string
-                                    if col not in existing_full.columns or pd.isna(existing_full.at[idx, col]) or str(existing_full.at[idx, col]).strip() == '':
-                                        existing_full.at[idx, col] = incoming_val
-                                        updated_count += 1
-                # Always rewrite file when header changed, even if no cell values updated
-                if header_changed or updated_count:
-                    existing_full.to_csv(file_path, index=False)
-                    if updated_count:
-                        print(f"Updated {updated_count} field(s) for existing rows in {file_path}.")
-                    if header_changed:
-                        print(f"Updated header to include new columns in {file_path}.")
-
-        # Append truly new rows
-        if not df_new.empty:
-            if file_exists:
-                # Ensure columns align with current file
-                try:
-                    existing_full = pd.read_csv(file_path)
-                    union_cols2 = _order_columns(list(existing_full.columns), list(df_new.columns))
-                    if union_cols2 != list(existing_full.columns):
-                        existing_full = existing_full.reindex(columns=union_cols2)
-                        existing_full.to_csv(file_path, index=False)
-                    df_new = df_new.reindex(columns=union_cols2)
-                    df_new.to_csv(file_path, mode='a', index=False, header=False)
-                except Exception:
-                    # Fallback simple append
-                    df_new.to_csv(file_path, mode='a', index=False, header=False)
+                # Fallback simple append
+                append_csv(df.reindex(columns=header), file_path)
+                reg_index.invalidate()
+                print(f"Appended {len(df)} new rows to {file_path} (skipped 0 duplicates).")
+                return
+
+            # If existing file contains disallowed columns, drop them (the file is rewritten below)
+            existing_drop = [c for c in existing_full.columns if c in DISALLOWED_COLUMNS]
+            if existing_drop:
+                existing_full = existing_full.drop(columns=existing_drop)
+                print(f"Removed columns {existing_drop} from {file_path}.")
+            # Ensure union columns exist and apply DESIRED_COLUMNS-first order
+            union_cols = _order_columns(list(existing_full.columns), list(df.columns))
+            header_changed = bool(existing_drop) or list(existing_full.columns) != union_cols
+            existing_full = existing_full.reindex(columns=union_cols)
+
+            # Split into new vs duplicates (existing reg nos)
+            existing_keys = existing_full[reg_col].astype(str).str.strip().str.upper()
+            is_dup = df[reg_col].isin(set(existing_keys))
+            df_new = df[~is_dup].reindex(columns=union_cols)
+            df_dup = df[is_dup]
+
+            # Update existing rows with non-empty incoming values (upsert): per reg no, take the
+            # first non-empty incoming value of each column, align it on the existing rows and
+            # write it only where the existing cell is NaN or an empty string
+            updated_count = 0
+            if not df_dup.empty:
+                value_cols = [c for c in df.columns if c != reg_col]
+                incoming = df_dup[value_cols]
+                incoming = incoming.mask(_empty_cells(incoming))
+                incoming = incoming.groupby(df_dup[reg_col], sort=False).first()
+                aligned = incoming.reindex(existing_keys.values)
+                aligned.index = existing_full.index
+                fill = _empty_cells(existing_full[value_cols]) & aligned.notna()
+                updated_count = int(fill.values.sum())
+                if updated_count:
+                    for col in value_cols:
+                        col_fill = fill[col]
+                        if col_fill.any():
+                            existing_full[col] = existing_full[col].astype(object).mask(col_fill, aligned[col])
+
+            # Rewrite the file when cells were filled or disallowed columns dropped
+            if header_changed or updated_count:
+                atomic_write_csv(pd.concat([existing_full, df_new], ignore_index=True), file_path)
+                if updated_count:
+                    print(f"Updated {updated_count} field(s) for existing rows in {file_path}.")
+                if header_changed:
+                    print(f"Rewrote header of {file_path}.")
+            elif not df_new.empty:
+                append_csv(df_new, file_path)
+            reg_index.rebuild(pd.concat([existing_full, df_new], ignore_index=True))
+
+            if not df_new.empty:
+                print(f"Appended {len(df_new)} new rows to {file_path} (skipped {len(df) - len(df_new)} duplicates).")
             else:
-                # First write
-                # Create header per DESIRED_COLUMNS-first order
-                first_cols = _order_columns([], list(df_new.columns))
-                df_new = df_new.reindex(columns=first_cols)
-                df_new.to_csv(file_path, mode='w', index=False, header=True)
-            print(f"Appended {len(df_new)} new rows to {file_path} (skipped {len(df) - len(df_new)} duplicates).")
-        else:
-            print(f"No new rows to append to {file_path} (all duplicates by {reg_col}).")
+                print(f"No new rows to append to {file_path} (all duplicates by {reg_col}).")
     except Exception as e:
+        # Re-raise so the write buffer keeps the batch (and its spill) and the journal
+        # does not mark the project as saved
         print(f"[ERROR] append_unique_by_regno failed for {file_path}: {e}")
+        raise
 
 # Setup Selenium
-options = webdriver.ChromeOptions()
-options.add_argument('--start-maximized')
-# Make sure headless mode is OFF for debugging
-# options.add_argument('--headless')  # Keep this commented out
-options.add_argument('--disable-gpu')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-dev-shm-usage')
-# Add user-agent to mimic real browser
-options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.7204.183 Safari/537.36')
-service = Service('H:\\DataAnalytics_project\\real_estate_analysis\\chromedriver-win64\\chromedriver.exe')
-driver = webdriver.Chrome(service=service, options=options)
-
-# Set longer page load timeout
-print('Setting page load timeout to 180 seconds...')
-driver.set_page_load_timeout(180)
-
-# Try loading the base URL first, then /#/home
-try:
-    print('Loading base Gujarat RERA URL...')
-    driver.get('https://gujrera.gujarat.gov.in/')
-    print('Base URL loaded. Now loading /#/home ...')
-    driver.get('https://gujrera.gujarat.gov.in/#/home')
-    print('Home URL loaded.')
-    print('Current URL:', driver.current_url)
-    print('First 1000 chars of page source:')
-    print(driver.page_source[:1000])
-except Exception as e:
-    print('Error loading page:', e)
-
-wait = WebDriverWait(driver, 20)
-actions = ActionChains(driver)
+CHROMEDRIVER_PATH = 'H:\\DataAnalytics_project\\real_estate_analysis\\chromedriver-win64\\chromedriver.exe'
+OUTPUT_CSV = 'ahmedabad_projects.csv'
+SEARCH_PINCODE = '380006'
+PINCODES_XLSX = 'Ahmedabad_Pincode_Localities.xlsx'
+JOURNAL_PATH = 'crawl_journal.jsonl'
+
+
+def create_driver(profile=None, network_capture=False):
+    """Start one Chrome session configured for the gujrera site.
+
+    profile is a gujrera_browser profile name ('headed' for debugging, 'production'
+    for headless crawling); None uses GUJRERA_BROWSER_PROFILE or 'headed'.
+    network_capture turns on the performance log read by the JSON backend."""
+    profile = profile_name(profile)
+    print(f'Starting Chrome with the {profile} profile...')
+    options = build_chrome_options(profile)
+    if network_capture:
+        enable_network_capture(options)
+    service = Service(CHROMEDRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=options)
+    apply_cdp_settings(driver, profile)
+
+    # Set longer page load timeout
+    print('Setting page load timeout to 180 seconds...')
+    driver.set_page_load_timeout(180)
+    return driver
+
+
+def open_home(driver):
+    # Try loading the base URL first, then /#/home
+    try:
+        print('Loading base Gujarat RERA URL...')
+        driver.get('https://gujrera.gujarat.gov.in/')
+        print('Base URL loaded. Now loading /#/home ...')
+        driver.get('https://gujrera.gujarat.gov.in/#/home')
+        print('Home URL loaded.')
+        print('Current URL:', driver.current_url)
+        print('First 1000 chars of page source:')
+        print(driver.page_source[:1000])
+    except Exception as e:
+        print('Error loading page:', e)
 
-import traceback
 
 # Helper functions (top-level) for Project Profile and Partners
-def get_project_profile_value(label_text):
+def _strong_or_link_text(strong_el):
+    """Text of a value <strong>, or of the link inside it ('' while not rendered yet)."""
+    val_text = strong_el.text.strip()
+    if val_text:
+        return val_text
     try:
-        xpath = f"//ul[contains(@class, 'pd')]/li/p[contains(., '{label_text}')]/strong"
-        el = WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, xpath)))
-        val_text = el.text.strip()
-        nums = re.findall(r'\d+', val_text)
-        if nums:
-            print(f"[DEBUG] {label_text}: {nums[0]}")
-            return nums[0]
-    except Exception as e:
-        print(f"[DEBUG] Could not extract {label_text}: {e}")
-    return ""
+        link = strong_el.find_element(By.XPATH, ".//a")
+        return link.text.strip() or (link.get_attribute('href') or '').strip()
+    except Exception:
+        return ''
 
-def get_project_profile_text(label_text):
+# Robust text extractor for the Project Profile tab (handles value in <strong>, link, or next line)
+def get_project_profile_text(driver, label_text):
     try:
-        p_xpath = (
-            "//p["
-            "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), "
-            f"'{label_text.lower()}')"
-            "]"
-        )
-        p_elements = driver.find_elements(By.XPATH, p_xpath)
+        # 1) Locate all <p> that contain the label (case-insensitive) anywhere on the page
+        sel = label_selectors(label_text)
+        index_labels(driver)
+        p_elements = driver.find_elements(By.XPATH, sel.p_xpath)
         if not p_elements:
-            p_el = WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, p_xpath)))
-            p_elements = [p_el]
+            p_elements = wait_for_label(driver, sel.p_xpath, 20)[:1]
+
         for p_el in p_elements:
             try:
                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", p_el)
             except Exception:
                 pass
+
+            # 2) Try value inside a descendant <strong>
             try:
                 strong_el = p_el.find_element(By.XPATH, ".//strong")
-                for _ in range(20):
-                    val_text = strong_el.text.strip()
-                    if val_text:
-                        return val_text
-                    try:
-                        link = strong_el.find_element(By.XPATH, ".//a")
-                        link_text = link.text.strip() or (link.get_attribute('href') or '').strip()
-                        if link_text:
-                            return link_text
-                    except Exception:
-                        pass
-                    time.sleep(0.25)
+                # Wait briefly for dynamic text (or link) to populate
+                result = wait_for(lambda: _strong_or_link_text(strong_el), 5, poll=0.25, name='profile strong text')
+                if result.ok:
+                    print(f"[DEBUG] {label_text} (strong): {result.value} after {result.elapsed:.2f}s")
+                    return result.value
             except Exception:
                 pass
+
+            # 3) Try a following-sibling <strong>
             try:
                 following_strong = p_el.find_element(By.XPATH, "following-sibling::strong[1]")
-                for _ in range(20):
-                    val_text = following_strong.text.strip()
-                    if val_text:
-                        return val_text
-                    time.sleep(0.25)
+                result = wait_for_text_non_empty(following_strong, 5, poll=0.25, name='profile following strong')
+                if result.ok:
+                    print(f"[DEBUG] {label_text} (following-strong): {result.value}")
+                    return result.value
             except Exception:
                 pass
+
+            # 3b) Try any <a> within the <p>
             try:
                 link = p_el.find_element(By.XPATH, ".//a")
                 link_text = link.text.strip() or (link.get_attribute('href') or '').strip()
                 if link_text:
+                    print(f"[DEBUG] {label_text} (p->a): {link_text}")
                     return link_text
             except Exception:
                 pass
+
+            # 3c) Try any <span> within the <p>
             try:
                 span_el = p_el.find_element(By.XPATH, ".//span")
                 span_text = span_el.text.strip()
                 if span_text:
+                    print(f"[DEBUG] {label_text} (p->span): {span_text}")
                     return span_text
             except Exception:
                 pass
+
+            # 3d) Try reading text node after <br> within the same <p> using JS (handles values not wrapped in tags)
             try:
-                script = """
-                    const p = arguments[0];
-                    let afterBr = false;
-                    for (const node of p.childNodes) {
-                        if (node.nodeName === 'BR') { afterBr = true; continue; }
-                        if (!afterBr) { continue; }
-                        if (node.nodeType === Node.TEXT_NODE) {
-                            const t = (node.textContent || '').trim();
-                            if (t) { return t; }
-                        }
-                        if (node.nodeType === Node.ELEMENT_NODE) {
-                            const t = (node.innerText || node.textContent || '').trim();
-                            if (t) { return t; }
-                        }
-                    }
-                    return '';
-                """
-                js_val = driver.execute_script(script, p_el)
+                js_val = driver.execute_script(AFTER_BR_JS, p_el)
                 if js_val:
+                    print(f"[DEBUG] {label_text} (p->after<br> text): {js_val}")
                     return js_val.strip()
             except Exception:
                 pass
+
+            # 4) Parse the text content of the <p> to extract anything after the label
             try:
                 text_block = p_el.get_attribute('innerText') or p_el.text
                 text_block = (text_block or '').strip()
-                lowered_label = label_text.lower()
-                lines = [ln.strip() for ln in re.split(r"[\r\n]+", text_block) if ln.strip()]
+                # Remove label prefix on the first line if present
+                # Example: "Project Status\nNew" or "Project Status New"
+                lowered_label = sel.lowered
+                # Prefer next non-empty line after a line containing the label
+                lines = [ln.strip() for ln in re.split(r"[\r\n]+", text_block)]
+                lines = [ln for ln in lines if ln]
                 if lines:
                     label_idx = None
                     for i, ln in enumerate(lines):
@@ -358,142 +413,79 @@ def get_project_profile_text(label_text):
                             label_idx = i
                             break
                     if label_idx is not None:
+                        # Return first non-empty line after label line
                         for j in range(label_idx + 1, len(lines)):
                             candidate = lines[j].strip()
                             if candidate and candidate.lower() != lowered_label:
+                                print(f"[DEBUG] {label_text} (p-lines next): {candidate}")
                                 return candidate
+                        # If same line also contains value (e.g., "Label : Value")
                         same_line = lines[label_idx]
-                        same_line_val = re.sub(rf"^\s*{re.escape(label_text)}\s*[:\-]*\s*", "", same_line, flags=re.IGNORECASE).strip()
+                        same_line_val = sel.prefix_re.sub("", same_line).strip()
                         if same_line_val and same_line_val.lower() != lowered_label:
+                            print(f"[DEBUG] {label_text} (p-same-line): {same_line_val}")
                             return same_line_val
                     else:
-                        stripped = re.sub(rf"^\s*{re.escape(label_text)}\s*[:\-]*\s*", "", text_block, flags=re.IGNORECASE).strip()
+                        # Label not found in split lines; try removing label prefix globally
+                        stripped = sel.prefix_re.sub("", text_block).strip()
                         if stripped and stripped.lower() != lowered_label:
+                            print(f"[DEBUG] {label_text} (p-strip-prefix): {stripped}")
                             return stripped
             except Exception:
                 pass
-        body_txt = driver.find_element(By.TAG_NAME, 'body').text or ''
-        pattern = rf"{re.escape(label_text)}\s*[\:\-]*\s*(?:\r?\n)?\s*([^\r\n]{1,100})"
-        m = re.search(pattern, body_txt, flags=re.IGNORECASE)
-        if m:
-            candidate = (m.group(1) or '').strip()
-            candidate = re.sub(r"\s{2,}.*$", "", candidate)
-            return candidate
-        return ""
-    except Exception as e:
-        print(f"[DEBUG] Could not extract text for {label_text}: {e}")
-        return ""
 
-def extract_label_from_container(container, label_text):
-    try:
-        p_nodes = container.find_elements(
-            By.XPATH,
-            (
-                ".//p[contains(@class,'justify-content-between') and "
-                "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '" + label_text.lower() + "')]"
-            )
-        )
-        if not p_nodes:
-            p_nodes = container.find_elements(
-                By.XPATH,
-                ".//p[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '" + label_text.lower() + "')]"
-            )
-        for p_el in p_nodes:
-            try:
-                last_span = p_el.find_element(By.XPATH, ".//span[last()]")
-                span_txt = last_span.text.strip()
-                if span_txt and label_text.lower() not in span_txt.lower():
-                    return span_txt
-            except Exception:
-                pass
+            # 5) Read the parent <li> text and try to split
             try:
-                strong_el = p_el.find_element(By.XPATH, ".//strong")
-                txt = strong_el.text.strip()
-                if txt:
-                    return txt
+                li_el = p_el.find_element(By.XPATH, "ancestor::li[1]")
+                li_text = (li_el.get_attribute('innerText') or li_el.text or '').strip()
+                lines = [ln.strip() for ln in re.split(r"[\r\n]+", li_text) if ln.strip()]
+                for i, ln in enumerate(lines):
+                    if sel.lowered in ln.lower() and i + 1 < len(lines):
+                        candidate = lines[i + 1]
+                        if candidate and candidate.lower() != sel.lowered:
+                            print(f"[DEBUG] {label_text} (li-lines): {candidate}")
+                            return candidate
+                # 5b) Try the first strong under this li after the label
                 try:
-                    a_el = strong_el.find_element(By.XPATH, ".//a")
-                    atxt = a_el.text.strip() or (a_el.get_attribute('href') or '').strip()
-                    if atxt:
-                        return atxt
+                    strongs = li_el.find_elements(By.XPATH, ".//strong")
+                    for st in strongs:
+                        txt = st.text.strip()
+                        if txt:
+                            print(f"[DEBUG] {label_text} (li->strong): {txt}")
+                            return txt
                 except Exception:
                     pass
             except Exception:
                 pass
-            try:
-                last_desc_txt = p_el.find_element(By.XPATH, ".//*[last()]").text.strip()
-                if last_desc_txt and label_text.lower() not in last_desc_txt.lower():
-                    return last_desc_txt
-            except Exception:
-                pass
-            try:
-                a_el = p_el.find_element(By.XPATH, ".//a")
-                atxt = a_el.text.strip() or (a_el.get_attribute('href') or '').strip()
-                if atxt:
-                    return atxt
-            except Exception:
-                pass
-            try:
-                span_el = p_el.find_element(By.XPATH, ".//span")
-                stxt = span_el.text.strip()
-                if stxt:
-                    return stxt
-            except Exception:
-                pass
-            try:
-                js = """
-                    const p = arguments[0];
-                    let after = false;
-                    for (const node of p.childNodes) {
-                        if (node.nodeName === 'BR') { after = true; continue; }
-                        if (!after) continue;
-                        if (node.nodeType === Node.TEXT_NODE) {
-                            const t = (node.textContent||'').trim();
-                            if (t) return t;
-                        } else if (node.nodeType === Node.ELEMENT_NODE) {
-                            const t = (node.innerText||node.textContent||'').trim();
-                            if (t) return t;
-                        }
-                    }
-                    return '';
-                """
-                js_val = driver.execute_script(js, p_el)
-                if js_val:
-                    return js_val.strip()
-            except Exception:
-                pass
-            try:
-                text_block = (p_el.get_attribute('innerText') or p_el.text or '').strip()
-                m = re.search(rf"{re.escape(label_text)}\s*[:\-\uFF1A]*\s*([^\r\n]+)$", text_block, flags=re.IGNORECASE)
-                if m:
-                    val = m.group(1).strip()
-                    if val:
-                        return val
-                lines = [ln.strip() for ln in re.split(r"[\r\n]+", text_block) if ln.strip()]
-                if lines:
-                    for i, ln in enumerate(lines):
-                        if label_text.lower() in ln.lower():
-                            if i + 1 < len(lines):
-                                val = lines[i+1].strip()
-                                if val:
-                                    return val
-                    same = re.sub(rf"^\s*{re.escape(label_text)}\s*[:\-]*\s*", "", lines[0], flags=re.IGNORECASE).strip()
-                    if same:
-                        return same
-            except Exception:
-                pass
-    except Exception:
-        pass
-    return ''
 
-try:
+        print(f"[DEBUG] {label_text}: value not found or empty.")
+        # 6) Global page-text fallback using regex: capture text after label up to newline (or on next line)
+        try:
+            body_txt = driver.find_element(By.TAG_NAME, 'body').text or ''
+            m = sel.body_re.search(body_txt)
+            if m:
+                candidate = (m.group(1) or '').strip()
+                candidate = re.sub(r"\s{2,}.*$", "", candidate)
+                print(f"[DEBUG] {label_text} (body-regex): {candidate}")
+                return candidate
+        except Exception:
+            pass
+        return ""
+    except Exception as e:
+        print(f"[DEBUG] Could not extract text for {label_text}: {e}")
+        return ""
+
+def load_project_listing(driver, wait, actions, pincode=SEARCH_PINCODE):
+    """Search for pincode, apply the Ahmedabad filter and lazy-load every project card.
+
+    Returns the number of View More cards found on the listing."""
     print('Waiting for home page to load...')
     search_bar = wait.until(EC.visibility_of_element_located((By.XPATH, '//input[contains(@placeholder, "Project, Agent, Promoter")]')))
     print('Typing "district" in search bar and pressing Enter...')
     search_bar.clear()
-    search_bar.send_keys('380006')
+    search_bar.send_keys(pincode)
     search_bar.send_keys(u'\ue007')  # Press Enter key
-    time.sleep(3)
+    settle(driver, 3, name='search results')
     print('Waiting for filter panel link (id=clickForFilter) to appear...')
     filter_panel_link = wait.until(EC.element_to_be_clickable((By.ID, 'clickForFilter')))
     filter_panel_link.click()
@@ -505,22 +497,24 @@ try:
     # Click the dropdown to expand
     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", district_dropdown)
     actions.move_to_element(district_dropdown).click().perform()
-    time.sleep(1)
+    settle(driver, 1, name='district dropdown')
     # Use Selenium's Select class for standard <select>
     from selenium.webdriver.support.ui import Select
     print('Selecting Ahmedabad in district dropdown using Select class...')
     select = Select(district_dropdown)
     select.select_by_visible_text('Ahmedabad')
     print('Ahmedabad selected.')
-    time.sleep(1)
+    settle(driver, 1, name='district selected')
     print('Ahmedabad selected. Scrolling to Apply button (as <a> tag)...')
     apply_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.fBtn.applyButtonCl')))
     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", apply_btn)
-    time.sleep(0.5)
+    settle(driver, 0.5, name='scroll into view')
     print('Clicking Apply <a> button...')
     apply_btn.click()
     print('Clicked Apply. Waiting for project cards/results to load...')
-    time.sleep(8)
+    cards = wait_for_presence(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', 8, name='results after Apply')
+    settle(driver, max(0.5, 8 - cards.elapsed), name='results after Apply')
+    print(f'Results appeared after {cards.elapsed:.1f}s.')
     print('Project results should now be visible.')
 
     # 5. Remove all filters except PROJECT in summary bar
@@ -536,11 +530,11 @@ try:
                     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", x_btn)
                     x_btn.click()
                     print(f"[INFO] Removed filter: {filter_label}")
-                    time.sleep(0.7)  # Wait for UI update
+                    settle(driver, 0.7, name='filter removal')  # Wait for UI update
             except Exception as cancel_e:
                 print(f"[WARNING] Could not remove filter: {cancel_e}")
                 continue
-        time.sleep(1)  # Wait for UI to settle after removals
+        settle(driver, 1, name='filter removals')  # Wait for UI to settle after removals
     except Exception as e:
         print(f"[WARNING] Could not process filter summary bar: {e}")
         # Continue anyway
@@ -549,7 +543,7 @@ try:
     try:
         print('[DEBUG] Attempting to clear non-Project filters (UL/LI)...')
         # Give DOM a moment to render the filter list
-        time.sleep(1.5)
+        settle(driver, 1.5, name='filter list')
         removed_total = 0
         for _ in range(3):  # up to three passes in case the list re-renders
             removed_this_pass = 0
@@ -581,13 +575,13 @@ try:
                         close_a = None
                     if close_a is not None:
                         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", close_a)
-                        time.sleep(0.15)
+                        settle(driver, 0.15, name='scroll into view')
                         try:
                             close_a.click()
                         except Exception:
                             driver.execute_script("arguments[0].click();", close_a)
                         removed_this_pass += 1
-                        time.sleep(0.15)
+                        settle(driver, 0.15, name='filter removal')
                 except Exception:
                     continue
             removed_total += removed_this_pass
@@ -599,7 +593,7 @@ try:
 
     # Scroll down slightly to bring cards into view
     driver.execute_script('window.scrollBy(0, 250);')
-    time.sleep(1)
+    settle(driver, 1, name='scroll')
     
     # Implement lazy loading to get all projects
     print("Loading all projects by scrolling to trigger lazy loading...")
@@ -618,11 +612,14 @@ try:
         if current_count == previous_count:
             # Try scrolling to bottom to trigger lazy loading
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for new content to load
-            
-            # Check again after scrolling
-            view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
-            new_count = len(view_more_buttons)
+            # Wait for new content to load; check again after scrolling
+            grew = wait_for_element_count_above(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', current_count, 2,
+                                                name='lazy load')
+            new_count = grew.value
+            if grew.ok:
+                # Let the rest of the batch render before counting again
+                new_count = wait_for_element_count_stable(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', 2,
+                                                          stable_for=0.3, name='lazy load batch').value
             
             if new_count == current_count:
                 # No new projects loaded after scrolling, we've reached the end
@@ -636,7 +633,10 @@ try:
         
         # Scroll to bottom to load more
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)  # Wait for lazy loading
+        if wait_for_element_count_above(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', current_count, 2,
+                                        name='lazy load').ok:  # Wait for lazy loading
+            wait_for_element_count_stable(driver, By.CSS_SELECTOR, 'a.vmore.mb-2', 2, stable_for=0.3,
+                                          name='lazy load batch')
     
     # Final count of all projects
     view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
@@ -645,1293 +645,840 @@ try:
     
     # Scroll back to top before processing
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
-    
-    for project_index in range(total_projects):
-        try:
-            print(f"\n=== Processing Project {project_index + 1} of {total_projects} ===")
-            # Re-find buttons each loop to avoid stale references
-            view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
-            if project_index >= len(view_more_buttons):
-                print(f"Project {project_index + 1} not found. Stopping.")
-                break
-            view_more_btn = view_more_buttons[project_index]
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", view_more_btn)
-            print('Clicking View More...')
-            view_more_btn.click()
-            print('Clicked View More. Waiting for project details page to load...')
-            time.sleep(3)
-            # Wait for a known details field to appear
-            wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Project Name') or contains(text(), 'Registration') or contains(text(), 'Promoter') or contains(text(), 'Builder') or contains(text(), 'Address') or contains(text(), 'Locality') or contains(text(), 'Unit') or contains(text(), 'Price') or contains(text(), 'Completion') or contains(text(), 'Status') or contains(text(), 'Start Date') or contains(text(), 'End Date') or contains(text(), 'Available') or contains(text(), 'Sold') or contains(text(), 'Type') or contains(text(), 'RERA') or contains(text(), 'Reg No') or contains(text(), 'Date') or contains(text(), 'Status') or contains(text(), 'Type') or contains(text(), 'Unit') or contains(text(), 'Price')]") ))
-            print('Details page should now be visible.')
-
-            # Scroll down the details page in increments to load all sections
-            print('Scrolling through the details page to load all sections...')
-            last_height = driver.execute_script('return document.body.scrollHeight')
-            for y in range(0, last_height, 400):
-                driver.execute_script(f'window.scrollTo(0, {y});')
-                time.sleep(0.5)
-            time.sleep(1)
-            
-            # Specifically scroll to About Property section
-            try:
-                print('Scrolling to About Property section...')
-                about_property_selectors = [
-                    "//td[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]",
-                    "//strong[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]",
-                    "//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]",
-                    "//div[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]"
-                ]
-                
-                about_property_found = False
-                for selector in about_property_selectors:
-                    try:
-                        elements = driver.find_elements(By.XPATH, selector)
-                        for element in elements:
-                            if element.is_displayed():
-                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                                time.sleep(2)
-                                print('Scrolled to About Property section')
-                                about_property_found = True
-                                break
-                        if about_property_found:
-                            break
-                    except Exception:
-                        continue
-                
-                if not about_property_found:
-                    print('About Property section not found, continuing with extraction...')
-                    
-            except Exception as e:
-                print(f'Error scrolling to About Property section: {e}')
-
-            print('Extracting Project Name and RERA Registration Number...')
-            project_data = {
-                'Pincode': '380006',  # Add pincode column
-                'Project Name': '',
-                'RERA Reg. No.': '',
-                'Project Address': '',
-                'Project Type': '',
-                'About Property': '',
-                'Project Start Date': '',
-                'Project End Date': '',
-                'Project Land Area': '',
-                'Total Open Area': '',
-                'Total Covered Area': '',
-                'Carpet Area of Units (Range)': '',
-                'Plan Passing Authority': '',
-                'Amenities': '',
-                'Total Units': '',
-                'Available Units': '',
-                'Total No. of Towers/Blocks': '',
-                'Promoter Name': '',
-                'Promoter Type': '',
-                'Office Address': ''
-                # Partner columns will be added dynamically below
-            }
-            type_details_rows = []
-
-            # Extract Project Name (do not overwrite if already found)
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'project name')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Project Name:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Project Name'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract RERA Reg. No. (do not overwrite if already found)
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'gujrera reg. no.')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'GUJRERA Reg. No.:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['RERA Reg. No.'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Project Address (do not overwrite if already found)
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'project address')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Project Address:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Project Address'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Taluka, District, State (from a single td containing labels)
-            try:
-                td = driver.find_element(
-                    By.XPATH,
-                    "//td[contains(@class,'no-print') and contains(., 'Taluka:-') and contains(., 'District:-') and contains(., 'State:-')]"
-                )
-                text = td.text.strip()
-                # Example text: "Taluka:- Ahmedabad City, District:- Ahmedabad, State:- GUJARAT"
-                taluka = ''
-                district = ''
-                state = ''
-                m = re.search(r"Taluka:-\s*([^,\n]+)", text, flags=re.IGNORECASE)
-                if m:
-                    taluka = m.group(1).strip()
-                m = re.search(r"District:-\s*([^,\n]+)", text, flags=re.IGNORECASE)
-                if m:
-                    district = m.group(1).strip()
-                m = re.search(r"State:-\s*([^,\n]+)", text, flags=re.IGNORECASE)
-                if m:
-                    state = m.group(1).strip()
-                # Save right after Project Address to preserve column order
-                if taluka:
-                    project_data['Taluka'] = taluka
-                if district:
-                    project_data['District'] = district
-                if state:
-                    project_data['State'] = state
-            except Exception:
-                pass
-            # Extract Project Type
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'project type')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Project Type:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Project Type'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract About Property
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'About Property:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['About Property'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Project Start Date
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'project start date')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Project Start Date:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Project Start Date'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Project End Date
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'project end date')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Project End Date:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Project End Date'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Project Land Area
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'project land area')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Project Land Area:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Project Land Area'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Total Open Area
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'total open area')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Total Open Area:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Total Open Area'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Total Covered Area
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'total covered area')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Total Covered Area:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Total Covered Area'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Carpet Area of Units (Range)
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'carpet area of units (range)')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Carpet Area of Units (Range)[:-]'
-                    idx = full_text.find('Carpet Area of Units (Range):-')
-                    if idx != -1:
-                        value = full_text[idx+len('Carpet Area of Units (Range):-'):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if 'Carpet Area of Units (Range):-' in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Carpet Area of Units (Range)'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Plan Passing Authority
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'plan passing authority')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Plan Passing Authority:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Plan Passing Authority'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Redevelopment Project and Affordable Housing flags from the same summary row
-            try:
-                # Prefer the <tr> that also includes Plan Passing Authority (same row in provided HTML)
-                tr = driver.find_element(
-                    By.XPATH,
-                    "//tr[.//strong[contains(., 'Plan Passing')]]"
-                )
-                txt = tr.text.strip()
-                # Examples in combined row:
-                # "Plan Passing Authority:- XYZ  Redevelopment Project:- NO  Affordable Housing :- YES"
-                m = re.search(r"Redevelopment\s*Project:-\s*([^\n\r]+?)(?:\s{2,}|\s+$|$)", txt, flags=re.IGNORECASE)
-                if m:
-                    redevelopment_val = m.group(1).strip().strip(',')
-                    if redevelopment_val.upper() == 'NIL':
-                        redevelopment_val = 'NO'
-                    project_data['Redevelopment Project'] = redevelopment_val
-                m = re.search(r"Affordable\s*Housing\s*:-\s*([^\n\r]+?)(?:\s{2,}|\s+$|$)", txt, flags=re.IGNORECASE)
-                if m:
-                    affordable_val = m.group(1).strip().strip(',')
-                    project_data['Affordable Housing'] = affordable_val
-            except Exception:
-                # Fallback: search anywhere in the page
-                try:
-                    body_txt = driver.find_element(By.TAG_NAME, 'body').text
-                    m = re.search(r"Redevelopment\s*Project:-\s*([^\n\r]+)", body_txt, flags=re.IGNORECASE)
-                    if m:
-                        redevelopment_val = m.group(1).strip().strip(',')
-                        if redevelopment_val.upper() == 'NIL':
-                            redevelopment_val = 'NO'
-                        project_data['Redevelopment Project'] = redevelopment_val
-                    m = re.search(r"Affordable\s*Housing\s*:-\s*([^\n\r]+)", body_txt, flags=re.IGNORECASE)
-                    if m:
-                        affordable_val = m.group(1).strip().strip(',')
-                        project_data['Affordable Housing'] = affordable_val
-                except Exception:
-                    pass
-            # Extract Amenities (all <p> tags inside the table after 'Common Amenities' <strong>)
-            amenities = []
-            try:
-                # Find the 'Common Amenities' <strong>
-                amenity_labels = driver.find_elements(By.XPATH, "//strong[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'common amenities')]")
-                for label in amenity_labels:
-                    # Find the closest following table (regardless of nesting)
-                    table = None
-                    try:
-                        table = label.find_element(By.XPATH, "ancestor::td/following::table[1]")
-                    except Exception:
-                        try:
-                            table = label.find_element(By.XPATH, "ancestor::tr/following::tr//table[1]")
-                        except Exception:
-                            continue
-                    if table:
-                        ps = table.find_elements(By.XPATH, ".//p")
-                        for p in ps:
-                            amenity = p.text.strip()
-                            if amenity and amenity.lower() not in [a.lower() for a in amenities]:
-                                amenities.append(amenity)
-                        break  # Only take the first matching amenities table
-            except Exception:
-                pass
-            if amenities:
-                project_data['Amenities'] = ', '.join(amenities)
+    settle(driver, 1, name='scroll')
+    return total_projects
 
-            # Removed: Do not store 'Booked Units as on' / 'Un-booked Units as on'
 
-            # Extract 'Type Details' table: Unit Type, Block, Booked/Un-booked Units
-            try:
-                # Locate the table that has a header cell with 'Type Details'
-                type_label = driver.find_element(By.XPATH, "//strong[contains(normalize-space(.), 'Type Details')]")
-                type_table = type_label.find_element(By.XPATH, "ancestor::table[1]")
-
-                # Read headers
-                headers = [th.text.strip() for th in type_table.find_elements(By.XPATH, ".//thead//th")]
-                if not headers:
-                    # Fallback: sometimes headers are in the second row of thead
-                    headers = [th.text.strip() for th in type_table.find_elements(By.XPATH, ".//thead//tr[last()]//th")]
-
-                # Helper to find column index by fuzzy header match
-                def find_col_idx(target):
-                    t = target.lower()
-                    for i, h in enumerate(headers):
-                        low = h.lower()
-                        if 'unit type' in t and ('unit' in low and 'type' in low):
-                            return i
-                        if t == 'block' and 'block' in low:
-                            return i
-                        if 'booked units as on' in t and 'booked' in low:
-                            return i
-                        if 'un-booked units as on' in t and ('un-booked' in low or 'unbooked' in low):
-                            return i
-                    return None
-
-                idx_unit = find_col_idx('Unit Type')
-                idx_block = find_col_idx('Block')
-                idx_booked = None
-                idx_unbooked = None
-
-                vals_unit, vals_block = [], []
-                rows = type_table.find_elements(By.XPATH, ".//tbody//tr")
-                for r in rows:
-                    cells = r.find_elements(By.XPATH, ".//td")
-                    def safe_get(idx):
-                        try:
-                            return cells[idx].text.strip()
-                        except Exception:
-                            return ''
-                    if idx_unit is not None:
-                        v = safe_get(idx_unit)
-                        if v:
-                            vals_unit.append(v)
-                    if idx_block is not None:
-                        v = safe_get(idx_block)
-                        if v:
-                            vals_block.append(v)
-                    # Booked/Un-booked columns intentionally ignored
-
-                if vals_unit:
-                    project_data['Unit Type'] = '; '.join(vals_unit)
-                if vals_block:
-                    project_data['Block'] = '; '.join(vals_block)
-                # Only set from Type Details if summary page didn't already populate
-                # Do not set Booked/Un-booked fields
-            except Exception:
-                pass
+def open_project(driver, wait, project_index, total_projects, route=None):
+    """Open the details page of project_index and let it render: straight to its
+    detail route when known, otherwise by clicking its View More card.
 
-            # Extract financial summary: Project Estimated Cost and Percentage Loan Against Project Estimated Cost
+    Returns False when the card is no longer present on the listing."""
+    print(f"\n=== Processing Project {project_index + 1} of {total_projects} ===")
+    if route:
+        open_detail_route(driver, route)
+    else:
+        # Re-find buttons each loop to avoid stale references
+        view_more_buttons = driver.find_elements(By.CSS_SELECTOR, 'a.vmore.mb-2')
+        if project_index >= len(view_more_buttons):
+            print(f"Project {project_index + 1} not found. Stopping.")
+            return False
+        view_more_btn = view_more_buttons[project_index]
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", view_more_btn)
+        print('Clicking View More...')
+        view_more_btn.click()
+    print('Waiting for project details page to load...')
+    settle(driver, 3, name='details page')
+    # Wait for a known details field to appear
+    wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Project Name') or contains(text(), 'Registration') or contains(text(), 'Promoter') or contains(text(), 'Builder') or contains(text(), 'Address') or contains(text(), 'Locality') or contains(text(), 'Unit') or contains(text(), 'Price') or contains(text(), 'Completion') or contains(text(), 'Status') or contains(text(), 'Start Date') or contains(text(), 'End Date') or contains(text(), 'Available') or contains(text(), 'Sold') or contains(text(), 'Type') or contains(text(), 'RERA') or contains(text(), 'Reg No') or contains(text(), 'Date') or contains(text(), 'Status') or contains(text(), 'Type') or contains(text(), 'Unit') or contains(text(), 'Price')]") ))
+    print('Details page should now be visible.')
+
+    # Scroll down the details page in increments to load all sections
+    print('Scrolling through the details page to load all sections...')
+    last_height = driver.execute_script('return document.body.scrollHeight')
+    for y in range(0, last_height, 400):
+        driver.execute_script(f'window.scrollTo(0, {y});')
+        settle(driver, 0.5, name='details scroll step')
+    settle(driver, 1, name='details scroll')
+    
+    # Specifically scroll to About Property section
+    try:
+        print('Scrolling to About Property section...')
+        about_property_selectors = [
+            "//td[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]",
+            "//strong[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]",
+            "//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]",
+            "//div[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about property')]"
+        ]
+        
+        about_property_found = False
+        for selector in about_property_selectors:
             try:
-                # Target the row that contains the labels in strong tags
-                fin_row = driver.find_element(
-                    By.XPATH,
-                    "//tr[.//strong[contains(normalize-space(.), 'Project Estimated Cost')]]"
-                )
-
-                def extract_from_row(label_xpath, label_regex):
-                    try:
-                        strong = fin_row.find_element(By.XPATH, label_xpath)
-                        td = strong.find_element(By.XPATH, "ancestor::td[1]")
-                        text = td.text.strip()
-                        m = re.search(label_regex, text, flags=re.IGNORECASE)
-                        if m:
-                            val = m.group(1).strip()
-                            # Normalize placeholders (preserve 'NIL' as-is)
-                            if val.upper() in {'NA', 'N/A', 'NONE', 'NULL'} or val.upper().startswith('NAN'):
-                                return ''
-                            return val
-                    except Exception:
-                        return ''
-                    return ''
-
-                cost_val = extract_from_row(
-                    ".//strong[contains(normalize-space(.), 'Project Estimated Cost')]",
-                    r"Project\s*Estimated\s*Cost\s*\(Rs\.\)\s*:-\s*(.*)$"
-                )
-                if cost_val:
-                    project_data['Project Estimated Cost (Rs.)'] = cost_val
-
-                pct_val = extract_from_row(
-                    ".//strong[contains(normalize-space(.), 'Percentage Loan Against Project Estimated Cost')]",
-                    r"Percentage\s*Loan\s*Against\s*Project\s*Estimated\s*Cost\s*:-\s*(.*)$"
-                )
-                if pct_val:
-                    project_data['Percentage Loan Against Project Estimated Cost'] = pct_val
+                elements = driver.find_elements(By.XPATH, selector)
+                for element in elements:
+                    if element.is_displayed():
+                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+                        settle(driver, 2, name='about property')
+                        print('Scrolled to About Property section')
+                        about_property_found = True
+                        break
+                if about_property_found:
+                    break
             except Exception:
-                pass
-
-            # Extract Compliance metrics from summary page
-            try:
-                def extract_label_value_exact(label_text_base):
-                    """Find a <strong> containing label_text_base (no punctuation required); return trailing text in the same <td>."""
-                    try:
-                        strong = driver.find_element(By.XPATH, f"//strong[contains(normalize-space(.), '{label_text_base}')]")
-                        td = strong.find_element(By.XPATH, "ancestor::td[1]")
-                        text = td.text.strip()
-                        # Build regex that tolerates optional spaces/colon/hyphen sequences
-                        pattern = rf"{re.escape(label_text_base)}\s*:?\s*-?\s*(.*)$"
-                        m = re.search(pattern, text, flags=re.IGNORECASE)
-                        if m:
-                            val = m.group(1).strip()
-                            # Preserve 'NIL' for compliance fields; treat other placeholders as empty
-                            if val.upper() in {'NA', 'N/A', 'NONE', 'NULL'} or val.upper().startswith('NAN'):
-                                return ''
-                            return val
-                    except Exception:
-                        return ''
-                    return ''
-
-                q_required = extract_label_value_exact('Total Quarterly Compliance Required')
-                if q_required:
-                    project_data['Total Quarterly Compliance Required'] = q_required
-
-                q_complied = extract_label_value_exact('Total Complied Quarters')
-                if q_complied:
-                    project_data['Total Complied Quarters'] = q_complied
-
-                q_defaulted = extract_label_value_exact('Total Quarterly Compliance Defaulted')
-                if q_defaulted:
-                    project_data['Total Quarterly Compliance Defaulted'] = q_defaulted
-
-                a_required = extract_label_value_exact('Total Annual Compliance Required')
-                if a_required:
-                    project_data['Total Annual Compliance Required'] = a_required
-
-                a_complied = extract_label_value_exact('Total Complied Annual Compliance')
-                if a_complied:
-                    project_data['Total Complied Annual Compliance'] = a_complied
+                continue
+        
+        if not about_property_found:
+            print('About Property section not found, continuing with extraction...')
+            
+    except Exception as e:
+        print(f'Error scrolling to About Property section: {e}')
+    return True
 
-                a_defaulted = extract_label_value_exact('Total Annual Compliance Defaulted')
-                if a_defaulted:
-                    project_data['Total Annual Compliance Defaulted'] = a_defaulted
-            except Exception:
-                pass
 
-            # Ensure financial and compliance keys exist so CSV gains headers even if values missing
-            for _k in [
-        'Project Estimated Cost (Rs.)',
-        'Percentage Loan Against Project Estimated Cost',
-        'Total Quarterly Compliance Required',
-        'Total Complied Quarters',
-        'Total Quarterly Compliance Defaulted',
-        'Total Annual Compliance Required',
-        'Total Complied Annual Compliance',
-        'Total Annual Compliance Defaulted',
-            ]:
-                if _k not in project_data:
-                    project_data[_k] = ''
-
-            import re
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            # removed stray placeholder
-            def get_li_value(label, timeout_seconds: float = 12.0, stable_reads_required: int = 2):
-                """Read a numeric summary value under ul.pd for the given label, waiting for dynamic updates to settle.
-
-                Strategy per attempt:
-                - strong inside the label <p>
-                - following sibling element
-                - next line after label within the same <p>
-                - inline "Label: 12" within the same <p>
-                We poll until we observe a stable value (same read repeated) and, preferably, non-zero.
-                """
-                start_ts = time.time()
-                last_val = None
-                stable_reads = 0
-
-                def read_once() -> str:
-                    # Case-insensitive locator for the <p> with the label
-                    p_xpath = (
-                        "//ul[contains(@class, 'pd')]/li/p["
-                        "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), "
-                        f"'{label.lower()}')"
-                        "]"
-                    )
-                try:
-                    # Try direct strong under the <p>
-                    strong_xpath = p_xpath + "/strong"
-                    element = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.XPATH, strong_xpath)))
-                    txt = (element.text or '').strip()
-                    nums = re.findall(r"\d+", txt)
-                    if nums:
-                        return nums[0]
-                except Exception:
-                    pass
-                try:
-                    p_el = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.XPATH, p_xpath)))
-                    # Following sibling element
-                    try:
-                        sib = p_el.find_element(By.XPATH, "following-sibling::*[1]")
-                        txt = (sib.text or '').strip()
-                        nums = re.findall(r"\d+", txt)
-                        if nums:
-                            return nums[0]
-                    except Exception:
-                        pass
-                    # Next line after label in the same <p>
-                    text_block = (p_el.get_attribute('innerText') or p_el.text or '').strip()
-                    lines = [ln.strip() for ln in re.split(r"[\r\n]+", text_block) if ln.strip()]
-                    if len(lines) >= 2:
-                        for i, ln in enumerate(lines):
-                            if label.lower() in ln.lower() and i + 1 < len(lines):
-                                nxt = lines[i + 1]
-                                nums = re.findall(r"\d+", nxt)
-                                if nums:
-                                    return nums[0]
-                    # Inline label: value
-                    m = re.search(rf"{re.escape(label)}\s*[:\-]*\s*(\d+)", text_block, flags=re.IGNORECASE)
-                    if m:
-                        return m.group(1)
-                except Exception:
-                    pass
-                return ""
-
-                while time.time() - start_ts < timeout_seconds:
-                    val = read_once()
-                    if val:
-                        if val == last_val:
-                            stable_reads += 1
-                        else:
-                            last_val = val
-                            stable_reads = 1
-                        # Prefer a non-zero stable value; otherwise accept any value that stabilizes
-                        if (val != '0' and stable_reads >= stable_reads_required) or stable_reads >= (stable_reads_required + 1):
-                            print(f"[DEBUG] {label} (stable): {val}")
-                            return val
-                    time.sleep(0.3)
-                # Timeout: return last seen value (may be '0' if truly zero or page failed to load fully)
-                print(f"[DEBUG] {label} (timeout, last='{last_val}')")
-                return last_val or ""
-
-            print("[DEBUG] Starting extraction...")
-
-            project_data['Total Units'] = get_li_value("Total Units")
-            project_data['Available Units'] = get_li_value("Available Units")
-            # Try multiple label variants for towers/blocks
-            def get_towers_blocks():
-                labels = [
-                    "Total No. of Towers/Blocks",
-                    "Total No. of Towers",
-                    "Total Towers",
-                    "Total Blocks",
-                    "Towers/Blocks",
-                    "Towers",
-                    "Blocks",
-                ]
-                for lbl in labels:
-                    v = get_li_value(lbl)
-                    if v:
-                        return v
-                return ""
-            project_data['Total No. of Towers/Blocks'] = get_towers_blocks()
-
-            print("[DEBUG] Extraction complete:", project_data)
-
-            # Extract Promoter Name
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'promoter name')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Promoter Name:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Promoter Name'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Promoter Type
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'promoter type')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Promoter Type:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Promoter Type'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Office Address
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'office address')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Office Address:-'
-                    idx = full_text.find(marker)
-                    if idx != -1:
-                        value = full_text[idx+len(marker):].strip()
-                        if not value and '\n' in full_text:
-                            lines = full_text.split('\n')
-                            for i, line in enumerate(lines):
-                                if marker in line:
-                                    if i+1 < len(lines):
-                                        value = lines[i+1].strip()
-                                    break
-                        if value:
-                            project_data['Office Address'] = value
-                        break
-                except Exception:
-                    continue
-            # Extract Partners (all numbered items after 'Partners:-'), each as its own column
-            td_elems = driver.find_elements(By.XPATH, "//td[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'partners')]")
-            for td in td_elems:
-                try:
-                    full_text = td.text.strip()
-                    marker = 'Partners:-'
-                    idx = full_text.find(marker)
-                    partners = []
-                    if idx != -1:
-                        # Get everything after 'Partners:-', split by lines
-                        after = full_text[idx+len(marker):].strip()
-                        lines = after.split('\n')
-                        for line in lines:
-                            # Match lines like '1. NAME ...' or '2. NAME ...'
-                            if line.strip() and (line.strip()[0].isdigit() and '.' in line):
-                                # Remove number and dot
-                                partner = line.split('.', 1)[1].strip()
-                                if partner:
-                                    partners.append(partner)
-                        # Add each partner to its own column
-                        for i, partner in enumerate(partners):
-                            project_data[f'Partner {i+1}'] = partner
-                        break
-                except Exception:
-                    continue
-    # Extract Type Details table rows (Unit Type, Block, Total Units)
-    # # Robustly extract the Type Details table by header content, not by label proximity
-    # try:
-    #     type_details_found = False
-    #     tables = driver.find_elements(By.XPATH, "//table")
-    #     for table in tables:
-    #         headers = table.find_elements(By.XPATH, ".//th")
-    #         header_texts = [th.text.strip().lower() for th in headers]
-    #         # Look for all required headers
-    #         if ('unit type' in header_texts and 'block' in header_texts and 'total units' in header_texts):
-    #             print(f"[DEBUG] Type Details table found with headers: {header_texts}")
-    #             rows = table.find_elements(By.XPATH, ".//tr")
-    #             if not rows or len(rows) < 2:
-    #                 print("[DEBUG] Type Details table is empty or has only header.")
-    #                 continue
-    #             headers = [th.text.strip() for th in rows[0].find_elements(By.XPATH, ".//th")]
-    #             print(f"[DEBUG] Headers found: {headers}")
-    #             for row in rows[1:]:
-    #                 cells = row.find_elements(By.XPATH, ".//td")
-    #                 if len(cells) == len(headers):
-    #                     row_dict = {headers[i]: cells[i].text.strip() for i in range(len(headers))}
-    #                     print(f"[DEBUG] Extracted row: {row_dict}")
-    #                     if any(row_dict.values()):
-    #                         type_details_rows.append(row_dict)
-    #             type_details_found = True
-    #             break
-    #     if not type_details_found:
-    #         print("[DEBUG] No Type Details table found with required headers.")
-    # except Exception as e:
-    #     print('Type Details extraction error:', e)
-    #     pass
-    
-            # ✅ Click on "Project Profile" tab
-            try:
-                project_profile_tab = wait.until(EC.element_to_be_clickable(
-                    (By.XPATH, "//a[contains(text(), 'Project Profile')]")
-                ))
-                project_profile_tab.click()
-                print("[DEBUG] Clicked 'Project Profile' tab.")
-            except Exception as e:
-                print(f"[DEBUG] Could not click Project Profile tab: {e}")
-
-            # ✅ Function to extract values from Project Profile
-            def get_project_profile_value(label_text):
-                """
-                Find a <li> in the <ul class='pd'> where the <p> contains the label_text,
-                then extract the number from its <strong> tag.
-                """
-                try:
-                    xpath = f"//ul[contains(@class, 'pd')]/li/p[contains(., '{label_text}')]/strong"
-                    el = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-                    val_text = el.text.strip()
-                    nums = re.findall(r'\d+', val_text)
-                    if nums:
-                        print(f"[DEBUG] {label_text}: {nums[0]}")
-                        return nums[0]
-                except Exception as e:
-                    print(f"[DEBUG] Could not extract {label_text}: {e}")
-                return ""
-
-            # ✅ Robust text extractor from Project Profile (handles value in <strong>, link, or next line)
-            def get_project_profile_text(label_text):
-                try:
-                    # 1) Locate all <p> that contain the label (case-insensitive) anywhere on the page
-                    p_xpath = (
-                        "//p["
-                        "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), "
-                        f"'{label_text.lower()}')"
-                        "]"
-                    )
-                    p_elements = driver.find_elements(By.XPATH, p_xpath)
-                    if not p_elements:
-                        p_el = wait.until(EC.presence_of_element_located((By.XPATH, p_xpath)))
-                        p_elements = [p_el]
-
-                    for p_el in p_elements:
-                        try:
-                            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", p_el)
-                        except Exception:
-                            pass
-
-                        # 2) Try value inside a descendant <strong>
-                        try:
-                            strong_el = p_el.find_element(By.XPATH, ".//strong")
-                            # Wait briefly for dynamic text to populate
-                            for _ in range(20):
-                                val_text = strong_el.text.strip()
-                                if val_text:
-                                    print(f"[DEBUG] {label_text} (strong): {val_text}")
-                                    return val_text
-                                try:
-                                    link = strong_el.find_element(By.XPATH, ".//a")
-                                    link_text = link.text.strip() or (link.get_attribute('href') or '').strip()
-                                    if link_text:
-                                        print(f"[DEBUG] {label_text} (strong->a): {link_text}")
-                                        return link_text
-                                except Exception:
-                                    pass
-                                time.sleep(0.25)
-                        except Exception:
-                            pass
+def open_profile_tab(driver, wait):
+    # ✅ Click on "Project Profile" tab
+    try:
+        project_profile_tab = wait.until(EC.element_to_be_clickable(
+            (By.XPATH, "//a[contains(text(), 'Project Profile')]")
+        ))
+        project_profile_tab.click()
+        print("[DEBUG] Clicked 'Project Profile' tab.")
+    except Exception as e:
+        print(f"[DEBUG] Could not click Project Profile tab: {e}")
 
-                        # 3) Try a following-sibling <strong>
-                        try:
-                            following_strong = p_el.find_element(By.XPATH, "following-sibling::strong[1]")
-                            for _ in range(20):
-                                val_text = following_strong.text.strip()
-                                if val_text:
-                                    print(f"[DEBUG] {label_text} (following-strong): {val_text}")
-                                    return val_text
-                                time.sleep(0.25)
-                        except Exception:
-                            pass
+    # ✅ Wait for <ul class="pd"> list to load
+    try:
+        wait.until(EC.presence_of_all_elements_located((By.XPATH, "//ul[contains(@class, 'pd')]/li")))
+        print("[DEBUG] Project Profile list loaded for extraction.")
+    except:
+        print("[DEBUG] Could not find Project Profile list. Values may be empty.")
 
-                        # 3b) Try any <a> within the <p>
-                        try:
-                            link = p_el.find_element(By.XPATH, ".//a")
-                            link_text = link.text.strip() or (link.get_attribute('href') or '').strip()
-                            if link_text:
-                                print(f"[DEBUG] {label_text} (p->a): {link_text}")
-                                return link_text
-                        except Exception:
-                            pass
 
-                        # 3c) Try any <span> within the <p>
-                        try:
-                            span_el = p_el.find_element(By.XPATH, ".//span")
-                            span_text = span_el.text.strip()
-                            if span_text:
-                                print(f"[DEBUG] {label_text} (p->span): {span_text}")
-                                return span_text
-                        except Exception:
-                            pass
+def open_promoters_tab(driver, wait):
+    # ✅ Click on "Promoters" tab
+    try:
+        promoters_tab = wait.until(EC.element_to_be_clickable(
+            (By.XPATH, "//a[contains(text(), 'Promoters')]")
+        ))
+        promoters_tab.click()
+        print("[DEBUG] Clicked 'Promoters' tab.")
+    except Exception as e:
+        print(f"[DEBUG] Could not click Promoters tab: {e}")
 
-                        # 3d) Try reading text node after <br> within the same <p> using JS (handles values not wrapped in tags)
-                        try:
-                            script = """
-                                const p = arguments[0];
-                                let afterBr = false;
-                                for (const node of p.childNodes) {
-                                    if (node.nodeName === 'BR') { afterBr = true; continue; }
-                                    if (!afterBr) { continue; }
-                                    if (node.nodeType === Node.TEXT_NODE) {
-                                        const t = (node.textContent || '').trim();
-                                        if (t) { return t; }
-                                    }
-                                    if (node.nodeType === Node.ELEMENT_NODE) {
-                                        const t = (node.innerText || node.textContent || '').trim();
-                                        if (t) { return t; }
-                                    }
-                                }
-                                return '';
-                            """
-                            js_val = driver.execute_script(script, p_el)
-                            if js_val:
-                                print(f"[DEBUG] {label_text} (p->after<br> text): {js_val}")
-                                return js_val.strip()
-                        except Exception:
-                            pass
+    # ✅ Wait for promoter details section to load
+    try:
+        wait.until(EC.presence_of_element_located(
+            (By.XPATH, "//h2[contains(text(), 'Promoter Details')]")
+        ))
+        print("[DEBUG] Promoter Details section loaded.")
+    except:
+        print("[DEBUG] Promoter Details section not detected — may be empty.")
+
+
+def scrape_project(driver, wait, project_index, total_projects, route=None, pincode=SEARCH_PINCODE):
+    """Open the project card at project_index and extract its combined row.
+
+    Returns None when the card is no longer present on the listing."""
+    if not open_project(driver, wait, project_index, total_projects, route):
+        return None
+
+    print('Extracting Project Name and RERA Registration Number...')
+    project_data = {
+        'Pincode': pincode,  # Add pincode column
+        'Project Name': '',
+        'RERA Reg. No.': '',
+        'Project Address': '',
+        'Project Type': '',
+        'About Property': '',
+        'Project Start Date': '',
+        'Project End Date': '',
+        'Project Land Area': '',
+        'Total Open Area': '',
+        'Total Covered Area': '',
+        'Carpet Area of Units (Range)': '',
+        'Plan Passing Authority': '',
+        'Amenities': '',
+        'Total Units': '',
+        'Available Units': '',
+        'Total No. of Towers/Blocks': '',
+        'Promoter Name': '',
+        'Promoter Type': '',
+        'Office Address': ''
+        # Partner columns will be added dynamically below
+    }
+
+    # Extract every labelled summary field (name, reg no, address, areas, dates, flags,
+    # financial and compliance rows, summary-page promoter/partners) in one round-trip
+    summary_data = summary_fields(snapshot_page(driver))
+    project_data.update(summary_data)
+    print(f"[DEBUG] Summary fields extracted in one pass: {len(summary_data)}")
+    # Amenities, Type Details (Unit Type and Block) and the Project Estimated Cost row in
+    # one round-trip; financial cells the snapshot found empty come from the cost row
+    apply_project_tables(project_data, read_tables(driver, PROJECT_TABLE_SPECS))
+
+    # Ensure financial and compliance keys exist so CSV gains headers even if values missing
+    for _k in view_columns('summary', 'strong_cell'):
+        if _k not in project_data:
+            project_data[_k] = ''
+
+    # Read the ul.pd numbers together once they have settled (one bounded in-page wait);
+    # numbers whose labels are not on this view are left to the Project Profile tab
+    print("[DEBUG] Starting extraction...")
+    targets = present_targets(driver, PROFILE_NUMBER_TARGETS)
+    if targets:
+        li_values = wait_for_li_values(driver, targets, 12.0, name='summary values settled')
+        for column, value in li_values.value.items():
+            project_data[column] = value
+            print(f"[DEBUG] {column} ({'stable' if li_values.ok else 'unsettled'}): {value}")
+
+    print("[DEBUG] Extraction complete:", project_data)
+
+    open_profile_tab(driver, wait)
+
+    # ✅ Store results: read the whole tab in one round-trip; numbers that had not
+    # rendered yet come from one settle wait on ul.pd, text labels from the pollers.
+    # One presence scan first, so labels this project does not have cost no waiting.
+    profile_data = profile_fields(snapshot_page(driver))
+    missing = {column: labels for column, labels in PROFILE_NUMBER_TARGETS.items() if not profile_data.get(column)}
+    missing_text = [label for label in PROFILE_TEXT_LABELS if not profile_data.get(label)]
+    presence = label_presence(driver, [l for labels in missing.values() for l in labels] + missing_text)
+    missing = {column: labels for column, labels in missing.items() if any(presence[l] for l in labels)}
+    if missing:
+        profile_data.update(wait_for_li_values(driver, missing, 20.0, name='profile values settled').value)
+    for label in PROFILE_NUMBER_TARGETS:
+        project_data[label] = profile_data.get(label, '')
+    # New profile fields
+    for label in PROFILE_TEXT_LABELS:
+        value = profile_data.get(label)
+        if not value and presence[label]:
+            value = get_project_profile_text(driver, label)
+        elif not value:
+            print(f"[DEBUG] {label}: label not on page, skipped")
+        project_data[label] = value or ''
+
+
+    open_promoters_tab(driver, wait)
+
+    # ✅ Extract promoter details (<p><strong>Label</strong><span>Value</span></p>) in one round-trip
+    try:
+        for key, value in promoter_fields(snapshot_page(driver)).items():
+            project_data[key] = value
+            print(f"[DEBUG] {key}: {value}")
+    except Exception as e:
+        print(f"[DEBUG] Could not extract promoter details: {e}")
 
-                        # 4) Parse the text content of the <p> to extract anything after the label
-                        try:
-                            text_block = p_el.get_attribute('innerText') or p_el.text
-                            text_block = (text_block or '').strip()
-                            # Remove label prefix on the first line if present
-                            # Example: "Project Status\nNew" or "Project Status New"
-                            lowered_label = label_text.lower()
-                            # Prefer next non-empty line after a line containing the label
-                            lines = [ln.strip() for ln in re.split(r"[\r\n]+", text_block)]
-                            lines = [ln for ln in lines if ln]
-                            if lines:
-                                label_idx = None
-                                for i, ln in enumerate(lines):
-                                    if lowered_label in ln.lower():
-                                        label_idx = i
-                                        break
-                                if label_idx is not None:
-                                    # Return first non-empty line after label line
-                                    for j in range(label_idx + 1, len(lines)):
-                                        candidate = lines[j].strip()
-                                        if candidate and candidate.lower() != lowered_label:
-                                            print(f"[DEBUG] {label_text} (p-lines next): {candidate}")
-                                            return candidate
-                                    # If same line also contains value (e.g., "Label : Value")
-                                    same_line = lines[label_idx]
-                                    same_line_val = re.sub(rf"^\s*{re.escape(label_text)}\s*[:\-]*\s*", "", same_line, flags=re.IGNORECASE).strip()
-                                    if same_line_val and same_line_val.lower() != lowered_label:
-                                        print(f"[DEBUG] {label_text} (p-same-line): {same_line_val}")
-                                        return same_line_val
-                                else:
-                                    # Label not found in split lines; try removing label prefix globally
-                                    stripped = re.sub(rf"^\s*{re.escape(label_text)}\s*[:\-]*\s*", "", text_block, flags=re.IGNORECASE).strip()
-                                    if stripped and stripped.lower() != lowered_label:
-                                        print(f"[DEBUG] {label_text} (p-strip-prefix): {stripped}")
-                                        return stripped
-                        except Exception:
-                            pass
+    # ✅ Extract Partners list (Name, Email Id, Mobile) from Promoters page
+    try:
+        # Find all containers that look like a person card (by presence of a Name label text);
+        # stamp the view once so the card XPaths below match on data-gr-lc
+        index_labels(driver)
+        card_xpath, signatory_xpath = partner_card_xpaths(lc_contains)
+        # Deduplicate by element id
+        seen_ids = set()
+        cards = []
+        for container in driver.find_elements(By.XPATH, card_xpath):
+            if container.id in seen_ids:
+                continue
+            seen_ids.add(container.id)
+            # Skip cards in the signatory column
+            if container.find_elements(By.XPATH, signatory_xpath):
+                continue
+            # Every label <p> of the card in one round-trip
+            cards.append(driver.execute_script(LABEL_PARTS_JS, container, partner_labels(), LABEL_PARTS) or {})
+
+        # Write into project_data as Partner 1/2/.. with "Name, Mobile, Email" cells
+        partners = partner_columns(cards)
+        project_data.update(partners)
+        if partners:
+            print(f"[DEBUG] Extracted {len(partners)} partner entries")
+        else:
+            print("[DEBUG] No partner entries found on Promoters page")
+    except Exception as e:
+        print(f"[DEBUG] Partners extraction error: {e}")
 
-                        # 5) Read the parent <li> text and try to split
-                        try:
-                            li_el = p_el.find_element(By.XPATH, "ancestor::li[1]")
-                            li_text = (li_el.get_attribute('innerText') or li_el.text or '').strip()
-                            lines = [ln.strip() for ln in re.split(r"[\r\n]+", li_text) if ln.strip()]
-                            for i, ln in enumerate(lines):
-                                if label_text.lower() in ln.lower() and i + 1 < len(lines):
-                                    candidate = lines[i + 1]
-                                    if candidate and candidate.lower() != label_text.lower():
-                                        print(f"[DEBUG] {label_text} (li-lines): {candidate}")
-                                        return candidate
-                            # 5b) Try the first strong under this li after the label
-                            try:
-                                strongs = li_el.find_elements(By.XPATH, ".//strong")
-                                for st in strongs:
-                                    txt = st.text.strip()
-                                    if txt:
-                                        print(f"[DEBUG] {label_text} (li->strong): {txt}")
-                                        return txt
-                            except Exception:
-                                pass
-                        except Exception:
-                            pass
 
-                    print(f"[DEBUG] {label_text}: value not found or empty.")
-                    # 6) Global page-text fallback using regex: capture text after label up to newline (or on next line)
-                    try:
-                        body_txt = driver.find_element(By.TAG_NAME, 'body').text or ''
-                        pattern = rf"{re.escape(label_text)}\s*[\:\-]*\s*(?:\r?\n)?\s*([^\r\n]{1,100})"
-                        m = re.search(pattern, body_txt, flags=re.IGNORECASE)
-                        if m:
-                            candidate = (m.group(1) or '').strip()
-                            candidate = re.sub(r"\s{2,}.*$", "", candidate)
-                            print(f"[DEBUG] {label_text} (body-regex): {candidate}")
-                            return candidate
-                    except Exception:
-                        pass
-                    return ""
-                except Exception as e:
-                    print(f"[DEBUG] Could not extract text for {label_text}: {e}")
-                    return ""
+    # ✅ Debug output
+    print("[DEBUG] Final Extracted Data:", project_data)
 
-            # ✅ Wait for <ul class="pd"> list to load
-            try:
-                wait.until(EC.presence_of_all_elements_located((By.XPATH, "//ul[contains(@class, 'pd')]/li")))
-                print("[DEBUG] Project Profile list loaded for extraction.")
-            except:
-                print("[DEBUG] Could not find Project Profile list. Values may be empty.")
-
-            # ✅ Store results
-            # project_data = {}
-            project_data['Total Units'] = get_project_profile_value("Total Units")
-            project_data['Available Units'] = get_project_profile_value("Available Units")
-            project_data['Total No. of Towers/Blocks'] = get_project_profile_value("Total No. of Towers/Blocks")
-            # New profile fields
-            project_data['Project Status'] = get_project_profile_text("Project Status")
-            project_data['Website'] = get_project_profile_text("Website")
-            project_data['Approved Date'] = get_project_profile_text("Approved Date")
-    
-    
-            # ✅ Click on "Promoters" tab
-            try:
-                promoters_tab = wait.until(EC.element_to_be_clickable(
-                    (By.XPATH, "//a[contains(text(), 'Promoters')]")
-                ))
-                promoters_tab.click()
-                print("[DEBUG] Clicked 'Promoters' tab.")
-            except Exception as e:
-                print(f"[DEBUG] Could not click Promoters tab: {e}")
+    combined_row = project_data.copy()
+    print(f"Extracted fields: {combined_row}")
+    return combined_row
 
-            # ✅ Wait for promoter details section to load
-            try:
-                wait.until(EC.presence_of_element_located(
-                    (By.XPATH, "//h2[contains(text(), 'Promoter Details')]")
-                ))
-                print("[DEBUG] Promoter Details section loaded.")
-            except:
-                print("[DEBUG] Promoter Details section not detected — may be empty.")
-
-            # ✅ Extract promoter details
-            promoter_fields = {
-                'Promoter Name': "//p[strong[contains(text(), 'Promoter Name')]]/span",
-                'Promoter Type': "//p[strong[contains(text(), 'Promoter Type')]]/span",
-                'Contact': "//p[strong[contains(text(), 'Contact')]]/span",
-                'Email Id': "//p[strong[contains(text(), 'Email Id')]]/span",
-                'Address': "//p[strong[contains(text(), 'Address')]]/span"
-            }
-
-            for key, xpath in promoter_fields.items():
-                try:
-                    elem = driver.find_element(By.XPATH, xpath)
-                    value = elem.text.strip()
-                    if value:
-                        project_data[key] = value
-                        print(f"[DEBUG] {key}: {value}")
-                except Exception as e:
-                    print(f"[DEBUG] Could not extract {key}: {e}")
-
-            # ✅ Extract Partners list (Name, Email Id, Mobile) from Promoters page
-            try:
-                # Find all containers that look like a person card (by presence of a Name label text)
-                person_containers = driver.find_elements(
-                    By.XPATH,
-                    (
-                        "//p[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'name')]/"
-                        "ancestor::div[contains(@class,'avCol') or contains(@class,'col-sm-12') or contains(@class,'col-md-') or contains(@class,'col-lg-')][1]"
-                    )
-                )
-                # Deduplicate by element id
-                seen_ids = set()
-                unique_containers = []
-                for c in person_containers:
-                    _id = c.id
-                    if _id not in seen_ids:
-                        unique_containers.append(c)
-                        seen_ids.add(_id)
-
-                # Identify signatory column to exclude from partners
-                signatory_col = None
-                try:
-                    signatory_heading = driver.find_element(By.XPATH, "//h2[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'signatory details')]")
-                    signatory_col = signatory_heading.find_element(By.XPATH, "ancestor::div[contains(@class,'col-') or contains(@class,'col-lg') or contains(@class,'col-sm')][1]")
-                except Exception:
-                    pass
 
-                partners = []
-                for container in unique_containers:
-                    # Skip if belongs to signatory column
-                    if signatory_col is not None:
-                        try:
-                            in_signatory = len(container.find_elements(By.XPATH, ".//ancestor::div[.//h2[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'signatory details')]]")) > 0
-                        except Exception:
-                            in_signatory = False
-                        if in_signatory:
-                            continue
-
-                    name = extract_label_from_container(container, 'Name')
-                    email = extract_label_from_container(container, 'Email') or extract_label_from_container(container, 'Email Id')
-                    mobile = extract_label_from_container(container, 'Mobile')
-                    if name or email or mobile:
-                        partners.append({'name': name, 'email': email, 'mobile': mobile})
-
-                # Write into project_data as Partner 1/2/.. with Name, Mobile, Email Id columns
-                for i, p in enumerate(partners, start=1):
-                    name = p.get('name', '').strip()
-                    mobile = p.get('mobile', '').strip()
-                    email = p.get('email', '').strip()
-                    if mobile:
-                        mobile = re.sub(r"\D+", "", mobile) or mobile
-                    # Compose single cell value: "Name, Mobile, Email"
-                    parts = [v for v in [name, mobile, email] if v]
-                    if parts:
-                        project_data[f'Partner {i}'] = ", ".join(parts)
-                if partners:
-                    print(f"[DEBUG] Extracted {len(partners)} partner entries")
-                else:
-                    print("[DEBUG] No partner entries found on Promoters page")
-            except Exception as e:
-                print(f"[DEBUG] Partners extraction error: {e}")
-
-
-            # ✅ Debug output
-            print("[DEBUG] Final Extracted Data:", project_data)
-
-            # Combine all Type Details into a single row for the project
-            import pandas as pd
-            combined_row = project_data.copy()
-            if type_details_rows:
-                # Find all unique type detail columns
-                type_keys = set()
-                for row in type_details_rows:
-                    type_keys.update(row.keys())
-                # For each column, join all values with '; '
-                for k in type_keys:
-                    values = [row.get(k, '') for row in type_details_rows if row.get(k, '')]
-                    if values:
-                        combined_row[k] = '; '.join(values)
-            print(f"Extracted fields: {combined_row}")
-            df = pd.DataFrame([combined_row])
-            append_unique_by_regno(df, 'ahmedabad_projects.csv')
-            print('Saved/updated ahmedabad_projects.csv')
-
-            # Go back to project listing for next card
-            try:
-                print('Returning to project listing...')
-                driver.execute_script('window.scrollTo(0, 0);')
-                time.sleep(1)
-                driver.back()
-                # Wait for any View More button to reappear
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.vmore.mb-2')))
-                time.sleep(2)
-            except Exception as nav_e:
-                print(f"[WARN] Could not navigate back cleanly: {nav_e}")
-                # Attempt recovery by going back again
-                try:
-                    driver.back()
-                    time.sleep(2)
-                except Exception:
-                    pass
+def return_to_listing(driver, wait):
+    # Go back to project listing for next card
+    try:
+        print('Returning to project listing...')
+        driver.execute_script('window.scrollTo(0, 0);')
+        settle(driver, 1, name='scroll')
+        driver.back()
+        # Wait for any View More button to reappear
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.vmore.mb-2')))
+        settle(driver, 2, name='listing after back')
+    except Exception as nav_e:
+        print(f"[WARN] Could not navigate back cleanly: {nav_e}")
+        # Attempt recovery by going back again
+        try:
+            driver.back()
+            settle(driver, 2, name='listing after back')
+        except Exception:
+            pass
+
+
+def capture_project(driver, wait, project_index, total_projects, route=None, snapshot_root='snapshots',
+                    pincode=SEARCH_PINCODE):
+    """Snapshot mode: save the summary, Project Profile and Promoters HTML of one project
+    without querying the DOM. Returns the project's snapshot directory."""
+    if not open_project(driver, wait, project_index, total_projects, route):
+        return None
+    project_dir = os.path.join(snapshot_root, f'{pincode}_project_{project_index + 1:04d}')
+    save_page_source(driver, project_dir, 'summary')
+    open_profile_tab(driver, wait)
+    save_page_source(driver, project_dir, 'profile')
+    open_promoters_tab(driver, wait)
+    save_page_source(driver, project_dir, 'promoters')
+    write_snapshot_meta(project_dir, {'Pincode': pincode, 'project_index': project_index})
+    print(f"[DEBUG] Saved project snapshot to {project_dir}")
+    return project_dir
+
+
+def scrape_project_network(driver, wait, project_index, total_projects, route=None, capture_root=None,
+                           pincode=SEARCH_PINCODE):
+    """JSON backend: build the row from the XHR responses behind the summary, Project
+    Profile and Promoters views. Fields the payloads do not carry come from one DOM
+    snapshot per view instead of per-label polling."""
+    drain_xhr_responses(driver)  # drop listing traffic
+    if not open_project(driver, wait, project_index, total_projects, route):
+        return None
+    dom_data = summary_fields(snapshot_page(driver))
+    open_profile_tab(driver, wait)
+    dom_data.update(profile_fields(snapshot_page(driver)))
+    open_promoters_tab(driver, wait)
+    dom_data.update(promoter_fields(snapshot_page(driver)))
+    captures = drain_xhr_responses(driver)
+    if capture_root:
+        save_captures(os.path.join(capture_root, f'{pincode}_project_{project_index + 1:04d}'), captures)
+    row = {'Pincode': pincode}
+    row.update(json_fields(captures))
+    from_json = len(row) - 1
+    for key, value in dom_data.items():
+        if value and not row.get(key):
+            row[key] = value
+    print(f"[DEBUG] {len(captures)} XHR payloads: {from_json} fields from JSON, "
+          f"{len(row) - 1 - from_json} from the DOM")
+    return row
+
+
+def project_scraper(args, pincode=None):
+    """Per-project callable for the configured mode, tagging rows with pincode
+    (default: --pincode)."""
+    pincode = pincode or args.pincode
+    if args.snapshot_dir:
+        return functools.partial(capture_project, snapshot_root=args.snapshot_dir, pincode=pincode)
+    if args.network:
+        return functools.partial(scrape_project_network, capture_root=args.capture_dir, pincode=pincode)
+    return functools.partial(scrape_project, pincode=pincode)
+
+
+def listing_routes(driver, args):
+    """Detail routes for every card on the loaded listing, or None to use the
+    click-and-return path. Deep links are only used when every card has one, since
+    after a direct navigation there is no listing left to click on."""
+    if args.no_deep_links:
+        return None
+    harvested = harvest_detail_routes(driver)
+    if harvested and all(c['route'] for c in harvested):
+        return harvested
+    print('[INFO] Not every card exposes a detail route; navigating via View More clicks.')
+    return None
+
+
+def process_projects(driver, wait, project_indices, total_projects, on_row, scrape=scrape_project, routes=None,
+                     metrics=None, journal=None, shard=None):
+    """Scrape each card in project_indices and hand every extracted row to on_row.
+    With metrics (a ProjectMetrics), each project's time and Chrome RSS are recorded.
+    With journal, cards already finished in shard are skipped (when the card is still
+    the same project) and each saved card is recorded. Returns the number of cards
+    finished (including skipped ones)."""
+    finished = 0
+    for project_index in project_indices:
+        route = route_at(routes, project_index)
+        if journal is not None and journal.is_recorded(shard, project_index):
+            if journal.is_done(shard, project_index, route, card_text_at(routes, driver, project_index)):
+                print(f"[INFO] Project {project_index + 1} already finished in a previous run; skipping.")
+                finished += 1
+                continue
+            print(f"[INFO] Card {project_index + 1} no longer matches the journal; scraping it again.")
+        try:
+            started = time.monotonic()
+            combined_row = scrape(driver, wait, project_index, total_projects, route=route)
+            if combined_row is None:
+                break
+            if metrics is not None:
+                metrics.record(driver, project_index, time.monotonic() - started)
+            on_row(combined_row)
+            finished += 1
+            if journal is not None:
+                reg_no = combined_row.get('RERA Reg. No.', '') if isinstance(combined_row, dict) else ''
+                journal.record_project(shard, project_index, reg_no, route=route)
+            if not route:
+                return_to_listing(driver, wait)
         except Exception as loop_e:
             print(f"[ERROR] Failed processing project {project_index + 1}: {loop_e}")
             traceback.print_exc()
+            if route:
+                # The next project is opened by its own route; nothing to recover
+                continue
             # Try to recover to listing and continue
             try:
                 driver.back()
                 wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.vmore.mb-2')))
-                time.sleep(2)
+                settle(driver, 2, name='listing after back')
             except Exception:
                 pass
+    return finished
+
+
+def save_row(combined_row, file_path=OUTPUT_CSV, store=None):
+    """Upsert one row straight into the store or CSV. A failed write raises;
+    process_projects then reports the project as failed and does not journal it."""
+    if store is not None:
+        if store.upsert_row(combined_row):
+            print(f'Saved/updated {store.path}')
+        return
+    df = pd.DataFrame([combined_row])
+    append_unique_by_regno(df, file_path)
+    print(f'Saved/updated {file_path}')
+
+
+def _row_reg_no(row, reg_col='RERA Reg. No.', alt_cols=REG_ALT_COLUMNS):
+    for col in (reg_col,) + tuple(alt_cols):
+        value = row.get(col)
+        if value is not None and not pd.isna(value) and str(value).strip():
+            return str(value).strip().upper()
+    return ''
 
-    # All projects processed
-    print('All project cards processed. Exiting...')
-    driver.quit()
-    exit(0)
-
-except Exception as e:
-    print('Navigation or filter selection failed:', e)
-    traceback.print_exc()
-    driver.save_screenshot('navigation_or_filter_error.png')
-    print('Screenshot saved as navigation_or_filter_error.png')
-    driver.quit()
-    exit(1)
-
-except Exception as e:
-    print('\nERROR during Selenium automation:')
-    print(str(e))
-    print('Full traceback:')
-    traceback.print_exc()
-    print('Taking screenshot for debugging...')
-    driver.save_screenshot('selenium_error_screenshot.png')
-    print('Screenshot saved as selenium_error_screenshot.png')
-    print('Browser will remain open for manual inspection. Press Enter to close...')
-    input()
-    driver.quit()
-    exit(1)
-
-projects = []
-
-try:
-    print('Locating project cards...')
-    # Find all project cards (update selector if needed)
-    cards = driver.find_elements(By.CSS_SELECTOR, 'div.card, .project-list-card, .mat-card')
-    print(f'Found {len(cards)} project cards.')
-    for idx in range(len(cards)):
+
+def save_rows(rows, file_path=OUTPUT_CSV, store=None, history=None):
+    """Write a batch of rows with one DataFrame (or one SQLite transaction). Rows that
+    share a reg no are merged first, earlier non-empty values winning, which is what
+    saving them one after another would have produced. With history, every row is
+    first compared with the previous scrape, in scrape order and at its own SCRAPED_AT
+    time (stamped by the buffer or raw log), so a value that changes between two rows
+    of the same batch is recorded too."""
+    keyed = []
+    for row in rows:
+        row = dict(row)
+        scraped_at = row.pop(SCRAPED_AT, None)
+        key = _row_reg_no(row)
+        if not key:
+            print(f"[WARN] Missing 'RERA Reg. No.'; skipping row for {row.get('Project Name', 'unknown project')}.")
+            continue
+        keyed.append((key, row, scraped_at))
+    if not keyed:
+        return
+    if history is not None:
+        history.observe_rows([dict(row, **{'RERA Reg. No.': key}) for key, row, _ in keyed],
+                             [scraped_at for _, _, scraped_at in keyed])
+    merged = {}
+    for key, row, _ in keyed:
+        if key not in merged:
+            merged[key] = dict(row)
+            continue
+        target = merged[key]
+        for col, value in row.items():
+            current = target.get(col)
+            if current is None or pd.isna(current) or str(current).strip() == '':
+                target[col] = value
+    if store is not None:
+        store.upsert_rows(merged.values())
+        print(f'Saved/updated {len(merged)} rows in {store.path}')
+        return
+    append_unique_by_regno(pd.DataFrame(list(merged.values())), file_path)
+    print(f'Saved/updated {len(merged)} rows in {file_path}')
+
+
+def save_result(result, file_path=OUTPUT_CSV, store=None, buffer=None):
+    """Write one worker result: an extracted row, or a snapshot directory to parse first.
+    With buffer, the row is queued for the next batch flush instead."""
+    if isinstance(result, str):
+        result = parse_snapshot(result)
+    if buffer is not None:
+        buffer.add(result)
+        return
+    save_row(result, file_path, store)
+
+
+def open_store(args):
+    """ProjectStore for --db, or None to upsert straight into OUTPUT_CSV."""
+    if not args.db:
+        return None
+    return ProjectStore(args.db, DISALLOWED_COLUMNS)
+
+
+def close_store(store):
+    if store is None:
+        return
+    print(f'{store.count()} projects in {store.path}. Export with: python gujrera_store.py {store.path} {OUTPUT_CSV}')
+    store.close()
+
+
+def open_history(args):
+    """FieldHistory for --history, or None."""
+    if not args.history:
+        return None
+    return FieldHistory(args.history)
+
+
+def open_buffer(args, store, history=None):
+    """Write-behind buffer that flushes batches to the store (or OUTPUT_CSV) every
+    --flush-rows rows or --flush-seconds seconds. Unflushed rows survive a crash in a
+    per-process spill file next to the output and are written at the start of the next
+    run.
+    With --raw-log, rows are appended to that log instead and compacted into the
+    store (or OUTPUT_CSV) by a background thread every --compact-seconds."""
+    if args.raw_log:
+        return RawRecordLog(args.raw_log, functools.partial(save_rows, store=store, history=history), shard=args.pincode,
+                            interval=args.compact_seconds)
+    spill_base = (store.path if store is not None else OUTPUT_CSV) + '.spill'
+    return RowWriteBuffer(functools.partial(save_rows, store=store, history=history), spill_base,
+                          max_rows=args.flush_rows, max_seconds=args.flush_seconds)
+
+
+def close_writer(buffer, store, parquet_path=None, history=None):
+    """Flush the buffer, refresh the --parquet copy from the output and close the store
+    (and the history)."""
+    buffer.close()
+    if parquet_path:
         try:
-            # Re-locate all cards after each navigation to avoid stale elements
-            cards = driver.find_elements(By.CSS_SELECTOR, 'div.card, .project-list-card, .mat-card, .col-md-2')
-            card = cards[idx]
-            view_more = card.find_element(By.XPATH, ".//a[contains(text(), 'View More') or contains(text(), 'Details')]")
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", view_more)
-            view_more.click()
-            # Wait for the details page to load (wait for a known field)
-            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Project Name') or contains(text(), 'Registration') or contains(text(), 'Promoter') or contains(text(), 'Builder') or contains(text(), 'Address') or contains(text(), 'Locality') or contains(text(), 'Unit') or contains(text(), 'Price') or contains(text(), 'Completion') or contains(text(), 'Status') or contains(text(), 'Start Date') or contains(text(), 'End Date') or contains(text(), 'Available') or contains(text(), 'Sold') or contains(text(), 'Type') or contains(text(), 'RERA') or contains(text(), 'Reg No') or contains(text(), 'Date') or contains(text(), 'Status') or contains(text(), 'Type') or contains(text(), 'Unit') or contains(text(), 'Price') or contains(text(), 'Promoter') or contains(text(), 'Builder') or contains(text(), 'Address') or contains(text(), 'Locality') or contains(text(), 'Unit') or contains(text(), 'Price') or contains(text(), 'Completion') or contains(text(), 'Status') or contains(text(), 'Start Date') or contains(text(), 'End Date') or contains(text(), 'Available') or contains(text(), 'Sold') or contains(text(), 'Type') or contains(text(), 'RERA') or contains(text(), 'Reg No') or contains(text(), 'Date') or contains(text(), 'Status') or contains(text(), 'Type') or contains(text(), 'Unit') or contains(text(), 'Price')]")))
-            # Extract all required fields from the details page
-            project = {}
-            def extract_detail(label_keywords):
-                for kw in label_keywords:
-                    try:
-                        el = driver.find_element(By.XPATH, f"//*[contains(text(), '{kw}')]")
-                        txt = el.text
-                        # Try to get the value after ':'
-                        if ':' in txt:
-                            return txt.split(':', 1)[-1].strip()
-                        else:
-                            return txt.strip()
-                    except Exception:
-                        continue
-                return ''
-            project['Project Name'] = extract_detail(['Project Name'])
-            project['RERA Reg Number'] = extract_detail(['Registration No', 'RERA No', 'Reg No'])
-            project['Promoter'] = extract_detail(['Promoter', 'Builder'])
-            project['Address'] = extract_detail(['Address'])
-            project['Locality'] = extract_detail(['Locality', 'Location'])
-            project['Unit Types'] = extract_detail(['Unit Type', 'Type of Unit'])
-            project['Available Units'] = extract_detail(['Available Unit', 'Available Units'])
-            project['Sold Units'] = extract_detail(['Sold Unit', 'Sold Units'])
-            project['Price per Unit'] = extract_detail(['Price'])
-            project['Registration Date'] = extract_detail(['Registration Date', 'Start Date'])
-            project['Completion Status'] = extract_detail(['Status', 'Completion'])
-            projects.append(project)
-            print(f'Extracted: {project}')
-            # Go back to the project list
-            driver.back()
-            # Wait for cards to reload
-            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, "//a[contains(text(), 'View More') or contains(text(), 'Details')]")))
-            time.sleep(1)
+            export_parquet(store.path if store is not None else OUTPUT_CSV, parquet_path, _order_columns)
         except Exception as e:
-            print(f'Error extracting project card #{idx+1}:', e)
-            traceback.print_exc()
+            print(f"[WARN] Parquet export to {parquet_path} failed: {e}")
+    close_store(store)
+    if history is not None:
+        history.close()
+
+
+def project_metrics(args, worker_id=None):
+    """ProjectMetrics for --measure, one file per worker so processes never share a file."""
+    if not args.measure:
+        return None
+    path = args.measure
+    if worker_id is not None:
+        root, ext = os.path.splitext(path)
+        path = f'{root}_worker{worker_id}{ext or ".csv"}'
+    return ProjectMetrics(path, args.profile)
+
+
+def run_serial(args):
+    journal = CheckpointJournal(args.journal, fresh=args.fresh)
+    store = open_store(args)
+    history = open_history(args)
+    buffer = open_buffer(args, store, history)
+    driver = create_driver(args.profile, network_capture=args.network)
+    wait = WebDriverWait(driver, 20)
+    actions = ActionChains(driver)
+    open_home(driver)
+    complete = False
+    try:
+        total_projects = load_project_listing(driver, wait, actions, args.pincode)
+        routes = listing_routes(driver, args)
+        finished = process_projects(driver, wait, range(total_projects), total_projects,
+                                    functools.partial(save_result, buffer=buffer),
+                                    scrape=project_scraper(args), routes=routes, metrics=project_metrics(args),
+                                    journal=journal, shard=args.pincode)
+        complete = finished == total_projects
+        # All projects processed
+        print('All project cards processed. Exiting...')
+        print_wait_summary()
+        driver.quit()
+        return 0
+    except Exception as e:
+        print('Navigation or filter selection failed:', e)
+        traceback.print_exc()
+        driver.save_screenshot('navigation_or_filter_error.png')
+        print('Screenshot saved as navigation_or_filter_error.png')
+        driver.quit()
+        return 1
+    finally:
+        close_writer(buffer, store, args.parquet, history)
+        if complete:
+            journal.complete()
+
+
+def run_http(args):
+    """Browser builds the listing and reads the detail routes; project payloads are then
+    fetched over HTTP. Projects without an id or whose fetch fails are scraped in the
+    browser as before."""
+    journal = CheckpointJournal(args.journal, fresh=args.fresh)
+    store = open_store(args)
+    history = open_history(args)
+    buffer = open_buffer(args, store, history)
+    driver = create_driver(args.profile, network_capture=args.network)
+    wait = WebDriverWait(driver, 20)
+    actions = ActionChains(driver)
+    open_home(driver)
+    complete = False
+    try:
+        total_projects = load_project_listing(driver, wait, actions, args.pincode)
+        harvested = harvest_detail_routes(driver)
+        project_ids = {}
+        todo = [i for i in range(total_projects)
+                if not journal.is_done(args.pincode, i, route_at(harvested, i), card_text_at(harvested, driver, i))]
+        for project_index in todo:
+            project_id = project_id_from_route(route_at(harvested, project_index))
+            if project_id:
+                project_ids[project_index] = project_id
+        print(f"[INFO] Fetching {len(project_ids)} of {total_projects} projects over HTTP "
+              f"({args.http_workers} concurrent requests)...")
+        fallback = [i for i in todo if i not in project_ids]
+        for project_index, row in fetch_projects(project_ids, args.http_endpoint, workers=args.http_workers):
+            if row is None:
+                fallback.append(project_index)
+                continue
+            row['Pincode'] = args.pincode
+            save_result(row, buffer=buffer)
+            journal.record_project(args.pincode, project_index, row.get('RERA Reg. No.', ''),
+                                   route=route_at(harvested, project_index))
+        if fallback:
+            print(f"[INFO] Scraping {len(fallback)} projects in the browser (no id or HTTP fetch failed).")
+            process_projects(driver, wait, sorted(fallback), total_projects,
+                             functools.partial(save_result, buffer=buffer),
+                             scrape=project_scraper(args), routes=listing_routes(driver, args),
+                             metrics=project_metrics(args), journal=journal, shard=args.pincode)
+        complete = all(journal.is_done(args.pincode, i, route_at(harvested, i), card_text_at(harvested, driver, i))
+                       for i in range(total_projects))
+        print('All project cards processed. Exiting...')
+        driver.quit()
+        return 0
+    except Exception as e:
+        print('Navigation or filter selection failed:', e)
+        traceback.print_exc()
+        driver.quit()
+        return 1
+    finally:
+        close_writer(buffer, store, args.parquet, history)
+        if complete:
+            journal.complete()
+
 
-    print(f'Extracted {len(projects)} projects.')
-except Exception as e:
-    print('Error extracting project cards:', e)
-    traceback.print_exc()
+# Worker pool: each worker drives its own Chrome session over a shard of the cards
+# (card indices worker_id, worker_id + N, ...) and sends rows to the parent, which is
+# the only process that writes the CSV.
+_WORKER_DONE = '__worker_done__'
 
-# Export to CSV
-if projects:
-    df = pd.DataFrame(projects)
-    append_unique_by_regno(df, 'ahmedabad_projects.csv')
-    print('Saved/updated ahmedabad_projects.csv')
-else:
-    print('No projects found.')
 
-driver.quit()
+def run_worker(worker_id, args, result_queue):
+    driver = None
+    complete = False
+    try:
+        driver = create_driver(args.profile, network_capture=args.network)
+        wait = WebDriverWait(driver, 20)
+        actions = ActionChains(driver)
+        open_home(driver)
+        total_projects = load_project_listing(driver, wait, actions, args.pincode)
+        shard = range(worker_id, total_projects, args.workers)
+        print(f"[worker {worker_id}] Processing {len(shard)} of {total_projects} project cards.")
+        routes = listing_routes(driver, args)
+        finished = process_projects(driver, wait, shard, total_projects, result_queue.put,
+                                    scrape=project_scraper(args), routes=routes,
+                                    metrics=project_metrics(args, worker_id),
+                                    journal=QueueJournal(args.journal, result_queue), shard=args.pincode)
+        complete = finished == len(shard)
+    except Exception as e:
+        print(f"[worker {worker_id}] Navigation or filter selection failed: {e}")
+        traceback.print_exc()
+        if driver is not None:
+            driver.save_screenshot(f'navigation_or_filter_error_worker{worker_id}.png')
+    finally:
+        print_wait_summary()
+        if driver is not None:
+            driver.quit()
+        result_queue.put((_WORKER_DONE, worker_id, complete))
+
+
+def collect_results(workers, result_queue, journal, buffer):
+    """Single writer: save every row the worker processes put on result_queue until
+    each has sent its done marker (or all of them have died). Journal records from the
+    workers arrive after the row they refer to and are written once it is saved.
+    Returns (rows saved, whether every worker reported finishing all its cards)."""
+    num_workers = len(workers)
+    finished = 0
+    saved = 0
+    complete = True
+    while finished < num_workers:
+        try:
+            item = result_queue.get(timeout=5)
+        except queue.Empty:
+            # A worker killed outright never sends its done marker
+            if not any(w.is_alive() for w in workers):
+                print('[WARN] All workers exited without reporting completion.')
+                complete = False
+                break
+            continue
+        if isinstance(item, tuple) and item and item[0] == _WORKER_DONE:
+            finished += 1
+            complete = complete and item[2]
+            print(f"[INFO] Worker {item[1]} finished ({finished}/{num_workers}).")
+            continue
+        if isinstance(item, tuple) and item and item[0] == QueueJournal.MARKER:
+            apply_queued_record(journal, item)
+            continue
+        save_result(item, buffer=buffer)
+        saved += 1
+    for w in workers:
+        w.join()
+    return saved, complete
+
+
+def run_pool(args):
+    journal = CheckpointJournal(args.journal, fresh=args.fresh)
+    store = open_store(args)
+    history = open_history(args)
+    buffer = open_buffer(args, store, history)
+    result_queue = mp.Queue()
+    workers = [mp.Process(target=run_worker, args=(i, args, result_queue), name=f'gujrera-worker-{i}')
+               for i in range(args.workers)]
+    for w in workers:
+        w.start()
+    saved, complete = collect_results(workers, result_queue, journal, buffer)
+    close_writer(buffer, store, args.parquet, history)
+    print(f'All workers finished. {saved} project rows written.')
+    if complete:
+        journal.complete()
+    return 0 if all(w.exitcode == 0 for w in workers) else 1
+
+
+# Pincode shards: one crawl task per pincode in the localities workbook. Each worker
+# process keeps one Chrome session and takes pincodes off a shared task queue until it
+# is empty; rows go to the parent, which is the only process that writes the CSV.
+def load_pincodes(xlsx_path=PINCODES_XLSX):
+    """Unique pincodes (as strings, workbook order) from the 'Pincode' column."""
+    df = pd.read_excel(xlsx_path)
+    pincodes = []
+    for value in df['Pincode'].dropna():
+        try:
+            pincode = str(int(float(value)))
+        except (TypeError, ValueError):
+            pincode = str(value).strip()
+        if pincode and pincode not in pincodes:
+            pincodes.append(pincode)
+    return pincodes
+
+
+def crawl_pincode(driver, wait, actions, args, pincode, on_row, metrics=None, journal=None):
+    print(f"\n=== Pincode {pincode} ===")
+    open_home(driver)
+    total_projects = load_project_listing(driver, wait, actions, pincode)
+    routes = listing_routes(driver, args)
+    finished = process_projects(driver, wait, range(total_projects), total_projects, on_row,
+                                scrape=project_scraper(args, pincode), routes=routes, metrics=metrics,
+                                journal=journal, shard=pincode)
+    if journal is not None and finished == total_projects:
+        journal.record_shard_done(pincode)
+    return total_projects
+
+
+def run_shard_worker(worker_id, args, task_queue, result_queue):
+    driver = None
+    try:
+        driver = create_driver(args.profile, network_capture=args.network)
+        wait = WebDriverWait(driver, 20)
+        actions = ActionChains(driver)
+        metrics = project_metrics(args, worker_id)
+        journal = QueueJournal(args.journal, result_queue)
+        while True:
+            pincode = task_queue.get()
+            if pincode is None:
+                break
+            try:
+                total_projects = crawl_pincode(driver, wait, actions, args, pincode, result_queue.put, metrics, journal)
+                print(f"[worker {worker_id}] Pincode {pincode}: {total_projects} project cards processed.")
+            except Exception as e:
+                print(f"[worker {worker_id}] Pincode {pincode} failed: {e}")
+                traceback.print_exc()
+                driver.save_screenshot(f'navigation_or_filter_error_{pincode}.png')
+    except Exception as e:
+        print(f"[worker {worker_id}] Could not start browser: {e}")
+        traceback.print_exc()
+    finally:
+        print_wait_summary()
+        if driver is not None:
+            driver.quit()
+        # Completion is judged by the parent from the shard_done records
+        result_queue.put((_WORKER_DONE, worker_id, True))
+
+
+def run_sharded(args):
+    journal = CheckpointJournal(args.journal, fresh=args.fresh)
+    all_pincodes = load_pincodes(args.pincodes_xlsx)
+    pincodes = [p for p in all_pincodes if not journal.is_shard_done(p)]
+    if not pincodes:
+        print('[INFO] Every pincode shard is already finished in the journal.')
+        journal.complete()
+        return 0
+    num_workers = max(1, min(args.workers, len(pincodes)))
+    store = open_store(args)
+    history = open_history(args)
+    buffer = open_buffer(args, store, history)
+    print(f'[INFO] {len(pincodes)} unfinished pincode shards from {args.pincodes_xlsx} across {num_workers} processes.')
+    task_queue = mp.Queue()
+    for pincode in pincodes:
+        task_queue.put(pincode)
+    for _ in range(num_workers):
+        task_queue.put(None)
+    result_queue = mp.Queue()
+    workers = [mp.Process(target=run_shard_worker, args=(i, args, task_queue, result_queue),
+                          name=f'gujrera-shard-{i}')
+               for i in range(num_workers)]
+    for w in workers:
+        w.start()
+    saved, _ = collect_results(workers, result_queue, journal, buffer)
+    close_writer(buffer, store, args.parquet, history)
+    print(f'All pincode shards finished. {saved} project rows written.')
+    if all(journal.is_shard_done(p) for p in all_pincodes):
+        journal.complete()
+    return 0 if all(w.exitcode == 0 for w in workers) else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape Gujarat RERA projects for Ahmedabad.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of parallel Chrome sessions (default: 1, serial)')
+    parser.add_argument('--db', default=None, metavar='SQLITE',
+                        help=f'upsert rows into this SQLite store instead of rewriting {OUTPUT_CSV} per project '
+                             '(export with gujrera_store.py)')
+    parser.add_argument('--parquet', default=None, metavar='PATH',
+                        help='also write a typed Parquet copy of the output here at the end of the run (needs pyarrow)')
+    parser.add_argument('--history', default=None, metavar='SQLITE',
+                        help='record (reg no, field, old, new, time) here whenever a re-scrape sees a changed value '
+                             '(query with gujrera_history.py)')
+    parser.add_argument('--flush-rows', type=int, default=25,
+                        help='write buffered rows every N projects (default: 25; 1 writes each project immediately)')
+    parser.add_argument('--flush-seconds', type=float, default=30.0,
+                        help='also write buffered rows at least this often (default: 30)')
+    parser.add_argument('--raw-log', default=None, metavar='JSONL',
+                        help='append each row to this log and fold it into the output in the background '
+                             '(compact by hand with gujrera_rawlog.py)')
+    parser.add_argument('--compact-seconds', type=float, default=60.0,
+                        help='with --raw-log, compact new log lines this often (default: 60)')
+    parser.add_argument('--journal', default=JOURNAL_PATH,
+                        help=f'checkpoint journal of finished projects; a restarted run resumes from it, and it is '
+                             f'moved to <journal>.done once a run finishes every card (default: {JOURNAL_PATH})')
+    parser.add_argument('--fresh', action='store_true',
+                        help='ignore the existing journal (kept as .bak) and crawl everything again')
+    parser.add_argument('--pincode', default=SEARCH_PINCODE,
+                        help=f'pincode to search for (default: {SEARCH_PINCODE})')
+    parser.add_argument('--pincodes-xlsx', nargs='?', const=PINCODES_XLSX, default=None, metavar='XLSX',
+                        help=f'crawl every pincode in this workbook (default: {PINCODES_XLSX}), '
+                             'one shard per pincode spread over --workers processes')
+    parser.add_argument('--snapshot-dir', default=None,
+                        help='save each project\'s page HTML here and parse it offline instead of querying the live DOM')
+    parser.add_argument('--no-deep-links', action='store_true',
+                        help='always open projects by clicking View More and returning to the listing')
+    parser.add_argument('--network', action='store_true',
+                        help='build rows from the site\'s XHR JSON responses (DOM only fills the gaps)')
+    parser.add_argument('--capture-dir', default=None,
+                        help='with --network, also save each project\'s XHR payloads here for replay')
+    parser.add_argument('--http-endpoint', action='append', default=None, metavar='TEMPLATE',
+                        help='detail endpoint URL with a {project_id} placeholder (repeatable); fetch projects '
+                             'over HTTP and use the browser only for the listing and failed fetches')
+    parser.add_argument('--http-workers', type=int, default=DEFAULT_HTTP_WORKERS,
+                        help=f'concurrent HTTP requests with --http-endpoint (default: {DEFAULT_HTTP_WORKERS})')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default=None,
+                        help='browser profile: headed (debugging) or production (headless, no images/fonts/media); '
+                             'defaults to $GUJRERA_BROWSER_PROFILE or headed')
+    parser.add_argument('--measure', metavar='CSV', default=None,
+                        help='append per-project time and Chrome RSS to this CSV (summarise with gujrera_browser.py)')
+    args = parser.parse_args()
+    if args.pincodes_xlsx:
+        return run_sharded(args)
+    if args.http_endpoint:
+        return run_http(args)
+    if args.workers > 1:
+        return run_pool(args)
+    return run_serial(args)
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,80 @@
+"""Tests for the checkpoint journal: resuming, skipping only cards that are still the
+same project, and starting over once a crawl has finished."""
+
+import json
+import queue
+
+from gujrera_checkpoint import CheckpointJournal, QueueJournal, apply_queued_record
+from scrape_gujrera_ahmedabad import process_projects
+
+REG_A = 'PR/GJ/AHMEDABAD/AHMEDABAD CITY/AUDA/RAA12775/160124/300628'
+REG_B = 'PR/GJ/AHMEDABAD/AHMEDABAD CITY/AUDA/CAA05198/020419'
+ROUTE_A = 'https://gujrera.gujarat.gov.in/#/project-preview/101'
+ROUTE_B = 'https://gujrera.gujarat.gov.in/#/project-preview/102'
+
+
+def test_resume_matches_route_or_card_reg_no(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = CheckpointJournal(path)
+    journal.record_project('380001', 0, REG_A, route=ROUTE_A)
+    journal.record_project('380001', 1, REG_B)
+    journal.record_shard_done('380002')
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write('{"event": "project", "shard": "380001", "ind')  # torn by a crash
+
+    resumed = CheckpointJournal(path)
+    assert resumed.is_recorded('380001', 0) and resumed.is_recorded('380001', 1)
+    assert resumed.is_done('380001', 0, route=ROUTE_A)
+    assert not resumed.is_done('380001', 0, route=ROUTE_B)
+    # Without a route, the recorded reg no must be on the card (whitespace and case aside)
+    assert resumed.is_done('380001', 1, card_text=f'Shanti Residency\nReg No: {REG_B.lower()}')
+    assert not resumed.is_done('380001', 1, card_text=f'Other project\nReg No: {REG_A}')
+    assert not resumed.is_done('380001', 1)
+    assert not resumed.is_done('380001', 2, route=ROUTE_A)
+    assert resumed.is_shard_done('380002')
+    # The torn line was terminated, so new records stay readable
+    resumed.record_project('380001', 2, REG_A, route=ROUTE_A)
+    assert CheckpointJournal(path).is_done('380001', 2, route=ROUTE_A)
+
+
+def test_complete_moves_journal_aside(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = CheckpointJournal(path)
+    journal.record_project('380001', 0, REG_A, route=ROUTE_A)
+    journal.complete()
+    assert not journal.is_recorded('380001', 0)
+    assert not CheckpointJournal(path).is_recorded('380001', 0)
+    with open(path + '.done', encoding='utf-8') as fh:
+        assert json.loads(fh.readline())['route'] == ROUTE_A
+
+
+def test_queue_journal_forwards_routes(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    result_queue = queue.Queue()
+    QueueJournal(path, result_queue).record_project('380001', 3, REG_B, route=ROUTE_B)
+    journal = CheckpointJournal(path)
+    apply_queued_record(journal, result_queue.get_nowait())
+    assert journal.is_done('380001', 3, route=ROUTE_B)
+
+
+def test_process_projects_skips_only_unchanged_cards(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / 'journal.jsonl'))
+    journal.record_project('380001', 0, REG_A, route=ROUTE_A)
+    journal.record_project('380001', 1, REG_B, route=ROUTE_B)
+    # The listing gained a card at the top: B is still at index 1, index 0 is new
+    new_route = 'https://gujrera.gujarat.gov.in/#/project-preview/103'
+    routes = [{'route': new_route, 'card_text': ''}, {'route': ROUTE_B, 'card_text': ''},
+              {'route': ROUTE_A, 'card_text': ''}]
+    scraped = []
+
+    def scrape(driver, wait, project_index, total_projects, route=None):
+        scraped.append(route)
+        return {'RERA Reg. No.': f'REG{project_index}', 'Project Name': route}
+
+    rows = []
+    finished = process_projects(None, None, range(3), 3, rows.append, scrape=scrape, routes=routes,
+                                journal=journal, shard='380001')
+    assert finished == 3
+    assert scraped == [new_route, ROUTE_A]
+    assert [row['Project Name'] for row in rows] == [new_route, ROUTE_A]
+    assert all(journal.is_done('380001', i, route=routes[i]['route']) for i in range(3))
@@ -0,0 +1,181 @@
+"""Tests for the HTTP backend against a local mock server: field mapping, connection
+reuse, retry/backoff on transient errors and the browser fallback (a None row)."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gujrera_http import (
+    RETRY_STATUSES,
+    check_against_replay,
+    endpoints_from_captures,
+    fetch_project,
+    fetch_projects,
+    make_session,
+    project_id_from_route,
+)
+from gujrera_network import save_captures
+
+DETAIL = {'data': {'projectName': 'Shanti Residency', 'projectRegNo': 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120',
+                   'totalUnits': 120, 'availableUnits': 18}}
+PROMOTER = {'promoterName': 'Shanti Developers', 'promoterType': 'Partnership Firm'}
+
+EXPECTED_ROW = {
+    'Project Name': 'Shanti Residency',
+    'RERA Reg. No.': 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120',
+    'Total Units': '120',
+    'Available Units': '18',
+    'Promoter Name': 'Shanti Developers',
+    'Promoter Type': 'Partnership Firm',
+}
+
+
+class MockPortal:
+    """Local stand-in for the detail endpoints. routes maps a path to a list of
+    (status, content type, body) answers served in turn (the last one repeats)."""
+
+    def __init__(self, routes):
+        self.routes = {path: list(answers) for path, answers in routes.items()}
+        self.requests = []  # (path, client port)
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+
+            def do_GET(self):
+                portal.requests.append((self.path, self.client_address[1]))
+                answers = portal.routes.get(self.path) or [(404, 'text/plain', 'not found')]
+                status, content_type, body = answers.pop(0) if len(answers) > 1 else answers[0]
+                payload = (json.dumps(body) if content_type == 'application/json' else body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def endpoints(self):
+        return [self.base + '/api/project/{project_id}', self.base + '/api/promoter/{project_id}']
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _ok(body):
+    return [(200, 'application/json', body)]
+
+
+@pytest.fixture
+def portal():
+    portals = []
+
+    def start(routes):
+        p = MockPortal(routes)
+        portals.append(p)
+        return p
+
+    yield start
+    for p in portals:
+        p.close()
+
+
+def test_fetch_project_maps_fields(portal):
+    mock = portal({'/api/project/11': _ok(DETAIL), '/api/promoter/11': _ok(PROMOTER)})
+    with make_session(pool_size=1) as session:
+        assert fetch_project(session, mock.endpoints(), '11') == EXPECTED_ROW
+
+
+def test_fetch_projects_yields_every_index(portal):
+    routes = {}
+    for pid in ('11', '12', '13'):
+        routes[f'/api/project/{pid}'] = _ok({'projectName': f'Project {pid}', 'projectRegNo': f'REG{pid}'})
+        routes[f'/api/promoter/{pid}'] = _ok(PROMOTER)
+    mock = portal(routes)
+    rows = dict(fetch_projects({0: '11', 4: '12', 9: '13'}, mock.endpoints(), workers=2))
+    assert sorted(rows) == [0, 4, 9]
+    assert rows[4]['RERA Reg. No.'] == 'REG12'
+    assert rows[9]['Project Name'] == 'Project 13'
+
+
+def test_session_reuses_one_connection(portal):
+    mock = portal({'/api/project/11': _ok(DETAIL), '/api/promoter/11': _ok(PROMOTER)})
+    with make_session(pool_size=1) as session:
+        for _ in range(3):
+            fetch_project(session, mock.endpoints(), '11')
+    assert len(mock.requests) == 6
+    assert len({port for _path, port in mock.requests}) == 1
+
+
+def test_session_retry_configuration():
+    with make_session(retries=3) as session:
+        retry = session.get_adapter('https://gujrera.gujarat.gov.in/').max_retries
+    assert retry.total == 3
+    assert retry.backoff_factor == 0.5
+    assert set(retry.status_forcelist) == set(RETRY_STATUSES)
+    assert {'GET', 'POST'} <= set(retry.allowed_methods)
+
+
+def test_transient_errors_are_retried(portal):
+    mock = portal({
+        '/api/project/11': [(503, 'text/plain', 'busy'), (502, 'text/plain', 'bad gateway'),
+                            (200, 'application/json', DETAIL)],
+        '/api/promoter/11': _ok(PROMOTER),
+    })
+    start = time.monotonic()
+    rows = dict(fetch_projects({0: '11'}, mock.endpoints(), workers=1))
+    elapsed = time.monotonic() - start
+    assert rows[0] == EXPECTED_ROW
+    assert [path for path, _port in mock.requests].count('/api/project/11') == 3
+    # Backoff: no delay before the first retry, backoff_factor * 2 before the second
+    assert elapsed >= 0.9
+
+
+@pytest.mark.parametrize('answers', [
+    [(500, 'text/plain', 'server error')],                   # retries exhausted
+    [(404, 'text/plain', 'not found')],                      # not retried
+    [(200, 'text/html', '<html><body>Login</body></html>')],  # not JSON
+    [(200, 'application/json', {'message': 'ok'})],           # JSON without project fields
+])
+def test_failed_fetch_falls_back_to_browser(portal, answers):
+    mock = portal({'/api/project/11': answers, '/api/promoter/11': _ok(PROMOTER),
+                   '/api/project/12': _ok(DETAIL), '/api/promoter/12': _ok(PROMOTER)})
+    # retries=1 keeps the exhausted-retry case fast (the first retry has no backoff)
+    session = make_session(pool_size=2, retries=1)
+    rows = dict(fetch_projects({0: '11', 1: '12'}, mock.endpoints(), workers=2, session=session))
+    session.close()
+    # None sends the project back to the Selenium scraper; the other still comes over HTTP
+    assert rows == {0: None, 1: EXPECTED_ROW}
+
+
+def test_project_id_from_route():
+    assert project_id_from_route('https://gujrera.gujarat.gov.in/#/project-preview/12345') == '12345'
+    assert project_id_from_route('https://gujrera.gujarat.gov.in/#/project-preview?id=A1B2') == 'A1B2'
+    assert project_id_from_route('https://gujrera.gujarat.gov.in/#/home') is None
+    assert project_id_from_route(None) is None
+
+
+def test_check_against_replay(tmp_path):
+    captures = [
+        {'url': 'https://gujreraapi.example/api/project/4242', 'status': 200, 'body': DETAIL},
+        {'url': 'https://gujreraapi.example/api/promoter/4242?tab=1', 'status': 200, 'body': PROMOTER},
+        {'url': 'https://gujreraapi.example/api/masters/districts', 'status': 200, 'body': [{'district': 'X'}]},
+    ]
+    save_captures(str(tmp_path), captures)
+    assert endpoints_from_captures(captures, '4242') == [
+        'https://gujreraapi.example/api/project/{project_id}',
+        'https://gujreraapi.example/api/promoter/{project_id}?tab=1',
+    ]
+    # The unrelated districts payload is not an endpoint, so the fields differ by District
+    assert not check_against_replay(str(tmp_path), '4242')
+    save_captures(str(tmp_path / 'only'), captures[:2])
+    assert check_against_replay(str(tmp_path / 'only'), '4242')
@@ -0,0 +1,153 @@
+"""Offline tests for the network-capture backend: JSON alias mapping, capture files,
+performance-log draining and the local replay server."""
+
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from gujrera_network import (
+    drain_xhr_responses,
+    json_fields,
+    load_captures,
+    make_replay_server,
+    replay_check,
+    save_captures,
+)
+
+PROJECT_URL = 'https://gujreraapi.example/api/project/getProjectDetails?projectId=4242'
+PROMOTER_URL = 'https://gujreraapi.example/api/promoter/4242'
+
+CAPTURES = [
+    {'url': PROJECT_URL, 'status': 200, 'body': {
+        'data': {
+            'projectName': 'Shanti Residency',
+            'ProjectRegNo': 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120',
+            'project_type': 'Residential',
+            'projectStartDate': '01-01-2020',
+            'totalUnits': 120,
+            'availableUnits': '',
+            'unbookedUnits': 18,
+            'isActive': True,
+            'district': {'id': 7},
+            'amenities': ['Gym', '', 'Garden'],
+        },
+    }},
+    {'url': PROMOTER_URL, 'status': 200, 'body': [
+        {'promoterName': 'Shanti Developers', 'promoterType': 'Partnership Firm'},
+        {'promoterName': 'Someone Else', 'emailId': 'info@shanti.example'},
+    ]},
+]
+
+EXPECTED_FIELDS = {
+    'Project Name': 'Shanti Residency',
+    'RERA Reg. No.': 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120',
+    'Project Type': 'Residential',
+    'Project Start Date': '01-01-2020',
+    'Total Units': '120',
+    'Available Units': '18',
+    'Amenities': 'Gym, Garden',
+    'Promoter Name': 'Shanti Developers',
+    'Promoter Type': 'Partnership Firm',
+    'Email Id': 'info@shanti.example',
+}
+
+
+@pytest.fixture
+def capture_dir(tmp_path):
+    save_captures(str(tmp_path), CAPTURES)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def replay_base():
+    server = make_replay_server(CAPTURES)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_json_fields_maps_aliases():
+    # Keys match case- and punctuation-insensitively, the first non-empty value wins,
+    # an empty alias falls through to the next one, dicts and booleans are skipped
+    # and lists of scalars are joined
+    assert json_fields(CAPTURES) == EXPECTED_FIELDS
+
+
+def test_json_fields_empty():
+    assert json_fields([]) == {}
+    assert json_fields([{'url': PROJECT_URL, 'body': None}]) == {}
+
+
+def test_captures_round_trip_through_files(capture_dir):
+    assert load_captures(capture_dir) == CAPTURES
+
+
+def test_replay_server_serves_captured_bodies(replay_base):
+    for capture in CAPTURES:
+        path = capture['url'].split('.example', 1)[1]
+        with urlopen(replay_base + path, timeout=5) as resp:
+            assert resp.status == capture['status']
+            assert resp.headers['Content-Type'] == 'application/json'
+            assert json.loads(resp.read().decode('utf-8')) == capture['body']
+
+
+def test_replay_server_404_for_unknown_path(replay_base):
+    with pytest.raises(HTTPError) as err:
+        urlopen(replay_base + '/api/project/getProjectDetails?projectId=1', timeout=5)
+    assert err.value.code == 404
+
+
+def test_replay_check(capture_dir):
+    assert replay_check(capture_dir)
+
+
+def test_replay_check_without_captures(tmp_path):
+    assert not replay_check(str(tmp_path))
+
+
+class FakeDriver:
+    """Performance log and Network.getResponseBody as Chrome returns them."""
+
+    def __init__(self, events, bodies):
+        self.events = events
+        self.bodies = bodies
+
+    def get_log(self, kind):
+        assert kind == 'performance'
+        return [{'message': json.dumps({'message': event})} for event in self.events]
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == 'Network.getResponseBody'
+        return {'body': self.bodies[params['requestId']]}
+
+
+def _response_event(request_id, url, kind='XHR', mime='application/json', status=200):
+    return {'method': 'Network.responseReceived', 'params': {
+        'requestId': request_id, 'type': kind,
+        'response': {'url': url, 'status': status, 'mimeType': mime},
+    }}
+
+
+def test_drain_xhr_responses_keeps_json_xhr_only():
+    driver = FakeDriver(
+        [
+            _response_event('1', PROJECT_URL),
+            _response_event('2', 'https://gujrera.example/logo.png', kind='Image', mime='image/png'),
+            _response_event('3', 'https://gujrera.example/page', mime='text/html'),
+            {'method': 'Network.requestWillBeSent', 'params': {}},
+            _response_event('4', PROMOTER_URL, kind='Fetch'),
+            _response_event('5', PROMOTER_URL + '/broken'),
+        ],
+        {'1': json.dumps(CAPTURES[0]['body']), '4': json.dumps(CAPTURES[1]['body']), '5': '<html>'},
+    )
+    assert drain_xhr_responses(driver) == CAPTURES
+    assert json_fields(drain_xhr_responses(driver, url_filter='/promoter/')) == {
+        'Promoter Name': 'Shanti Developers',
+        'Promoter Type': 'Partnership Firm',
+        'Email Id': 'info@shanti.example',
+    }
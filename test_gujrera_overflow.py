@@ -0,0 +1,48 @@
+"""Tests for the overflow sidecar: cells in columns the CSV header lacks go to
+<csv>.overflow.csv, and read_projects()/fold_overflow() bring them back."""
+
+import os
+
+import pandas as pd
+
+from gujrera_overflow import fold_overflow, overflow_path, read_overflow, read_projects
+from scrape_gujrera_ahmedabad import append_unique_by_regno
+
+REG_A = 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120'
+REG_B = 'PR/GJ/AHMEDABAD/AUDA/RAA05678/010120'
+
+
+def _read(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def test_new_columns_go_to_the_sidecar_and_fold_back(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    append_unique_by_regno(pd.DataFrame([{'RERA Reg. No.': REG_A, 'Project Name': 'Shanti Residency'},
+                                         {'RERA Reg. No.': REG_B, 'Project Name': 'Nilkanth Heights'}]), path)
+    header = list(_read(path).columns)
+
+    append_unique_by_regno(pd.DataFrame([{'RERA Reg. No.': REG_A, 'Partner 7': 'K. Patel', 'Partner 8': ''},
+                                         {'RERA Reg. No.': REG_B, 'Partner 8': 'R. Shah'}]), path)
+    # The CSV is not rewritten; only the non-empty new cells are recorded
+    assert list(_read(path).columns) == header
+    overflow = read_overflow(path)
+    assert sorted(map(tuple, overflow[['RERA Reg. No.', 'column', 'value']].values.tolist())) == [
+        (REG_A, 'Partner 7', 'K. Patel'), (REG_B, 'Partner 8', 'R. Shah')]
+
+    # The first value per (reg no, column) is kept
+    append_unique_by_regno(pd.DataFrame([{'RERA Reg. No.': REG_A, 'Partner 7': 'Someone Else'}]), path)
+    assert len(read_overflow(path)) == 2
+
+    wide = read_projects(path).set_index('RERA Reg. No.')
+    assert list(wide.columns[-2:]) == ['Partner 7', 'Partner 8']
+    assert wide.loc[REG_A, 'Partner 7'] == 'K. Patel' and wide.loc[REG_A, 'Partner 8'] == ''
+    assert wide.loc[REG_B, 'Partner 7'] == '' and wide.loc[REG_B, 'Partner 8'] == 'R. Shah'
+
+    assert fold_overflow(path)
+    assert not os.path.exists(overflow_path(path))
+    folded = _read(path)
+    assert list(folded.columns) == header + ['Partner 7', 'Partner 8']
+    assert folded.set_index('RERA Reg. No.').equals(wide)
+    # Nothing left to fold
+    assert not fold_overflow(path)
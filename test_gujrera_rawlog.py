@@ -0,0 +1,101 @@
+"""Tests for raw-log compaction: the offset only moves past lines whose write succeeded."""
+
+import json
+import os
+
+import pandas as pd
+
+from gujrera_history import FieldHistory
+from gujrera_rawlog import RawRecordLog
+from gujrera_writebuffer import SCRAPED_AT
+from scrape_gujrera_ahmedabad import save_rows
+
+ROWS = [
+    {'Project Name': 'Shanti Residency', 'RERA Reg. No.': 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120'},
+    {'Project Name': 'Nilkanth Heights', 'RERA Reg. No.': 'PR/GJ/AHMEDABAD/AUDA/RAA05678/020220'},
+]
+
+
+def _log(tmp_path, compact_fn):
+    log = RawRecordLog(str(tmp_path / 'rows.jsonl'), compact_fn, interval=0)
+    for row in ROWS:
+        log.add(row)
+    return log
+
+
+def _unstamped(rows):
+    return [{k: v for k, v in row.items() if k != SCRAPED_AT} for row in rows]
+
+
+def test_offset_advances_after_successful_compaction(tmp_path):
+    folded = []
+    log = _log(tmp_path, folded.extend)
+    assert log.compact() == 2
+    assert _unstamped(folded) == ROWS
+    assert all(isinstance(row[SCRAPED_AT], float) for row in folded)
+    assert log._read_offset() == os.path.getsize(log.path)
+    assert log.compact() == 0
+
+
+def test_failed_compaction_keeps_offset(tmp_path):
+    def fail(rows):
+        raise OSError('disk full')
+    log = _log(tmp_path, fail)
+    assert log.compact() == 0
+    assert log._read_offset() == 0
+    folded = []
+    log.compact_fn = folded.extend
+    assert log.compact() == 2
+    assert _unstamped(folded) == ROWS
+
+
+def test_failed_csv_write_keeps_offset(tmp_path):
+    # save_rows must raise when the CSV cannot be written, not just log it
+    missing = str(tmp_path / 'missing' / 'projects.csv')
+    log = _log(tmp_path, lambda rows: save_rows(rows, file_path=missing))
+    assert log.compact() == 0
+    assert log._read_offset() == 0
+    output = str(tmp_path / 'projects.csv')
+    log.compact_fn = lambda rows: save_rows(rows, file_path=output)
+    assert log.compact() == 2
+    assert list(pd.read_csv(output)['Project Name']) == ['Shanti Residency', 'Nilkanth Heights']
+
+
+def test_history_uses_each_rows_scrape_time(tmp_path):
+    # Two scrapes of one project folded in one batch: the change between them is
+    # recorded at the second line's ts, and the stamp never reaches the CSV
+    output = str(tmp_path / 'projects.csv')
+    history = FieldHistory(str(tmp_path / 'history.db'))
+    log = RawRecordLog(str(tmp_path / 'rows.jsonl'),
+                       lambda rows: save_rows(rows, file_path=output, history=history), interval=0)
+    with open(log.path, 'w', encoding='utf-8') as fh:
+        for ts, units in ((1700000000, '18'), (1700086400, '12')):
+            fh.write(json.dumps({'ts': ts, 'shard': '', 'row': dict(ROWS[0], **{'Available Units': units})}) + '\n')
+    assert log.compact() == 2
+    assert history.changes() == [(ROWS[0]['RERA Reg. No.'], 'Available Units', '18', '12', 1700086400)]
+    history.close()
+    df = pd.read_csv(output, dtype=str)
+    assert SCRAPED_AT not in df.columns
+    assert df.loc[0, 'Available Units'] == '18'
+
+
+def test_replaying_the_log_leaves_history_unchanged(tmp_path):
+    output = str(tmp_path / 'projects.csv')
+    history = FieldHistory(str(tmp_path / 'history.db'))
+    log = RawRecordLog(str(tmp_path / 'rows.jsonl'),
+                       lambda rows: save_rows(rows, file_path=output, history=history), interval=0)
+    with open(log.path, 'w', encoding='utf-8') as fh:
+        for ts, units in ((1700000000, '18'), (1700086400, '12'), (1700172800, '12')):
+            fh.write(json.dumps({'ts': ts, 'shard': '', 'row': dict(ROWS[0], **{'Available Units': units})}) + '\n')
+    log.compact()
+    expected = [(ROWS[0]['RERA Reg. No.'], 'Available Units', '18', '12', 1700086400)]
+    assert history.changes() == expected
+    # Folded again from the start, and again as if the offset write had been lost
+    log.compact(from_start=True)
+    os.remove(log.offset_path)
+    log.compact()
+    assert history.changes() == expected
+    # An older row arriving late neither dates a change backwards nor reverts the value
+    history.observe(dict(ROWS[0], **{'Available Units': '30'}), 1699000000)
+    assert history.changes() == expected
+    history.close()
@@ -0,0 +1,87 @@
+"""Tests for the reg-no sidecar index: append planning, staying in step with appends,
+and rebuilding after the CSV was changed by something else."""
+
+import pandas as pd
+
+from gujrera_regindex import RegNoIndex, index_path, reg_index_for
+from scrape_gujrera_ahmedabad import append_unique_by_regno
+
+REG = 'RERA Reg. No.'
+
+
+def _row(n, **fields):
+    return dict({REG: f'PR/GJ/AHMEDABAD/AUDA/RAA{n:05d}/010120', 'Project Name': f'Project {n}'}, **fields)
+
+
+def _csv_keys(path):
+    return list(pd.read_csv(path, dtype=str, keep_default_na=False)[REG])
+
+
+def _assert_index_matches_csv(path):
+    """The sidecar on disk describes the CSV exactly as a rebuild from it would."""
+    on_disk = RegNoIndex(path, REG)
+    assert on_disk.is_current()
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    fresh = RegNoIndex(path + '.check', REG)
+    fresh.csv_path = path
+    fresh.rebuild(frame)
+    assert on_disk.columns == fresh.columns
+    assert on_disk.rows == fresh.rows == len(frame)
+    assert on_disk.entries == fresh.entries
+
+
+def test_plan_append(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    append_unique_by_regno(pd.DataFrame([_row(1, **{'Total Units': '40'}), _row(2)]), path)
+    index = reg_index_for(path, REG)
+    key1, key2 = _row(1)[REG], _row(2)[REG]
+    # Only new reg nos: appended from the index alone
+    planned = index.plan_append(pd.DataFrame([_row(1), _row(3)]))
+    assert list(planned[REG]) == [_row(3)[REG]]
+    assert list(planned.columns) == index.columns
+    # Repeats of known content: nothing to append
+    assert index.plan_append(pd.DataFrame([_row(1, **{'Total Units': '40'}), _row(2)])).empty
+    # A value for an empty cell, a column the header lacks, or a new reg no twice: read the CSV
+    assert index.plan_append(pd.DataFrame([{REG: key2, 'Total Units': '12'}])) is None
+    assert index.plan_append(pd.DataFrame([{REG: key1, 'Partner 6': 'K. Patel'}])) is None
+    assert index.plan_append(pd.DataFrame([_row(4), _row(4)])) is None
+
+
+def test_index_stays_in_step_with_appends(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    append_unique_by_regno(pd.DataFrame([_row(1), _row(2)]), path)
+    _assert_index_matches_csv(path)
+    append_unique_by_regno(pd.DataFrame([_row(3), _row(1)]), path)            # index-only append
+    _assert_index_matches_csv(path)
+    append_unique_by_regno(pd.DataFrame([_row(2, **{'Total Units': '12'}), _row(4)]), path)  # fill + rewrite
+    _assert_index_matches_csv(path)
+    append_unique_by_regno(pd.DataFrame([_row(4, **{'Total Units': '9'})]), path)
+    _assert_index_matches_csv(path)
+    assert _csv_keys(path) == [_row(n)[REG] for n in (1, 2, 3, 4)]
+
+
+def test_external_edit_rebuilds_the_index(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    append_unique_by_regno(pd.DataFrame([_row(1), _row(2), _row(3)]), path)
+    # Something else drops project 2 and adds project 5 behind our back
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df = pd.concat([df[df[REG] != _row(2)[REG]], pd.DataFrame([_row(5, **{'Total Units': '7'})])],
+                   ignore_index=True)
+    df.to_csv(path, index=False)
+    assert not reg_index_for(path, REG).is_current()
+    # A stale index would skip project 2 as known and append project 5 again
+    append_unique_by_regno(pd.DataFrame([_row(2), _row(5)]), path)
+    assert sorted(_csv_keys(path)) == sorted(_row(n)[REG] for n in (1, 2, 3, 5))
+    _assert_index_matches_csv(path)
+
+
+def test_missing_or_torn_sidecar(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    append_unique_by_regno(pd.DataFrame([_row(1)]), path)
+    with open(index_path(path), 'a', encoding='utf-8') as fh:
+        fh.write('{"key": "PR/GJ/TORN", "off')
+    assert RegNoIndex(path, REG).entries.keys() == {_row(1)[REG]}
+    reg_index_for(path, REG).invalidate()
+    append_unique_by_regno(pd.DataFrame([_row(1), _row(2)]), path)
+    assert _csv_keys(path) == [_row(1)[REG], _row(2)[REG]]
+    _assert_index_matches_csv(path)
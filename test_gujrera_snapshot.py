@@ -0,0 +1,133 @@
+"""Tests that the offline snapshot parser and the live scraper resolve the same fields:
+the lxml ports must return the JSON the page scripts (READ_TABLES_JS, LABEL_PARTS_JS)
+return for the same HTML, since both modes feed it to the shared helpers."""
+
+import os
+
+from lxml import html as lxml_html
+
+from gujrera_extract import partner_columns, partner_labels
+from gujrera_snapshot import html_label_parts, html_tables, parse_snapshot, partners_from_tree
+from gujrera_tables import PROJECT_TABLE_SPECS, apply_project_tables, table_records
+
+SUMMARY_HTML = """<html><body>
+<table class="table"><tbody>
+  <tr><td><strong>Project Estimated Cost (Rs.) :-</strong> 12,50,00,000</td></tr>
+  <tr><td><strong>Common Amenities</strong></td></tr>
+  <tr><td><table><tbody><tr><td><p>Gym</p></td><td><p>Club House</p></td><td><p>gym</p></td></tr></tbody></table></td></tr>
+</tbody></table>
+<table class="table">
+  <thead><tr><th>Sr No.</th><th>Unit Type</th><th>Block</th><th>Total Units</th></tr></thead>
+  <tbody>
+    <tr><td colspan="4"><strong>Type Details</strong></td></tr>
+    <tr><td>1</td><td>2 BHK</td><td>A</td><td>40</td></tr>
+    <tr><td>2</td><td>3 BHK</td><td>B</td><td>24</td></tr>
+  </tbody>
+</table>
+</body></html>"""
+
+PROMOTERS_HTML = """<html><body>
+<div class="row">
+  <div class="col-md-6 avCol">
+    <p class="d-flex justify-content-between"><strong>Name</strong><span>Ramesh Patel</span></p>
+    <p class="d-flex justify-content-between"><strong>Mobile</strong><span>+91 98250-12345</span></p>
+    <p class="d-flex justify-content-between"><strong>Email Id</strong><span>ramesh@example.com</span></p>
+  </div>
+  <div class="col-md-6 avCol">
+    <p>Name<br>Suresh Shah</p>
+    <p>Email : suresh@example.com</p>
+  </div>
+</div>
+<div class="col-md-12">
+  <h2>Signatory Details</h2>
+  <div class="col-md-6 avCol"><p class="justify-content-between"><strong>Name</strong><span>Authorised Signatory</span></p></div>
+</div>
+</body></html>"""
+
+COST_CELL = 'Project Estimated Cost (Rs.) :- 12,50,00,000'
+UNIT_HEADERS = ['Sr No.', 'Unit Type', 'Block', 'Total Units']
+
+# What READ_TABLES_JS returns for SUMMARY_HTML
+EXPECTED_TABLES = {
+    'amenities': {
+        'head': [],
+        'rows': [{'th': [], 'td': ['Gym', 'Club House', 'gym'], 'body': True}],
+        'items': ['Gym', 'Club House', 'gym'],
+    },
+    'type_details': {
+        'head': UNIT_HEADERS,
+        'rows': [
+            {'th': UNIT_HEADERS, 'td': [], 'body': False},
+            {'th': [], 'td': ['Type Details'], 'body': True},
+            {'th': [], 'td': ['1', '2 BHK', 'A', '40'], 'body': True},
+            {'th': [], 'td': ['2', '3 BHK', 'B', '24'], 'body': True},
+        ],
+        'items': [],
+    },
+    'estimated_cost': {
+        'td': [COST_CELL],
+        'strongs': [['Project Estimated Cost (Rs.) :-', COST_CELL, COST_CELL]],
+    },
+}
+
+
+def _span_p(label, value):
+    return {'text': label + value, 'after_br': '', 'last_span': value, 'strong': label,
+            'strong_link': None, 'last_desc': value, 'link': None, 'span': value}
+
+
+def _bare_p(text, after_br='', last_desc=None):
+    return {'text': text, 'after_br': after_br, 'last_span': None, 'strong': None,
+            'strong_link': None, 'last_desc': last_desc, 'link': None, 'span': None}
+
+
+# What LABEL_PARTS_JS returns for each partner card of PROMOTERS_HTML
+EXPECTED_CARDS = [
+    {
+        'Name': [_span_p('Name', 'Ramesh Patel')],
+        'Mobile': [_span_p('Mobile', '+91 98250-12345')],
+        'Email': [_span_p('Email Id', 'ramesh@example.com')],
+        'Email Id': [_span_p('Email Id', 'ramesh@example.com')],
+    },
+    {
+        'Name': [_bare_p('Name\nSuresh Shah', after_br='Suresh Shah', last_desc='')],
+        'Mobile': [],
+        'Email': [_bare_p('Email : suresh@example.com')],
+        'Email Id': [],
+    },
+]
+
+
+def test_html_tables_match_read_tables_js():
+    tree = lxml_html.fromstring(SUMMARY_HTML)
+    assert html_tables(tree, PROJECT_TABLE_SPECS) == EXPECTED_TABLES
+    units = html_tables(tree, [{'name': 'units', 'headers': ['Unit Type', 'Block', 'Total Units']}])['units']
+    assert table_records(units) == table_records(EXPECTED_TABLES['type_details']) == [
+        dict(zip(UNIT_HEADERS, ['1', '2 BHK', 'A', '40'])),
+        dict(zip(UNIT_HEADERS, ['2', '3 BHK', 'B', '24'])),
+    ]
+    assert apply_project_tables({}, EXPECTED_TABLES) == {
+        'Amenities': 'Gym, Club House',
+        'Unit Type': '2 BHK; 3 BHK',
+        'Block': 'A; B',
+        'Project Estimated Cost (Rs.)': '12,50,00,000',
+    }
+
+
+def test_html_label_parts_match_label_parts_js():
+    tree = lxml_html.fromstring(PROMOTERS_HTML)
+    cards = tree.xpath("//div[contains(@class, 'avCol')]")
+    assert [html_label_parts(card, partner_labels()) for card in cards[:2]] == EXPECTED_CARDS
+    assert partners_from_tree(tree) == partner_columns(EXPECTED_CARDS) == {
+        'Partner 1': 'Ramesh Patel, 919825012345, ramesh@example.com',
+        'Partner 2': 'Suresh Shah, suresh@example.com',
+    }
+
+
+def test_parse_snapshot_uses_the_shared_helpers(tmp_path):
+    for view, page in (('summary', SUMMARY_HTML), ('promoters', PROMOTERS_HTML)):
+        with open(os.path.join(tmp_path, f'{view}.html'), 'w', encoding='utf-8') as fh:
+            fh.write(page)
+    row = parse_snapshot(str(tmp_path))
+    expected = dict(apply_project_tables({}, EXPECTED_TABLES), **partner_columns(EXPECTED_CARDS))
+    assert {key: row.get(key) for key in expected} == expected
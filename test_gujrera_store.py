@@ -0,0 +1,113 @@
+"""Tests for the SQLite project store: fill-empty upserts, child tables and use from
+the write buffer's flush thread."""
+
+import csv
+import threading
+
+import pytest
+
+from gujrera_store import ProjectStore
+
+REG_NO = 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120'
+
+ROW = {
+    'Project Name': 'Shanti Residency',
+    'RERA Reg. No.': REG_NO,
+    'Total Units': '40; 20',
+    'Available Units': '',
+    'Unit Type': '2 BHK; 3 BHK',
+    'Block': 'A; B',
+    'Amenities': 'Gym, Garden, Gym',
+    'Partner 1': 'Shanti Developers, 9876543210, info@shanti.example',
+    'Partner 2': 'A. Shah (Authorized Signatory)',
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ProjectStore(str(tmp_path / 'projects.db'), disallowed_columns=('Image URL',))
+    yield s
+    s.close()
+
+
+def _stored(store, reg_no=REG_NO):
+    cursor = store.conn.execute('SELECT * FROM projects WHERE reg_key = ?', (reg_no,))
+    return dict(zip((d[0] for d in cursor.description), cursor.fetchone()))
+
+
+def _children(store):
+    return {
+        'partners': store.conn.execute(
+            'SELECT position, name, mobile, email, signatory FROM project_partners ORDER BY position').fetchall(),
+        'unit_types': store.conn.execute(
+            'SELECT position, unit_type, block, total_units, available_units FROM project_unit_types '
+            'ORDER BY position').fetchall(),
+        'amenities': sorted(r[0] for r in store.conn.execute('SELECT amenity FROM project_amenities')),
+    }
+
+
+def test_upsert_fills_empty_fields_only(store):
+    assert store.upsert_row(dict(ROW, **{'Image URL': 'x.png'})) == 'inserted'
+    # Same project under a differently written reg no: non-empty values are kept,
+    # empty ones are filled, new columns are added
+    assert store.upsert_row({'RERA Reg. No.': f' {REG_NO.lower()} ', 'Project Name': 'Renamed',
+                             'Available Units': '5; 2', 'Promoter Name': 'Shanti Developers'}) == 'updated'
+    stored = _stored(store)
+    assert stored['Project Name'] == 'Shanti Residency'
+    assert stored['Available Units'] == '5; 2'
+    assert stored['Promoter Name'] == 'Shanti Developers'
+    assert 'Image URL' not in store.columns()
+    assert store.count() == 1
+
+
+def test_reg_no_from_alternate_column(store):
+    assert store.upsert_row({'Registration No.': REG_NO, 'Project Name': 'Shanti Residency'}) == 'inserted'
+    assert store.upsert_row({'Project Name': 'No reg no'}) is None
+    assert store.count() == 1
+
+
+def test_children_are_not_duplicated_on_resave(store):
+    store.upsert_row(ROW)
+    first = _children(store)
+    assert first == {
+        'partners': [(1, 'Shanti Developers', '9876543210', 'info@shanti.example', 0), (2, 'A. Shah', None, None, 1)],
+        'unit_types': [(1, '2 BHK', 'A', 40, None), (2, '3 BHK', 'B', 20, None)],
+        'amenities': ['Garden', 'Gym'],
+    }
+    store.upsert_row(ROW)
+    store.upsert_rows([ROW, dict(ROW, **{'Amenities': 'Pool'})])
+    assert _children(store) == first
+    # A fill of an empty child source column is reflected in the child rows
+    store.upsert_row({'RERA Reg. No.': REG_NO, 'Available Units': '5; 2'})
+    assert [r[4] for r in _children(store)['unit_types']] == [5, 2]
+    assert len(_children(store)['partners']) == 2
+
+
+def test_reopen_and_export(tmp_path):
+    path = str(tmp_path / 'projects.db')
+    store = ProjectStore(path)
+    store.upsert_rows([ROW, {'RERA Reg. No.': 'PR/GJ/OTHER/1', 'Project Name': 'Om Arcade'}])
+    store.close()
+    store = ProjectStore(path)
+    assert store.count() == 2
+    assert store.columns()[:2] == ['Project Name', 'RERA Reg. No.']
+    out = str(tmp_path / 'export.csv')
+    store.export_csv(out)
+    store.close()
+    with open(out, newline='', encoding='utf-8') as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r['Project Name'] for r in rows] == ['Shanti Residency', 'Om Arcade']
+    assert rows[1]['Unit Type'] == ''
+
+
+def test_concurrent_upserts_from_threads(store):
+    def worker(n):
+        for i in range(50):
+            store.upsert_rows([{'RERA Reg. No.': f'REG{n}-{i}', 'Project Name': 'x', f'Col{i % 5}': 'v'}])
+            store.count()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.count() == 200
@@ -0,0 +1,90 @@
+"""Tests for the write-behind buffer's spill files: per-process spills, recovery of
+spills left by dead processes, and failed flushes."""
+
+import json
+import os
+
+from gujrera_filelock import try_lock, unlock
+from gujrera_writebuffer import SCRAPED_AT, RowWriteBuffer
+
+
+def _buffer(tmp_path, flush_fn, max_rows=100):
+    return RowWriteBuffer(flush_fn, str(tmp_path / 'out.csv.spill'), max_rows=max_rows, max_seconds=3600)
+
+
+def _spill(tmp_path, name, rows, tail=''):
+    path = str(tmp_path / name)
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(''.join(json.dumps(row) + '\n' for row in rows) + tail)
+    return path
+
+
+def _unstamped(rows):
+    return [{k: v for k, v in row.items() if k != SCRAPED_AT} for row in rows]
+
+
+def test_rows_are_spilled_until_flushed(tmp_path):
+    flushed = []
+    buffer = _buffer(tmp_path, flushed.extend, max_rows=2)
+    assert buffer.spill_path == str(tmp_path / f'out.csv.spill.{os.getpid()}.jsonl')
+    buffer.add({'a': 1})
+    with open(buffer.spill_path, encoding='utf-8') as fh:
+        spilled = [json.loads(line) for line in fh]
+    assert _unstamped(spilled) == [{'a': 1}] and spilled[0][SCRAPED_AT] > 0
+    buffer.add({'a': 2})
+    assert _unstamped(flushed) == [{'a': 1}, {'a': 2}]
+    assert os.path.getsize(buffer.spill_path) == 0
+    buffer.close()
+    assert not os.path.exists(buffer.spill_path)
+
+
+def test_orphaned_spills_are_flushed_and_deleted(tmp_path):
+    # A dead process's spill (with a line torn by the crash) and a pre-pid shared spill
+    orphan = _spill(tmp_path, 'out.csv.spill.99999.jsonl', [{'a': 1, SCRAPED_AT: 1700000000.5}], tail='{"a": ')
+    legacy = _spill(tmp_path, 'out.csv.spill.jsonl', [{'a': 2}])
+    unrelated = _spill(tmp_path, 'out.csv.spill.old.5.jsonl', [{'a': 3}])
+    flushed = []
+    buffer = _buffer(tmp_path, flushed.extend)
+    # Recovered rows keep their original scrape time
+    assert flushed == [{'a': 1, SCRAPED_AT: 1700000000.5}, {'a': 2}]
+    assert not os.path.exists(orphan) and not os.path.exists(legacy)
+    assert os.path.exists(unrelated)
+    buffer.close()
+
+
+def test_live_process_spill_is_left_alone(tmp_path):
+    live = _spill(tmp_path, 'out.csv.spill.12345.jsonl', [{'a': 1}])
+    with open(live, 'r+', encoding='utf-8') as fh:
+        assert try_lock(fh)  # held as its running owner would
+        flushed = []
+        buffer = _buffer(tmp_path, flushed.extend)
+        assert flushed == []
+        assert os.path.exists(live)
+        buffer.close()
+        unlock(fh)
+
+
+def test_failed_flush_keeps_rows_and_spill(tmp_path):
+    def fail(rows):
+        raise OSError('disk full')
+    buffer = _buffer(tmp_path, fail, max_rows=1)
+    buffer.add({'a': 1})
+    buffer.add({'a': 2})
+    assert _unstamped(buffer.rows) == [{'a': 1}, {'a': 2}]
+    buffer.close()
+    # The spill outlives the process and is flushed by the next run
+    assert os.path.exists(buffer.spill_path)
+    os.rename(buffer.spill_path, str(tmp_path / 'out.csv.spill.99999.jsonl'))
+    flushed = []
+    _buffer(tmp_path, flushed.extend).close()
+    assert _unstamped(flushed) == [{'a': 1}, {'a': 2}]
+    assert sorted(os.listdir(tmp_path)) == []
+
+
+def test_failed_orphan_flush_keeps_the_spill(tmp_path):
+    orphan = _spill(tmp_path, 'out.csv.spill.99999.jsonl', [{'a': 1}])
+    def fail(rows):
+        raise OSError('disk full')
+    _buffer(tmp_path, fail).close()
+    with open(orphan, encoding='utf-8') as fh:
+        assert [json.loads(line) for line in fh] == [{'a': 1}]
@@ -0,0 +1,78 @@
+"""Tests for the CSV upsert in append_unique_by_regno: the first header, and the
+vectorised fill-empty merge against the row-by-row merge it replaced."""
+
+import pandas as pd
+
+from gujrera_overflow import fold_overflow, read_overflow, read_projects
+from scrape_gujrera_ahmedabad import DESIRED_COLUMNS, append_unique_by_regno
+
+REG_NO = 'PR/GJ/AHMEDABAD/AUDA/RAA01234/010120'
+
+
+def test_first_write_seeds_the_full_header(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    append_unique_by_regno(pd.DataFrame([{'Project Name': 'Shanti Residency', 'RERA Reg. No.': REG_NO,
+                                          'Partner 6': 'A. Shah', 'Pincode': '380001'}]), path)
+    header = list(pd.read_csv(path, nrows=0).columns)
+    assert header == list(DESIRED_COLUMNS) + ['Partner 6', 'Pincode']
+
+    # A desired column the first batch left empty is filled in place, not overflowed
+    append_unique_by_regno(pd.DataFrame([{'RERA Reg. No.': REG_NO, 'Promoter Name': 'Shanti Developers'}]), path)
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    assert list(df.columns) == header
+    assert df.loc[0, 'Promoter Name'] == 'Shanti Developers'
+    assert read_overflow(path).empty
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, float) and value != value) or str(value).strip() == ''
+
+
+def _loop_upsert(table, batch, reg_col='RERA Reg. No.'):
+    """The row-by-row merge append_unique_by_regno used before it was vectorised: new reg
+    nos are appended, and each incoming non-empty value fills an empty cell of the stored
+    row with the same (stripped, upper-cased) reg no."""
+    for incoming in batch:
+        key = str(incoming[reg_col]).strip().upper()
+        stored = table.get(key)
+        if stored is None:
+            table[key] = dict(incoming, **{reg_col: key})
+            continue
+        for col, value in incoming.items():
+            if col != reg_col and not _is_empty(value) and _is_empty(stored.get(col)):
+                stored[col] = value
+    return table
+
+
+def _as_table(df, reg_col='RERA Reg. No.'):
+    return {row[reg_col]: {k: v for k, v in row.items() if v != ''} for row in df.to_dict('records')}
+
+
+def test_vectorised_upsert_matches_loop_merge(tmp_path):
+    path = str(tmp_path / 'projects.csv')
+    reg_a, reg_b, reg_c = REG_NO, REG_NO.replace('RAA01234', 'RAA05678'), REG_NO.replace('RAA01234', 'CAA00042')
+    batches = [
+        # First write
+        [{'RERA Reg. No.': reg_a, 'Project Name': 'Shanti Residency', 'Total Units': '120', 'Promoter Name': ''},
+         {'RERA Reg. No.': reg_b, 'Project Name': 'Nilkanth Heights', 'Available Units': ''}],
+        # Existing reg nos (case and whitespace differ) fill empty cells only; a new reg no
+        # in the same batch is appended; the first non-empty value per reg no wins
+        [{'RERA Reg. No.': f'  {reg_a.lower()} ', 'Project Name': 'Renamed', 'Promoter Name': 'Shanti Developers'},
+         {'RERA Reg. No.': reg_a, 'Promoter Name': 'Someone Else', 'Project Type': ' '},
+         {'RERA Reg. No.': reg_b, 'Available Units': '7', 'Total Units': '64'},
+         {'RERA Reg. No.': reg_c, 'Project Name': 'Om Arcade', 'Project Type': 'Commercial'}],
+        # New columns, for an existing and a new project
+        [{'RERA Reg. No.': reg_b, 'Partner 6': 'K. Patel', 'Available Units': '3'},
+         {'RERA Reg. No.': REG_NO.replace('RAA01234', 'MAA00099'), 'Project Name': 'Sky Villa', 'Partner 6': 'R. Shah'}],
+        # Nothing left to fill: no change
+        [{'RERA Reg. No.': reg_c, 'Project Name': 'Om Arcade 2', 'Partner 6': ''}],
+    ]
+    expected = {}
+    for batch in batches:
+        append_unique_by_regno(pd.DataFrame(batch), path)
+        _loop_upsert(expected, batch)
+    expected = {key: {k: v for k, v in row.items() if not _is_empty(v)} for key, row in expected.items()}
+    assert _as_table(read_projects(path)) == expected
+    # Folding the overflow columns into the header keeps the same table
+    fold_overflow(path)
+    assert _as_table(pd.read_csv(path, dtype=str, keep_default_na=False)) == expected